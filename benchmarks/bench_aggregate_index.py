@@ -0,0 +1,58 @@
+"""
+Dashboard aggregates under single-cell edits.
+
+Fills B1:BN and C1:CN with numbers, adds F formulas alternating
+MAX(B1:BN), SUMA(C1:CN), MIN(B1:BN) and PROMEDIO(C1:CN), then edits one
+cell at a time and recalculates. Every edit invalidates the dependent
+aggregates; with the column aggregate trees each one is answered in
+O(log n) instead of rescanning N cells.
+
+    python -m benchmarks.bench_aggregate_index [N] [F] [EDITS]
+"""
+import random
+import sys
+import time
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+SHAPES = ["=MAX(B1:B{n})", "=SUMA(C1:C{n})", "=MIN(B1:B{n})", "=PROMEDIO(C1:C{n})"]
+
+
+def run(n: int, formulas: int, edits: int) -> None:
+    sheet = Spreadsheet()
+    for row in range(1, n + 1):
+        sheet.add_cell(Coordinate("B", row), Cell(("B", row), NumericContent(row % 1000)))
+        sheet.add_cell(Coordinate("C", row), Cell(("C", row), NumericContent(row * 0.25)))
+    for row in range(1, formulas + 1):
+        content = FormulaContent(SHAPES[row % len(SHAPES)].format(n=n))
+        sheet.add_cell(Coordinate("E", row), Cell(("E", row), content))
+
+    start = time.perf_counter()
+    sheet.recalculate()
+    print(f"first calculation (builds the column trees): {time.perf_counter() - start:.2f}s")
+
+    argument = sheet.get_cell(Coordinate("E", 1)).content.elements[0].arguments[0]
+    start = time.perf_counter()
+    argument.cell_range.get_numbers(sheet)
+    print(f"one full scan of the range, for comparison: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(edits):
+        column, row = rng.choice("BC"), rng.randint(1, n)
+        sheet.add_cell(Coordinate(column, row), Cell((column, row), NumericContent(rng.randint(0, 5000))))
+        sheet.recalculate()
+    elapsed = time.perf_counter() - start
+    print(f"{edits} edits x {formulas} aggregates: {elapsed / edits * 1e3:.2f} ms per edit"
+          f" ({elapsed / (edits * formulas) * 1e6:.0f} us per aggregate)")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    formulas = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    edits = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    run(n, formulas, edits)
@@ -0,0 +1,73 @@
+"""
+Loading a large .s2v file: streaming bulk load vs per-cell add_cell.
+
+Writes ROWS x 10 cells (nine numeric columns and one formula column summing
+its row) to a temporary .s2v file and times: reading the rows alone (the
+I/O floor), the streaming bulk load used by the controllers, and the
+previous pipeline (whole file in a list, add_cell per cell) on a slice.
+
+    python -m benchmarks.bench_bulk_load [ROWS]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from content.text_content import TextContent
+from fileio.load_file import LoadFile
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+from spreadsheet.spreadsheet_controller import SpreadsheetController
+
+
+def write_file(path: str, rows: int) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for row in range(1, rows + 1):
+            values = [str(row * col) if col % 2 else f"{row * col}.5" for col in range(1, 10)]
+            file.write(";".join(values) + f";=A{row}+B{row}*2\n")
+
+
+def per_cell_load(loader: LoadFile, path: str) -> Spreadsheet:
+    sheet = Spreadsheet()
+    for column, row, text in loader.iter_cell_texts(path):
+        value = SpreadsheetController._classify_loaded_text(text)
+        if type(value) in (int, float):
+            value = NumericContent(value)
+        sheet.add_cell(Coordinate(column, row), Cell((column, row), value))
+    return sheet
+
+
+def run(rows: int) -> None:
+    loader = LoadFile()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "big.s2v")
+        write_file(path, rows)
+        cells = rows * 10
+
+        start = time.perf_counter()
+        for _ in loader.iter_rows(path):
+            pass
+        io_floor = time.perf_counter() - start
+        print(f"{cells} cells, {os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"  read rows only:  {io_floor:6.2f}s")
+
+        start = time.perf_counter()
+        sheet = Spreadsheet()
+        sheet.load_cells((column, row, SpreadsheetController._classify_loaded_text(text))
+                         for column, row, text in loader.iter_cell_texts(path))
+        bulk = time.perf_counter() - start
+        print(f"  streaming bulk:  {bulk:6.2f}s ({cells / bulk:.0f} cells/s, {bulk / io_floor:.1f}x the read)")
+
+        sample = max(rows // 10, 1)
+        write_file(path, sample)
+        start = time.perf_counter()
+        per_cell_load(loader, path)
+        per_cell = (time.perf_counter() - start) * rows / sample
+        print(f"  per-cell add:    {per_cell:6.2f}s (extrapolated from {sample * 10} cells)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
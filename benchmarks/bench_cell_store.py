@@ -0,0 +1,64 @@
+"""
+Cell store lookup benchmark.
+
+Fills a Spreadsheet with N numeric cells and times random get_cell lookups.
+With the keyed store the per-lookup cost should stay flat as N grows.
+
+    python -m benchmarks.bench_cell_store [N ...]
+"""
+import random
+import sys
+import time
+
+from content.numerical_content import NumericContent
+from content.text_content import TextContent
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+COLUMNS = [chr(ord('A') + i) for i in range(10)]
+TEXT_COLUMN = "J"
+LOOKUPS = 200_000
+
+
+def build_sheet(n_cells: int) -> Spreadsheet:
+    sheet = Spreadsheet()
+    rows = n_cells // len(COLUMNS)
+    for row in range(1, rows + 1):
+        for col in COLUMNS:
+            content = TextContent(f"r{row}") if col == TEXT_COLUMN else NumericContent(row)
+            sheet.add_cell(Coordinate(col, row), Cell((col, row), content))
+    return sheet
+
+
+def run(n_cells: int) -> None:
+    start = time.perf_counter()
+    sheet = build_sheet(n_cells)
+    build_time = time.perf_counter() - start
+
+    rows = n_cells // len(COLUMNS)
+    rng = random.Random(42)
+    probes = [Coordinate(rng.choice(COLUMNS), rng.randint(1, rows)) for _ in range(LOOKUPS)]
+
+    start = time.perf_counter()
+    for coord in probes:
+        sheet.get_cell(coord)
+    lookup_time = time.perf_counter() - start
+
+    # Text cells are boxed by their first get_cell, so their content keeps its identity
+    contents = [sheet.get_cell(Coordinate(TEXT_COLUMN, coord.row)).content
+                for coord in probes[:LOOKUPS // 10]]
+    start = time.perf_counter()
+    for content in contents:
+        sheet.get_cell_name(content)
+    name_time = time.perf_counter() - start
+
+    print(f"{n_cells:>9} cells | build {build_time:6.2f}s"
+          f" | get_cell {lookup_time / LOOKUPS * 1e9:7.1f} ns/op"
+          f" | get_cell_name {name_time / len(contents) * 1e9:7.1f} ns/op")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,97 @@
+"""
+Cell value reads and memory: unboxed numbers and text vs boxed Cell objects.
+
+Fills a sheet with N numbers and N texts and reports value reads/second
+through get_cell_value (no Cell built) and through get_cell(...).get_value()
+(a Cell built per number read; a text is boxed by its first get_cell), for
+numbers, for unboxed text and for text kept boxed as before (a TextContent
+subclass the store does not unbox), plus traced bytes per cell of each representation over a dense
+A:H block and TextContent.get_number on a numeric text, parsed on every
+call vs cached.
+
+    python -m benchmarks.bench_cell_values [N]
+"""
+import sys
+import time
+import tracemalloc
+
+from content.numerical_content import NumericContent
+from content.text_content import TextContent
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+COLUMNS = "ABCDEFGH"
+
+
+class BoxedText(TextContent):
+    """TextContent the store keeps as a Cell object, as all text was stored before."""
+
+
+def fill(sheet: Spreadsheet, column: str, n: int, make) -> None:
+    for row in range(1, n + 1):
+        sheet.add_cell(Coordinate(column, row), Cell((column, row), make(row)))
+
+
+def traced_bytes(build) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return used
+
+
+def reads_per_second(read, coordinates) -> float:
+    start = time.perf_counter()
+    for coordinate in coordinates:
+        read(coordinate)
+    return len(coordinates) / (time.perf_counter() - start)
+
+
+def run(n: int) -> None:
+    sheet = Spreadsheet()
+    fill(sheet, "A", n, lambda row: NumericContent(row * 1.5))
+    fill(sheet, "B", n, lambda row: TextContent(f"item {row}"))
+    fill(sheet, "C", n, lambda row: BoxedText(f"item {row}"))
+    print(f"{len(sheet.cells)} cells")
+    for label, column in (("numbers", "A"), ("unboxed text", "B"), ("boxed text", "C")):
+        coordinates = [Coordinate(column, row) for row in range(1, n + 1)]
+        # get_cell_value first: get_cell boxes the text it returns
+        direct = reads_per_second(sheet.get_cell_value, coordinates)
+        via_cell = reads_per_second(lambda coordinate: sheet.get_cell(coordinate).get_value(sheet), coordinates)
+        print(f"  {label:<13} get_cell().get_value {via_cell / 1e6:5.2f}M reads/s, "
+              f"get_cell_value {direct / 1e6:5.2f}M reads/s ({direct / via_cell:.1f}x)")
+
+    def store(make):
+        # A dense block of one tile's width (A:H), as a filled table is stored
+        sheet = Spreadsheet()
+        for column in COLUMNS:
+            fill(sheet, column, n // len(COLUMNS), make)
+        return sheet
+
+    n -= n % len(COLUMNS)
+    numbers = traced_bytes(lambda: store(lambda row: NumericContent(row * 1.5)))
+    boxed = traced_bytes(lambda: {(column, row): Cell((column, row), NumericContent(row * 1.5))
+                                  for column in COLUMNS for row in range(1, n // len(COLUMNS) + 1)})
+    text = traced_bytes(lambda: store(lambda row: TextContent(f"item {row}")))
+    boxed_text = traced_bytes(lambda: store(lambda row: BoxedText(f"item {row}")))
+    print(f"  bytes per numeric cell: unboxed {numbers / n:.1f}, as Cell objects {boxed / n:.1f}")
+    print(f"  bytes per text cell:    unboxed {text / n:.1f}, as Cell objects {boxed_text / n:.1f}")
+
+    content = TextContent("1234.5")
+    repeats = 1_000_000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        float(content.text)
+    parsed = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(repeats):
+        content.get_number()
+    cached = time.perf_counter() - start
+    print(f"  TextContent.get_number: parsed {repeats / parsed / 1e6:.2f}M/s, cached {repeats / cached / 1e6:.2f}M/s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
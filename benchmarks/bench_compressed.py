@@ -0,0 +1,63 @@
+"""
+Compressed sheet files: .s2v vs .s2v.gz vs .s2v.xz.
+
+Builds the ROWS x 10 sheet of bench_bulk_load and, for each format, times
+saving it with the streaming writer, reading its rows back (LoadFile.iter_rows)
+and a full load, with throughput in MB/s of uncompressed text. The peak
+memory of the row read shows the codecs stream rather than inflate the
+whole file.
+
+    python -m benchmarks.bench_compressed [ROWS]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_bulk_load import write_file
+from benchmarks.bench_snapshot import load_text
+from fileio.load_file import LoadFile
+from fileio.save_file import SaveFile
+
+
+def run(rows: int) -> None:
+    saver, loader = SaveFile(), LoadFile()
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "source.s2v")
+        write_file(source, rows)
+        sheet = load_text(source)
+        print(f"{rows} rows")
+        print(f"{'format':>8} {'size':>9} {'save':>13} {'read rows':>13} {'load':>7} {'read peak':>10}")
+        text_size = None
+        for ext in (".s2v", ".s2v.gz", ".s2v.xz"):
+            path = os.path.join(directory, "sheet" + ext)
+            start = time.perf_counter()
+            saver.write_rows(path, sheet, saver._cell_text, terminator=';', full_width=True, newline='')
+            save = time.perf_counter() - start
+            text_size = text_size or os.path.getsize(path)
+            megabytes = text_size / 1e6
+
+            start = time.perf_counter()
+            count = sum(1 for _ in loader.iter_rows(path))
+            read = time.perf_counter() - start
+            assert count == rows
+
+            start = time.perf_counter()
+            load_text(path)
+            load = time.perf_counter() - start
+
+            tracemalloc.start()
+            for _ in loader.iter_rows(path):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print(f"{ext:>8} {os.path.getsize(path) / 1e6:>7.2f}MB "
+                  f"{save:>5.2f}s {megabytes / save:>4.0f}MB/s "
+                  f"{read:>5.2f}s {megabytes / read:>4.0f}MB/s "
+                  f"{load:>6.2f}s {peak / 1e6:>8.2f}MB")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
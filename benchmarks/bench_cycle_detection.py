@@ -0,0 +1,61 @@
+"""
+Cycle detection / topological order maintenance benchmark.
+
+Drives DependencyManager directly (no parsing) the way FormulaContent does:
+check_circular_dependencies followed by update_dependencies per formula.
+
+  * chain      : A2=A1+1, A3=A2+1, ... built top-down and bottom-up
+  * closing    : A1=A<N> on top of the chain (must be rejected, no recursion)
+  * fan-in     : N formulas read B1, then B1 becomes a formula;
+                 one SUMA over N formula cells
+
+    python -m benchmarks.bench_cycle_detection [N]
+"""
+import sys
+import time
+
+from exceptions import CircularDependencyException
+from spreadsheet.dependency_manager import DependencyManager
+
+
+def register(manager: DependencyManager, cell: str, refs=(), ranges=()) -> None:
+    manager.check_circular_dependencies(cell, set(refs), ranges)
+    manager.update_dependencies(cell, set(refs), ranges)
+
+
+def timed(label: str, n: int, action) -> None:
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {elapsed:7.3f}s  ({elapsed / n * 1e6:6.2f} us/formula)")
+
+
+def run(n: int) -> None:
+    print(f"N = {n}")
+
+    manager = DependencyManager()
+    timed("chain, top-down", n, lambda: [register(manager, f"A{i}", [f"A{i - 1}"]) for i in range(2, n + 1)])
+
+    def close_chain():
+        try:
+            register(manager, "A1", [f"A{n}"])
+        except CircularDependencyException:
+            return
+        raise AssertionError("cycle not detected")
+    timed("closing the chain (rejected)", 1, close_chain)
+
+    manager = DependencyManager()
+    timed("chain, bottom-up", n, lambda: [register(manager, f"A{i}", [f"A{i - 1}"]) for i in range(n, 1, -1)])
+
+    manager = DependencyManager()
+    timed("fan-in: N readers of B1", n, lambda: [register(manager, f"C{i}", ["B1"]) for i in range(1, n + 1)])
+    timed("fan-in: B1 becomes a formula", 1, lambda: register(manager, "B1", ["D1"]))
+
+    manager = DependencyManager()
+    for i in range(1, n + 1):
+        register(manager, f"E{i}", [f"F{i}"])
+    timed("fan-in: SUMA over N formulas", 1, lambda: register(manager, "G1", (), [(5, 1, 5, n)]))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
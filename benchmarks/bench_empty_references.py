@@ -0,0 +1,52 @@
+"""
+Formulas over empty cells: virtual blank references vs materialized placeholders.
+
+Enters N formulas '=Y<r>*2+Z<r>' over two empty columns, one edit at a
+time, and reports the cells stored, the time taken and the size of the
+saved file. 'placeholders' replays the previous behaviour (a 0.0 cell
+added with add_cell for every missing operand before the formula).
+
+    python -m benchmarks.bench_empty_references [N]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from fileio.save_file import SaveFile
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def build(n: int, placeholders: bool) -> Spreadsheet:
+    sheet = Spreadsheet()
+    for row in range(1, n + 1):
+        if placeholders:
+            for column in ("Y", "Z"):
+                coordinate = Coordinate(column, row)
+                if not sheet.has_cell(coordinate):
+                    sheet.add_cell(coordinate, Cell((column, row), NumericContent(0.0)))
+        sheet.set_cell_content(Coordinate("A", row), FormulaContent(f"=Y{row}*2+Z{row}"))
+    sheet.recalculate()
+    return sheet
+
+
+def run(n: int) -> None:
+    saver = SaveFile()
+    with tempfile.TemporaryDirectory() as directory:
+        for label, placeholders in (("placeholders", True), ("virtual blanks", False)):
+            start = time.perf_counter()
+            sheet = build(n, placeholders)
+            elapsed = time.perf_counter() - start
+            path = os.path.join(directory, "sheet.s2v")
+            saver.write_rows(path, sheet, saver._cell_text, terminator=';', full_width=True, newline='')
+            value = sheet.get_cell(Coordinate("A", n)).get_value(sheet)
+            print(f"  {label:<15} {len(sheet.cells):>8} cells  {elapsed:6.2f}s  "
+                  f"saved {os.path.getsize(path) / 1e6:6.2f}MB  A{n} = {value}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,61 @@
+"""
+Throughput of the postfix evaluation backends, in formulas/second.
+
+Compiles N formulas once, then evaluates every formula PASSES times with
+the visitor evaluator and with the compiled (code generation) evaluator.
+
+    python -m benchmarks.bench_evaluator_backends [N] [PASSES]
+"""
+import sys
+import time
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from formula.compiled_evaluator import EVALUATION_BACKENDS
+from spreadsheet.coordinate import split_cell_name
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+SHAPES = [
+    "=A{r}*2+B{r}",
+    "=(A{r}+B{r})*(A{r}-B{r})/4",
+    "=1+2*3-4/5+A{r}",
+    "=SUMA(A{r};B{r};3)*2-1",
+    "=A{r}/(B{r}+1)+MAX(A{r};B{r})",
+]
+
+
+def build_formulas(n: int) -> list:
+    sheet = Spreadsheet()
+    formulas = []
+    for row in range(1, n + 1):
+        for col in ("A", "B"):
+            sheet.add_cell(Coordinate(col, row), Cell((col, row), NumericContent(row)))
+    for row in range(1, n + 1):
+        content = FormulaContent(SHAPES[row % len(SHAPES)].format(r=row))
+        sheet.add_cell(Coordinate("C", row), Cell(("C", row), content))
+        content.compile(sheet, f"C{row}")
+        formulas.append((content._template, split_cell_name(f"C{row}")))
+    return formulas
+
+
+def run(n: int, passes: int) -> None:
+    results = {}
+    for backend in EVALUATION_BACKENDS:
+        FormulaContent.use_evaluation_backend(backend)
+        formulas = build_formulas(n)
+        start = time.perf_counter()
+        for _ in range(passes):
+            for template, (column, row) in formulas:
+                template.evaluate(column, row)
+        elapsed = time.perf_counter() - start
+        results[backend] = n * passes / elapsed
+        print(f"{backend:>9}: {results[backend]:10.0f} formulas/s")
+    print(f"  speedup: {results['compiled'] / results['visitor']:.1f}x")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    passes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run(n, passes)
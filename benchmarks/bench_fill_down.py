@@ -0,0 +1,53 @@
+"""
+Parse time and memory of a filled-down formula column.
+
+Fills B1:BN with '=A<r>*2+A<r+1>' (the same relative formula on every row),
+compiles every formula and reports the time, the number of distinct
+templates, and the memory allocated per formula cell.
+
+    python -m benchmarks.bench_fill_down [N]
+"""
+import sys
+import time
+import tracemalloc
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def fill_down(n: int, sheet: Spreadsheet) -> None:
+    for row in range(1, n + 1):
+        content = FormulaContent(f"=A{row}*2+A{row + 1}")
+        sheet.add_cell(Coordinate("B", row), Cell(("B", row), content))
+        content.compile(sheet, f"B{row}")
+
+
+def build_sheet(n: int) -> Spreadsheet:
+    sheet = Spreadsheet()
+    for row in range(1, n + 2):
+        sheet.add_cell(Coordinate("A", row), Cell(("A", row), NumericContent(row)))
+    return sheet
+
+
+def run(n: int) -> None:
+    sheet = build_sheet(n)
+    start = time.perf_counter()
+    fill_down(n, sheet)
+    elapsed = time.perf_counter() - start
+    print(f"compiled {n} formulas in {elapsed:.2f}s ({n / elapsed:.0f} formulas/s)")
+    print(f"templates: {len(sheet.formula_templates)}")
+
+    # Memory on a fresh sheet: tracing slows the fill down several times
+    sheet = build_sheet(n)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    fill_down(n, sheet)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"memory: {allocated / n:.0f} bytes per formula cell")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
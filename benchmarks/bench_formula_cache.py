@@ -0,0 +1,50 @@
+"""
+Recalculation cost with and without the cached compiled program.
+
+N formulas are recalculated PASSES times. 'recompile' drops the compiled
+program before every pass (the old behaviour), 'cached' only drops values.
+
+    python -m benchmarks.bench_formula_cache [N] [PASSES]
+"""
+import sys
+import time
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def build_sheet(n: int) -> list:
+    sheet = Spreadsheet()
+    for row in range(1, n + 2):
+        sheet.add_cell(Coordinate("A", row), Cell(("A", row), NumericContent(row)))
+    cells = []
+    for row in range(1, n + 1):
+        content = FormulaContent(f"=A{row}*2+(A{row + 1}-1)/4")
+        cell = Cell(("B", row), content)
+        sheet.add_cell(Coordinate("B", row), cell)
+        cells.append(cell)
+    for cell in cells:
+        cell.get_value(sheet)
+    return sheet, cells
+
+
+def run(n: int, passes: int) -> None:
+    sheet, cells = build_sheet(n)
+    for label, invalidate in (("recompile", FormulaContent.invalidate_program),
+                              ("cached", FormulaContent.invalidate_value)):
+        start = time.perf_counter()
+        for _ in range(passes):
+            for cell in cells:
+                invalidate(cell.content)
+                cell.get_value(sheet)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>10}: {n * passes / elapsed:10.0f} formulas/s")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    passes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    run(n, passes)
@@ -0,0 +1,47 @@
+"""
+Edit latency on a formula-heavy sheet.
+
+Column A holds N numbers and column B holds N formulas =A<i>*2. Each timed
+edit rewrites one A cell, which must only invalidate its own B formula.
+
+    python -m benchmarks.bench_invalidation [N]
+"""
+import sys
+import time
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+EDITS = 1_000
+
+
+def build_sheet(n_formulas: int) -> Spreadsheet:
+    sheet = Spreadsheet()
+    for row in range(1, n_formulas + 1):
+        sheet.add_cell(Coordinate("A", row), Cell(("A", row), NumericContent(row)))
+    for row in range(1, n_formulas + 1):
+        content = FormulaContent(f"=A{row}*2")
+        content.check_circular_dependencies(sheet, f"B{row}")
+        sheet.add_cell(Coordinate("B", row), Cell(("B", row), content))
+    return sheet
+
+
+def run(n_formulas: int) -> None:
+    start = time.perf_counter()
+    sheet = build_sheet(n_formulas)
+    print(f"built {n_formulas} formulas in {time.perf_counter() - start:.2f}s")
+
+    step = max(1, n_formulas // EDITS)
+    rows = list(range(1, n_formulas + 1, step))[:EDITS]
+    start = time.perf_counter()
+    for row in rows:
+        sheet.add_cell(Coordinate("A", row), Cell(("A", row), NumericContent(row + 1)))
+    elapsed = time.perf_counter() - start
+    print(f"{len(rows)} edits: {elapsed / len(rows) * 1e3:.3f} ms/edit")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
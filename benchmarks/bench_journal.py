@@ -0,0 +1,74 @@
+"""
+Persisting single edits: journal append vs rewriting the whole file.
+
+For sheets of each size in SIZES rows (bench_bulk_load's ROWS x 10
+layout) times the cost of persisting one edit by appending it to the journal
+and by saving the sheet again with the streaming writer, then the cost of
+one compaction and of reloading base + journal. The replayed sheet is
+checked against the edited one.
+
+    python -m benchmarks.bench_journal [SIZES...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_bulk_load import write_file
+from benchmarks.bench_snapshot import load_text
+from fileio.edit_journal import EditJournal
+from fileio.save_file import SaveFile
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet_controller import SpreadsheetController
+
+EDITS = 1000
+
+
+def run(sizes) -> None:
+    saver = SaveFile()
+    print(f"{'rows':>9} {'append/edit':>12} {'rewrite/edit':>13} {'compaction':>11} {'reload':>8}")
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sheet.s2v")
+            write_file(path, rows)
+            sheet = load_text(path)
+            edited = []
+            for i in range(EDITS):
+                coords = Coordinate("B", i * 7919 % rows + 1)
+                sheet.set_cell_content(coords, SpreadsheetController._parse_content(str(i)))
+                edited.append(sheet.get_cell(coords))
+
+            sheet.journal = EditJournal(path)
+            start = time.perf_counter()
+            for cell in edited:
+                sheet.journal.record((cell,))
+            append = (time.perf_counter() - start) / EDITS
+
+            copy = os.path.join(directory, "copy.s2v")
+            repeats = 3
+            start = time.perf_counter()
+            for _ in range(repeats):
+                saver.write_rows(copy, sheet, saver._cell_text, terminator=';', full_width=True, newline='')
+            rewrite = (time.perf_counter() - start) / repeats
+
+            start = time.perf_counter()
+            reloaded = load_text(path)
+            journal = EditJournal(path)
+            journal.replay(reloaded, SpreadsheetController._parse_content)
+            reload = time.perf_counter() - start
+
+            start = time.perf_counter()
+            sheet.journal.compact(wait=True)
+            compaction = time.perf_counter() - start
+            sheet.journal.close()
+            journal.close()
+
+            probe = Coordinate("J", (EDITS - 1) * 7919 % rows + 1)
+            assert reloaded.get_cell(probe).get_value(reloaded) == sheet.get_cell(probe).get_value(sheet)
+            assert load_text(path).get_cell(probe).get_value(sheet) == sheet.get_cell(probe).get_value(sheet)
+            print(f"{rows:>9} {append * 1e6:>10.1f}us {rewrite * 1e3:>11.1f}ms "
+                  f"{compaction:>10.2f}s {reload:>7.2f}s")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000])
@@ -0,0 +1,71 @@
+"""
+Opening a large .s2v file memory-mapped versus loading it.
+
+Writes an N-row file (columns A..H: numbers, plus a running total in I),
+then compares a full load against opening it mapped and reading a few
+scattered cells and one range, which pages in only the bands they touch.
+
+    python -m benchmarks.bench_mapped_file [N]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from fileio.mapped_file import MappedSheetFile
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+from spreadsheet.spreadsheet_controller import SpreadsheetController
+
+
+def _write(path: str, n: int) -> None:
+    with open(path, 'w', encoding='utf-8') as file:
+        for row in range(1, n + 1):
+            total = f"=I{row - 1}+A{row}" if row > 1 else "=A1"
+            file.write(';'.join([str(row * 10 + col) for col in range(8)] + [total]) + '\n')
+
+
+def _probe(sheet: Spreadsheet, n: int) -> float:
+    value = 0.0
+    for row in (1, n // 3, n // 2, n):
+        value += sheet.get_cell(Coordinate("C", row)).get_value()
+    origin, destination = Coordinate("B", n // 2), Coordinate("B", n // 2 + 999)
+    return value + sum(cell.get_value() for cell in sheet.get_cells_in_range(origin, destination))
+
+
+def run(n: int) -> None:
+    classify = SpreadsheetController._classify_loaded_text
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "big.s2v")
+        _write(path, n)
+        print(f"{n} rows, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        sheet = Spreadsheet()
+        sheet.page_from(MappedSheetFile(path), classify)
+        opened = time.perf_counter() - start
+        result = _probe(sheet, n)
+        probed = time.perf_counter() - start
+        # Memory in a separate run: tracemalloc slows the timed one down
+        tracemalloc.start()
+        sheet = Spreadsheet()
+        sheet.page_from(MappedSheetFile(path), classify)
+        _probe(sheet, n)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"mapped: open {opened * 1e3:.2f} ms, open + 4 cells + 1000-row range"
+              f" {probed:.2f}s, peak {peak / 1e6:.1f} MB -> {result}")
+
+        start = time.perf_counter()
+        controller = SpreadsheetController(Spreadsheet())
+        sheet = Spreadsheet()
+        sheet.load_cells((column, row, classify(text))
+                         for column, row, text in controller.loader.iter_cell_texts(path))
+        loaded = time.perf_counter() - start
+        result = _probe(sheet, n)
+        print(f"full load: {loaded:.2f}s -> {result} ({loaded / probed:.0f}x slower to first answer)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,67 @@
+"""
+Parallel recalculation of a wide sheet of independent chains.
+
+Builds WIDTH independent chains of LENGTH formulas (column X holds
+X1=<seed>, X2==X1*1.0001+1, ...), then times a full recalculation in-process
+and on process pools of 2..cores workers, reporting the speedup. Chains
+shorter than MIN_PARALLEL_COMPONENT stay in-process, so pass a LENGTH
+above it to measure the pool itself.
+
+    python -m benchmarks.bench_parallel_recalc [WIDTH] [LENGTH]
+"""
+import os
+import sys
+import time
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate, number_to_column
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def build_sheet(width: int, length: int) -> Spreadsheet:
+    sheet = Spreadsheet()
+    for col_num in range(1, width + 1):
+        column = number_to_column(col_num)
+        sheet.add_cell(Coordinate(column, 1), Cell((column, 1), NumericContent(col_num)))
+        for row in range(2, length + 1):
+            formula = FormulaContent(f"={column}{row - 1}*1.0001+{column}{row - 1}/7+1")
+            sheet.add_cell(Coordinate(column, row), Cell((column, row), formula))
+    # Compile and register every formula once, so the passes below only evaluate
+    sheet.recalculate()
+    return sheet
+
+
+def time_pass(sheet: Spreadsheet, width: int) -> float:
+    # Editing the seeds invalidates every chain
+    for col_num in range(1, width + 1):
+        column = number_to_column(col_num)
+        sheet.add_cell(Coordinate(column, 1), Cell((column, 1), NumericContent(col_num + 1)))
+    start = time.perf_counter()
+    sheet.recalculate()
+    return time.perf_counter() - start
+
+
+def run(width: int, length: int) -> None:
+    cores = os.cpu_count() or 1
+    sheet = build_sheet(width, length)
+    formulas = width * (length - 1)
+    baseline = time_pass(sheet, width)
+    print(f"{formulas} formulas, {cores} core(s)")
+    print(f"  in-process: {baseline:.2f}s")
+    for workers in range(2, max(cores, 2) + 1):
+        sheet.set_recalculation_workers(workers)
+        if sheet.parallel_engine is None:
+            print(f"  {workers} workers: no pool started on {cores} core(s)")
+            continue
+        time_pass(sheet, width)  # warm the pool
+        elapsed = time_pass(sheet, width)
+        print(f"  {workers} workers: {elapsed:.2f}s (speedup {baseline / elapsed:.2f}x)")
+    sheet.set_recalculation_workers(1)
+
+
+if __name__ == "__main__":
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run(width, length)
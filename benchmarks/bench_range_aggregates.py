@@ -0,0 +1,49 @@
+"""
+Range aggregates over a numeric column: per-cell values vs numeric blocks.
+
+Fills A1:AN with numbers and times SUMA/MAX/MIN/PROMEDIO(A1:AN) evaluated
+from per-cell values (materialize every cell, Python loop) and from the
+numeric blocks read out of the tile buffers.
+
+    python -m benchmarks.bench_range_aggregates [N] [PASSES]
+"""
+import sys
+import time
+
+from content.numerical_content import NumericContent
+from formula.function import SUMA, MAX, MIN, PROMEDIO, CellRangeArgument
+from formula.range_aggregates import numpy
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def run(n: int, passes: int) -> None:
+    sheet = Spreadsheet()
+    for row in range(1, n + 1):
+        sheet.add_cell(Coordinate("A", row), Cell(("A", row), NumericContent(row * 0.5)))
+    argument = CellRangeArgument("A1", f"A{n}", sheet)
+    print(f"backend: {'numpy' if numpy is not None else 'array + math.fsum'}")
+
+    for function in (SUMA(), MAX(), MIN(), PROMEDIO()):
+        start = time.perf_counter()
+        for _ in range(passes):
+            per_cell = function.evaluate(argument.get_value())
+        per_cell_time = (time.perf_counter() - start) / passes
+
+        start = time.perf_counter()
+        for _ in range(passes):
+            values, blocks = [], []
+            argument.collect_values(values, blocks)
+            blocked = function.evaluate_blocks(values, blocks)
+        blocked_time = (time.perf_counter() - start) / passes
+
+        print(f"{type(function).__name__:>8}: per-cell {per_cell_time * 1e3:8.2f} ms,"
+              f" blocks {blocked_time * 1e3:7.2f} ms ({per_cell_time / blocked_time:5.1f}x)"
+              f"  {per_cell} / {blocked}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    passes = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    run(n, passes)
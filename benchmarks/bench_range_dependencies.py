@@ -0,0 +1,51 @@
+"""
+Range dependency bookkeeping benchmark.
+
+Registers M formulas that each reference a tall column range and reports
+how many index entries that costs, then times stabbing queries (which
+formulas depend on a given cell).
+
+    python -m benchmarks.bench_range_dependencies [FORMULAS] [RANGE_ROWS]
+"""
+import random
+import sys
+import time
+
+from spreadsheet.dependency_manager import DependencyManager
+from spreadsheet.coordinate import number_to_column
+
+QUERIES = 100_000
+
+
+def run(n_formulas: int, range_rows: int) -> None:
+    manager = DependencyManager()
+    rng = random.Random(7)
+
+    start = time.perf_counter()
+    for i in range(n_formulas):
+        col = rng.randint(1, 26)
+        first = rng.randint(1, range_rows)
+        rect = (col, first, col, first + range_rows - 1)
+        manager.update_dependencies(f"ZZ{i + 1}", set(), [rect])
+    register_time = time.perf_counter() - start
+
+    entries = sum(len(keys) for keys in manager.range_index._owner_blocks.values())
+    print(f"{n_formulas} formulas over {range_rows}-row ranges: "
+          f"{entries} index entries ({entries / n_formulas:.1f}/formula, "
+          f"vs {n_formulas * range_rows} expanded edges), registered in {register_time:.2f}s")
+
+    probes = [f"{number_to_column(rng.randint(1, 26))}{rng.randint(1, 2 * range_rows)}"
+              for _ in range(QUERIES)]
+    start = time.perf_counter()
+    hits = 0
+    for name in probes:
+        hits += len(manager.get_dependents(name))
+    elapsed = time.perf_counter() - start
+    print(f"{QUERIES} stabbing queries: {elapsed / QUERIES * 1e6:.2f} us/query "
+          f"({hits / QUERIES:.1f} dependents on average)")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    run(n, rows)
@@ -0,0 +1,44 @@
+"""
+Recalculation of long dependency chains.
+
+Builds A1=1, A2==A1+1, ..., AN==A<N-1>+1 without evaluating anything
+(like a freshly loaded file), reads AN, then edits A1 and reads AN again.
+Pull-based recursive evaluation overflows the stack on such chains; the
+recalculation engine evaluates each formula exactly once per pass.
+
+    python -m benchmarks.bench_recalc_chain [N]
+"""
+import sys
+import time
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def run(n: int) -> None:
+    sheet = Spreadsheet()
+    start = time.perf_counter()
+    sheet.add_cell(Coordinate("A", 1), Cell(("A", 1), NumericContent(1)))
+    for row in range(2, n + 1):
+        sheet.add_cell(Coordinate("A", row), Cell(("A", row), FormulaContent(f"=A{row - 1}+1")))
+    print(f"built a {n}-cell chain in {time.perf_counter() - start:.2f}s")
+
+    last = sheet.get_cell(Coordinate("A", n))
+    start = time.perf_counter()
+    value = last.get_value(sheet)
+    print(f"first read (compile + register + evaluate): {time.perf_counter() - start:.2f}s -> {value}")
+
+    sheet.add_cell(Coordinate("A", 1), Cell(("A", 1), NumericContent(10)))
+    start = time.perf_counter()
+    evaluated = sheet.recalculate()
+    elapsed = time.perf_counter() - start
+    value = last.get_value(sheet)
+    print(f"recalc after editing A1: {evaluated} evaluations in {elapsed:.2f}s"
+          f" ({evaluated / elapsed:.0f} formulas/s) -> {value}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,83 @@
+"""
+Range enumeration with per-column row indexes vs walking the tile buffers.
+
+Scatters K cells over columns A..Z of a ROWS-row sheet and enumerates
+ranges of decreasing height with TiledCellStore.iter_range (row indexes)
+and with the previous tile walk (every slot of every allocated tile in the
+rectangle, plus a lookup per tile row). Then inserts up to 200,000
+formula rows in reverse order into a RowIndex and into the sorted list
+the dependency manager kept before.
+
+    python -m benchmarks.bench_row_index [ROWS] [K]
+"""
+import random
+import sys
+import time
+from bisect import insort
+
+from spreadsheet.coordinate import number_to_column
+from spreadsheet.row_index import RowIndex
+from spreadsheet.tile_store import (TAG_EMPTY, TILE_COL_MASK, TILE_COL_SHIFT, TILE_ROW_MASK, TILE_ROW_SHIFT,
+                                    TiledCellStore)
+
+
+def tile_walk(store: TiledCellStore, col_lo: int, col_hi: int, row_lo: int, row_hi: int):
+    """The previous iter_range."""
+    for col_num in range(col_lo, col_hi + 1):
+        column = number_to_column(col_num)
+        c = col_num - 1
+        base = (c & TILE_COL_MASK) << TILE_ROW_SHIFT
+        tile_row = (row_lo - 1) >> TILE_ROW_SHIFT
+        while (tile_row << TILE_ROW_SHIFT) < row_hi:
+            tile = store._tiles.get((c >> TILE_COL_SHIFT, tile_row))
+            if tile is not None:
+                first = max(row_lo, (tile_row << TILE_ROW_SHIFT) + 1)
+                last = min(row_hi, (tile_row + 1) << TILE_ROW_SHIFT)
+                tags = tile.tags
+                for row in range(first, last + 1):
+                    slot = base | ((row - 1) & TILE_ROW_MASK)
+                    if tags[slot] != TAG_EMPTY:
+                        yield store._materialize(tile, slot, column, row)
+            tile_row += 1
+
+
+def timed(function, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def run(rows: int, k: int) -> None:
+    random.seed(7)
+    store = TiledCellStore()
+    for _ in range(k):
+        store.put_number(number_to_column(random.randint(1, 26)), random.randint(1, rows), 1)
+    print(f"{len(store)} cells scattered over A1:Z{rows}")
+    for height in (rows, rows // 100, 1000):
+        row_lo = rows // 2 - height // 2 + 1
+        row_hi = row_lo + height - 1
+        repeats = max(1, 2_000_000 // max(height, k))
+        found = sum(1 for _ in store.iter_range(1, 26, row_lo, row_hi))
+        assert found == sum(1 for _ in tile_walk(store, 1, 26, row_lo, row_hi))
+        indexed = timed(lambda: sum(1 for _ in store.iter_range(1, 26, row_lo, row_hi)), repeats)
+        walked = timed(lambda: sum(1 for _ in tile_walk(store, 1, 26, row_lo, row_hi)), repeats)
+        print(f"  A{row_lo}:Z{row_hi} ({found} cells): row index {indexed * 1e3:8.3f}ms, "
+              f"tile walk {walked * 1e3:8.3f}ms ({walked / indexed:.1f}x)")
+
+    formulas = min(rows, 200_000)
+    start = time.perf_counter()
+    index = RowIndex()
+    for row in range(formulas, 0, -1):
+        index.add(row)
+    indexed = time.perf_counter() - start
+    start = time.perf_counter()
+    sorted_rows = []
+    for row in range(formulas, 0, -1):
+        insort(sorted_rows, row)
+    listed = time.perf_counter() - start
+    print(f"{formulas} formula rows added bottom-up: RowIndex {indexed:.2f}s, sorted list {listed:.2f}s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000, int(sys.argv[2]) if len(sys.argv) > 2 else 20_000)
@@ -0,0 +1,77 @@
+"""
+Saving a large sheet: sparse streaming writer vs the dense grid.
+
+Builds a ROWS x 10 sheet (bench_bulk_load's layout) with every tenth row
+left empty, and times the streaming writer used by SaveFile.run_saver and
+the checker against the previous run_saver pipeline (a dense grid filled
+with one get_cell per coordinate, then written). The checker's previous
+save rescanned every cell once per row; it is timed on a slice and
+extrapolated.
+
+    python -m benchmarks.bench_save [ROWS]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_bulk_load import write_file
+from benchmarks.bench_snapshot import load_text
+from fileio.save_file import SaveFile
+from spreadsheet.coordinate import Coordinate, number_to_column
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def dense_save(sheet: Spreadsheet, path: str) -> None:
+    max_row = max(cell.coordinate.row for cell in sheet.cells)
+    max_col = max(SaveFile()._column_to_number(cell.coordinate.column) for cell in sheet.cells)
+    data = []
+    for row in range(1, max_row + 1):
+        row_data = []
+        for col_num in range(1, max_col + 1):
+            cell = sheet.get_cell(Coordinate(number_to_column(col_num), row))
+            row_data.append(cell.get_textual_representation() if cell else "")
+        data.append(row_data)
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        for row_data in data:
+            file.write(';'.join(row_data) + ';\n')
+
+
+def rescan_save(sheet: Spreadsheet, rows: int) -> None:
+    for row in range(1, rows + 1):
+        [cell for cell in sheet.cells if cell.coordinate.row == row]
+
+
+def run(rows: int) -> None:
+    saver = SaveFile()
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "source.s2v")
+        write_file(source, rows)
+        sheet = load_text(source)
+        for row in range(10, rows + 1, 10):
+            for cell in list(sheet.get_cells_in_range(Coordinate("A", row), Coordinate("J", row))):
+                sheet._remove_cell_at_coords(cell.coordinate)
+        print(f"{len(sheet.cells)} cells in {rows} rows")
+
+        path = os.path.join(directory, "streamed.s2v")
+        start = time.perf_counter()
+        saver.write_rows(path, sheet, saver._cell_text, terminator=';', full_width=True, newline='')
+        streamed = time.perf_counter() - start
+        print(f"  streaming writer: {streamed:6.2f}s")
+
+        dense_path = os.path.join(directory, "dense.s2v")
+        start = time.perf_counter()
+        dense_save(sheet, dense_path)
+        dense = time.perf_counter() - start
+        same = open(path, 'rb').read() == open(dense_path, 'rb').read()
+        print(f"  dense grid:       {dense:6.2f}s ({dense / streamed:.1f}x slower, same bytes: {same})")
+
+        sample = 10
+        start = time.perf_counter()
+        rescan_save(sheet, sample)
+        rescan = (time.perf_counter() - start) * rows / sample
+        print(f"  per-row rescan:   {rescan:6.0f}s (extrapolated from {sample} rows)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,61 @@
+"""
+Opening a sheet from a .s2b snapshot vs loading its .s2v text.
+
+Builds the ROWS x 10 sheet of bench_bulk_load (nine numeric columns and
+one formula column), saves it both ways and times each open, then checks
+that both sheets compute the same values.
+
+    python -m benchmarks.bench_snapshot [ROWS]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_bulk_load import write_file
+from fileio.load_file import LoadFile
+from fileio.snapshot_file import SnapshotFile
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+from spreadsheet.spreadsheet_controller import SpreadsheetController
+
+
+def load_text(path: str) -> Spreadsheet:
+    sheet = Spreadsheet()
+    sheet.load_cells((column, row, SpreadsheetController._classify_loaded_text(text))
+                     for column, row, text in LoadFile().iter_cell_texts(path))
+    return sheet
+
+
+def run(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, "big.s2v")
+        snapshot_path = os.path.join(directory, "big.s2b")
+        write_file(text_path, rows)
+
+        start = time.perf_counter()
+        sheet = load_text(text_path)
+        text_open = time.perf_counter() - start
+
+        start = time.perf_counter()
+        SnapshotFile().save(sheet, snapshot_path)
+        saved = time.perf_counter() - start
+
+        start = time.perf_counter()
+        restored = SnapshotFile().load(snapshot_path)
+        snapshot_open = time.perf_counter() - start
+
+        print(f"{rows * 10} cells: .s2v {os.path.getsize(text_path) / 1e6:.1f} MB,"
+              f" .s2b {os.path.getsize(snapshot_path) / 1e6:.1f} MB (saved in {saved:.2f}s)")
+        print(f"  open .s2v: {text_open:6.2f}s")
+        print(f"  open .s2b: {snapshot_open:6.2f}s ({text_open / snapshot_open:.1f}x faster)")
+
+        sheet.recalculate()
+        restored.recalculate()
+        for row in (1, rows // 2, rows):
+            coordinate = Coordinate("J", row)
+            assert sheet.get_cell(coordinate).get_value(sheet) == restored.get_cell(coordinate).get_value(restored)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,65 @@
+"""
+Tiled storage benchmark.
+
+Compares bytes per numeric cell of the tiled store against a plain
+(column, row) -> Cell dict, and times a full-column range scan.
+
+    python -m benchmarks.bench_tile_store [ROWS]
+"""
+import sys
+import time
+import tracemalloc
+
+from content.numerical_content import NumericContent
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+COLUMNS = [chr(ord('A') + i) for i in range(8)]
+
+
+def measure(build) -> tuple:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    obj = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return obj, size
+
+
+def build_object_dict(rows: int) -> dict:
+    cells = {}
+    for row in range(1, rows + 1):
+        for col in COLUMNS:
+            cells[(col, row)] = Cell((col, row), NumericContent(row * 0.5))
+    return cells
+
+
+def build_tiled(rows: int) -> Spreadsheet:
+    sheet = Spreadsheet()
+    for row in range(1, rows + 1):
+        for col in COLUMNS:
+            sheet.add_cell(Coordinate(col, row), Cell((col, row), NumericContent(row * 0.5)))
+    return sheet
+
+
+def run(rows: int) -> None:
+    n_cells = rows * len(COLUMNS)
+    _, dict_bytes = measure(lambda: build_object_dict(rows))
+    sheet, tiled_bytes = measure(lambda: build_tiled(rows))
+
+    start = time.perf_counter()
+    total = sum(cell.content.get_value()
+                for cell in sheet.get_cells_in_range(Coordinate("A", 1), Coordinate("A", rows)))
+    scan_time = time.perf_counter() - start
+
+    print(f"{n_cells} numeric cells")
+    print(f"  object dict : {dict_bytes / n_cells:7.1f} bytes/cell")
+    print(f"  tiled store : {tiled_bytes / n_cells:7.1f} bytes/cell"
+          f"  ({dict_bytes / max(tiled_bytes, 1):.1f}x smaller)")
+    print(f"  column scan : {rows} cells in {scan_time * 1e3:.1f} ms (sum={total})")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,85 @@
+"""
+Tokenizer throughput: the shared scanner vs the previous (name, text) tokenizer.
+
+Scans a corpus of N formulas in the shapes a sheet is made of (row
+arithmetic, function calls over ranges, nested functions) and reports
+tokens/second for: the previous tokenizer, both shared and constructed per
+formula; scan with its cache cleared (every text scanned); and scan over a
+sheet where each distinct formula text appears REPEATS times (fill-down of
+absolute ranges, reloads), which the cache answers after the first.
+
+    python -m benchmarks.bench_tokenizer [N] [REPEATS]
+"""
+import re
+import sys
+import time
+
+from formula.tokenizer import scan
+
+
+class PreviousTokenizer:
+    """The tokenizer before the shared scanner: regex compiled per instance, (name, text) tuples."""
+
+    def __init__(self):
+        self.token_regex = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in [
+            ('RANGE', r'[A-Z]+\d+:[A-Z]+\d+'), ('FUNC', r'SUMA|PROMEDIO|MAX|MIN'), ('CELL', r'[A-Z]+\d+'),
+            ('NUMBER', r'\d+(\.\d+)?'), ('PLUS', r'\+'), ('MINUS', r'-'), ('TIMES', r'\*'), ('DIVIDE', r'/'),
+            ('LPAREN', r'\('), ('RPAREN', r'\)'), ('SEMI', r';'), ('COLON', r':'), ('SKIP', r'[ \t]+'),
+            ('MISMATCH', r'.'),
+        ]))
+
+    def tokenize(self, formula):
+        tokens = []
+        pos = 0
+        while pos < len(formula):
+            match = self.token_regex.match(formula, pos)
+            kind = match.lastgroup
+            if kind != 'SKIP':
+                tokens.append((kind, match.group(kind)))
+            pos = match.end()
+        return tokens
+
+
+SHAPES = (
+    "A{r}+B{r}*2",
+    "(A{r}+B{r})*(C{r}-D{r})/E{r}",
+    "SUMA(A1:A{r})",
+    "PROMEDIO(B{r}:F{r})/2 + 1.5",
+    "MAX(A{r};B{r};3.5)-MIN(C1:C{r})",
+    "SUMA(A{r}:C{r};MAX(D{r};E{r});10) * F{r}",
+    "A{r} * 1.21 - B{p} / 100",
+)
+
+
+def corpus(n: int):
+    return [SHAPES[i % len(SHAPES)].format(r=i // len(SHAPES) + 2, p=i // len(SHAPES) + 1) for i in range(n)]
+
+
+def timed(label: str, texts, tokenize, baseline: float = None) -> float:
+    start = time.perf_counter()
+    count = sum(len(tokenize(text)) for text in texts)
+    rate = count / (time.perf_counter() - start)
+    versus = f" ({rate / baseline:.1f}x)" if baseline else ""
+    print(f"  {label:<32} {rate / 1e6:6.2f}M tokens/s{versus}")
+    return rate
+
+
+def run(n: int, repeats: int) -> None:
+    texts = corpus(n)
+    print(f"{n} formulas, {sum(len(scan(text)) for text in texts)} tokens")
+    shared = PreviousTokenizer()
+    baseline = timed("previous, shared instance", texts, shared.tokenize)
+    timed("previous, instance per formula", texts, lambda text: PreviousTokenizer().tokenize(text), baseline)
+    scan.cache_clear()
+    timed("scan, every text new", texts, scan, baseline)
+
+    repeated = [text for text in texts[:max(n // repeats, 1)] for _ in range(repeats)]
+    scan.cache_clear()
+    baseline = timed(f"previous, {repeats} cells per text", repeated, shared.tokenize)
+    scan.cache_clear()
+    timed(f"scan, {repeats} cells per text", repeated, scan, baseline)
+    print(f"  cache: {scan.cache_info()}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,71 @@
+"""
+Bulk edits: one at a time versus one transaction.
+
+Fills A1..AN with numbers, B1..BN with =A<i>*2 and a running total
+C1 = B1, C<i> = C<i-1>+B<i>, then rewrites every number and every B
+formula. The per-edit path adds each cell and evaluates it (as an
+interactive edit does), invalidating the rest of the running total every
+time: quadratic in N. The transaction stores all the edits, checks the new
+formulas for cycles, invalidates the dependents of all of them in one
+traversal and evaluates them in a single pass.
+
+    python -m benchmarks.bench_transaction [N]
+"""
+import sys
+import time
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def _sheet(n: int) -> Spreadsheet:
+    sheet = Spreadsheet()
+    with sheet.transaction() as transaction:
+        for row in range(1, n + 1):
+            transaction.set_cell_content(Coordinate("A", row), NumericContent(row))
+            transaction.set_cell_content(Coordinate("B", row), FormulaContent(f"=A{row}*2"))
+            total = f"=C{row - 1}+B{row}" if row > 1 else "=B1"
+            transaction.set_cell_content(Coordinate("C", row), FormulaContent(total))
+    sheet.get_cell(Coordinate("C", n)).get_value(sheet)
+    return sheet
+
+
+def run(n: int) -> None:
+    sheet = _sheet(n)
+    start = time.perf_counter()
+    for row in range(1, n + 1):
+        sheet.add_cell(Coordinate("A", row), Cell(("A", row), NumericContent(row + 1)))
+        cell = Cell(("B", row), FormulaContent(f"=A{row}*3"))
+        sheet.add_cell(Coordinate("B", row), cell)
+        cell.content.get_value(sheet, f"B{row}")
+    total = sheet.get_cell(Coordinate("C", n)).get_value(sheet)
+    per_edit = time.perf_counter() - start
+    print(f"{2 * n} edits one at a time: {per_edit:.2f}s -> C{n} = {total}")
+
+    sheet = _sheet(n)
+    start = time.perf_counter()
+    with sheet.transaction() as transaction:
+        for row in range(1, n + 1):
+            transaction.set_cell_content(Coordinate("A", row), NumericContent(row + 1))
+            transaction.set_cell_content(Coordinate("B", row), FormulaContent(f"=A{row}*3"))
+    total = sheet.get_cell(Coordinate("C", n)).get_value(sheet)
+    batched = time.perf_counter() - start
+    print(f"{2 * n} edits in one transaction: {batched:.2f}s -> C{n} = {total} ({per_edit / batched:.1f}x)")
+
+    sheet = _sheet(n)
+    start = time.perf_counter()
+    try:
+        with sheet.transaction() as transaction:
+            for row in range(1, n + 1):
+                transaction.set_cell_content(Coordinate("A", row), NumericContent(0))
+            transaction.set_cell_content(Coordinate("A", n), FormulaContent(f"=C{n}"))
+    except Exception as e:
+        print(f"rejected transaction rolled back in {time.perf_counter() - start:.2f}s ({e})"
+              f" -> C{n} = {sheet.get_cell(Coordinate('C', n)).get_value(sheet)}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
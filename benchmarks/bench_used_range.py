@@ -0,0 +1,82 @@
+"""
+Used-range bounds kept by the store vs recomputed from every cell.
+
+Fills ROWS rows of a sheet, COLUMNS columns wide (numbers, with a text
+cell every 100 rows), and times: the bounds print_spreadsheet and the
+savers used to compute (min/max row and column over every cell) against
+TiledCellStore.bounds(); removing each row's rightmost cell, which moves
+the row's last column to the next bit of its column mask; and a whole-column
+aggregate (A1:A1048576) on a fresh store, with the rows below the data
+cut off against the previous tree over all 2048 tile rows.
+
+    python -m benchmarks.bench_used_range [ROWS] [COLUMNS]
+"""
+import sys
+import time
+
+from content.text_content import TextContent
+from spreadsheet.cell import Cell
+from spreadsheet.aggregate_index import summary_total
+from spreadsheet.coordinate import column_to_number, number_to_column
+from spreadsheet.tile_store import TILE_ROW_SHIFT, TiledCellStore
+
+SHEET_ROWS = 1_048_576
+
+
+def build(rows: int, columns: int) -> TiledCellStore:
+    store = TiledCellStore()
+    for col_num in range(1, columns + 1):
+        column = number_to_column(col_num)
+        for row in range(1, rows + 1):
+            if row % 100 == 0 and col_num == columns:
+                store.put(Cell((column, row), TextContent("total")))
+            else:
+                store.put_number(column, row, row * col_num)
+    return store
+
+
+def scanned_bounds(store: TiledCellStore):
+    """The previous bounds: every cell materialized and compared."""
+    coords = [cell.coordinate for cell in store]
+    columns = [column_to_number(coord.column) for coord in coords]
+    return (min(coord.row for coord in coords), max(coord.row for coord in coords), min(columns), max(columns))
+
+
+def run(rows: int, columns: int) -> None:
+    start = time.perf_counter()
+    store = build(rows, columns)
+    print(f"{len(store)} cells ({rows} rows x {columns} columns) in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    scanned = scanned_bounds(store)
+    elapsed = time.perf_counter() - start
+    repeats = 100_000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        bounds = store.bounds()
+    kept = (time.perf_counter() - start) / repeats
+    assert bounds == scanned
+    print(f"  bounds {bounds}: full scan {elapsed * 1e3:.1f}ms, kept {kept * 1e6:.2f}us ({elapsed / kept:,.0f}x)")
+
+    last = number_to_column(columns)
+    start = time.perf_counter()
+    for row in range(1, rows + 1):
+        store.remove(last, row)
+    elapsed = time.perf_counter() - start
+    assert store.row_last_column(rows) == columns - 1 and store.last_column() == columns - 1
+    print(f"  rightmost cell removed from every row: {elapsed / rows * 1e6:.2f}us per removal")
+
+    fresh = build(rows, 2)
+    start = time.perf_counter()
+    summary = fresh.range_summary(1, 1, 1, SHEET_ROWS)
+    clamped = time.perf_counter() - start
+    fresh = build(rows, 2)
+    start = time.perf_counter()
+    fresh._column_tree(1, (SHEET_ROWS - 1) >> TILE_ROW_SHIFT).query(0, (SHEET_ROWS - 1) >> TILE_ROW_SHIFT)
+    full = time.perf_counter() - start
+    print(f"  A1:A{SHEET_ROWS} first aggregate (sum {summary_total(summary):.0f}): cut to the data {clamped * 1e3:.1f}ms, "
+          f"whole column {full * 1e3:.1f}ms ({full / clamped:.1f}x)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000, int(sys.argv[2]) if len(sys.argv) > 2 else 8)
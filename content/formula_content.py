@@ -1,75 +1,125 @@
 from content.cell_content import CellContent
 from typing import List, Optional
 from abc import ABC, abstractmethod
-from formula.tokenizer   import Tokenizer
+from formula.tokenizer   import scan
 from formula.parser      import Parser
 from formula.postfix_converter import PostfixConverter
 from formula.postfix_evaluator   import PostfixExpressionEvaluator
+from formula.compiled_evaluator  import EVALUATION_BACKENDS
 from formula.operand import Operand
 from formula.operator import Operator
-from formula.parser import Parser
-from formula.postfix_converter import PostfixConverter
 from formula.formula_element import FormulaElement
+from formula.formula_template import FormulaTemplate
 from spreadsheet.spreadsheet import Spreadsheet
 from formula.operand import CellOperand, FunctionOperand
 from formula.function import FunctionArgument, CellArgument, CellRangeArgument, FunctionArgumentWrapper
-from typing import Set
+from spreadsheet.coordinate import split_cell_name
+from typing import Set, Tuple
 import re
 
 class FormulaContent(CellContent):
+    # Backend used by new formulas: "visitor" (default) or "compiled"
+    evaluation_backend: str = "visitor"
+
     def __init__(self, formula: str) -> None:
         super().__init__()
         self.formula: str = formula
-        self.elements: List[FormulaElement] = []
-        self.tokenizer = Tokenizer()
-        self.parser: Optional[Parser] = None
-        self.postfix_converter: PostfixConverter = PostfixConverter()
-        self.postfix_evaluator: PostfixExpressionEvaluator = PostfixExpressionEvaluator()
-        
-        # Simple caching: store the computed value
-        self._computed_value: Optional[float] = None
 
-        self._parsed_tokens = None
+    @property
+    def formula(self) -> str:
+        return self._formula
+
+    @formula.setter
+    def formula(self, formula: str) -> None:
+        # The compiled program belongs to the text: rebuild it only when the text changes
+        self._formula = formula
+        self._computed_value = None
+        self._template: Optional[FormulaTemplate] = None
+        self._anchor: Optional[Tuple[int, int]] = None
+        self._dependencies_registered = False
+
+    @property
+    def elements(self) -> List[FormulaElement]:
+        """Parsed elements of the shared template (references relative to the anchor)."""
+        return self._template.elements if self._template is not None else []
+
+    @property
+    def _references(self):
+        """Absolute (cells, ranges) this formula reads, or None until compiled."""
+        if self._template is None:
+            return None
+        column, row = self._anchor
+        return self._template.references(column, row)
+
+    @classmethod
+    def use_evaluation_backend(cls, backend: str) -> None:
+        """Select the postfix evaluator ("visitor" or "compiled") for formulas created from now on."""
+        if backend not in EVALUATION_BACKENDS:
+            raise ValueError(f"Unknown evaluation backend: {backend}")
+        cls.evaluation_backend = backend
 
     def get_value(self, spreadsheet: Optional[Spreadsheet] = None, current_cell_name: str = None) -> float:
         # If we already have a computed value, return it
         if self._computed_value is not None:
             return self._computed_value
-            
-        # Otherwise, compute and store the value
+
+        # Otherwise let the sheet compute it, precedents first, without recursion
+        if spreadsheet is not None:
+            if current_cell_name is None:
+                try:
+                    current_cell_name = spreadsheet.get_cell_name(self)
+                except ValueError:
+                    current_cell_name = None
+            if current_cell_name is not None:
+                spreadsheet.recalculate([current_cell_name])
+                if self._computed_value is not None:
+                    return self._computed_value
+
+        # Not stored in a sheet: compute and store the value directly
         self._computed_value = self._compute_value(spreadsheet, current_cell_name)
         return self._computed_value
 
     def _compute_value(self, spreadsheet: Spreadsheet, current_cell_name: str = None) -> float:
         """Internal method that actually computes the formula value"""
+        if not self._dependencies_registered:
+            # First evaluation of this text: compile, check cycles, register edges
+            self.check_circular_dependencies(spreadsheet, current_cell_name)
+
+        # Recalculation only evaluates the cached (shared) program at this cell
+        column, row = self._anchor
+        return self._template.evaluate(column, row)
+
+    def compile(self, spreadsheet: Spreadsheet, current_cell_name: str = None) -> None:
+        """
+        Tokenize the formula and attach the sheet's template for its relative
+        form, parsing and converting to postfix only when no cell has the same
+        template yet. References in the program are resolved at evaluation
+        time, so it survives value invalidation and edits of the referenced cells.
+        """
+        if self._template is not None:
+            return
         if not self.validate_formula_format():
             raise ValueError("Invalid formula format: must start with '='")
+        if current_cell_name is None:
+            current_cell_name = spreadsheet.get_cell_name(self)
 
         raw_expression = str(self.formula)[1:].replace(',', ';')
 
-        # Tokenize into raw strings 
-        tokens = self.tokenizer.tokenize(raw_expression)
+        # Token offsets into the expression, from the shared scanner's cache
+        tokens = scan(raw_expression)
 
-        # Parse into typed tokens 
-        self.parser = Parser(tokens)
-        self.elements = self.parser.parse_tokens(spreadsheet)
-
-        # Check for circular dependencies
-        self.check_circular_dependencies(spreadsheet, current_cell_name)
-
-        # Convert to postfix for evaluation
-        self.postfix_converter = PostfixConverter()
-        postfix_tokens = self.postfix_converter.convert_to_postfix(self.elements)
-
-        # Evaluate postfix expression
-        result = self.postfix_evaluator.evaluate_postfix_expression(postfix_tokens)
-
-        return result
+        column, row = split_cell_name(current_cell_name)
+        self._template = FormulaTemplate.for_cell(raw_expression, tokens, column, row, spreadsheet,
+                                                  self.evaluation_backend)
+        self._anchor = (column, row)
 
     def invalidate_value(self):
-        """Mark the stored value as invalid, forcing recomputation on next access"""
+        """Mark the stored value as invalid, forcing re-evaluation (not recompilation) on next access"""
         self._computed_value = None
-        self._parsed_tokens = None
+
+    def invalidate_program(self):
+        """Drop the compiled program as well, forcing a full re-parse on next access"""
+        self.formula = self._formula
 
     def has_computed_value(self) -> bool:
         """Check if this formula has a stored computed value"""
@@ -80,7 +130,7 @@ class FormulaContent(CellContent):
         return self.formula.startswith("=")
 
     def check_circular_dependencies(self, spreadsheet: Spreadsheet, current_cell_name: str = None):
-        """Uses typed tokens from parser instead of manual string parsing."""
+        """Uses the references of the compiled program instead of manual string parsing."""
         if current_cell_name is None:
             try:
                 current_cell = spreadsheet.get_cell_name(self)
@@ -89,19 +139,15 @@ class FormulaContent(CellContent):
         else:
             current_cell = current_cell_name
 
-        # Parse tokens if not already cached
-        if self._parsed_tokens is None:
-            raw_expression = str(self.formula)[1:].replace(',', ';')
-            tokens = self.tokenizer.tokenize(raw_expression)
-            self.parser = Parser(tokens)
-            self._parsed_tokens = self.parser.parse_tokens(spreadsheet)
+        # Compile if not already cached
+        self.compile(spreadsheet, current_cell)
 
         # Use existing dependency checking logic
         dependency_manager = spreadsheet.dep_manager
-        # Get referenced cells using typed tokens
-        referenced_cells = dependency_manager.get_referenced_cells_from_tokens(self._parsed_tokens)
-        dependency_manager.check_circular_dependencies(current_cell, referenced_cells)
-        dependency_manager.update_dependencies(current_cell, referenced_cells)
+        referenced_cells, referenced_ranges = self._references
+        dependency_manager.check_circular_dependencies(current_cell, referenced_cells, referenced_ranges)
+        dependency_manager.update_dependencies(current_cell, referenced_cells, referenced_ranges)
+        self._dependencies_registered = True
 
     def get_text(self) -> str:
         """Returns the formula as a string exactly as stored."""
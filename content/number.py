@@ -4,6 +4,13 @@ from typing import Union
 NumberValue = Union[int, float]
 
 
+def checked_number(v) -> NumberValue:
+    """v itself if it is an int or float (exact types first: one check per value)."""
+    if type(v) is float or type(v) is int or isinstance(v, (int, float)):
+        return v
+    raise TypeError("Number must be int or float")
+
+
 class Number:
     """Value Object simple que envuelve un número y aplica validación."""
 
@@ -19,9 +26,7 @@ class Number:
 
     @value.setter
     def value(self, v: NumberValue):
-        if not isinstance(v, NumberValue):
-            raise TypeError("Number must be int or float")
-        self._value = v
+        self._value = checked_number(v)
 
     # API unificada
     def get_value(self) -> NumberValue:
@@ -5,9 +5,15 @@ from content.number import Number, NumberValue
 
 
 class NumericContent(CellContent):
-    def __init__(self, number: NumberValue):
+    """
+    Contenido numérico. La hoja guarda el valor crudo (sin caja) y crea este
+    objeto cuando alguien pide la celda; su Number escribe en la hoja, así
+    que set_number (o number.value = ...) cambia la celda igual que antes.
+    """
+
+    def __init__(self, number: Union[NumberValue, Number]):
         # Acepta tanto Number como valor crudo
-        self.number = Number(number) if isinstance(number, (int, float)) else number
+        self.number = number if isinstance(number, Number) else Number(number)
 
     # API pública
     def get_number(self) -> float:
@@ -17,7 +23,7 @@ class NumericContent(CellContent):
         return str(self.number)
 
     def get_value(self):  # spreadsheet no se usa, pero mantiene la firma
-        return self.get_number()
+        return self.number.get_value()
 
     # Setter opcional
     def set_number(self, value: NumberValue) -> None:
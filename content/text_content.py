@@ -1,26 +1,44 @@
 # spreadsheet/content/text_content.py
 from content.cell_content import CellContent
 
+# Cached get_number result of a text that is not a number
+_NOT_A_NUMBER = object()
+
 
 class TextContent(CellContent):
     def __init__(self, text: str = ""):
         self.text = text
 
-    # Conversión a número (opcional)
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, text: str) -> None:
+        self._text = text
+        self._number = None  # parsed on the first get_number
+
+    # Conversión a número (opcional), parseada una sola vez por texto
     def get_number(self) -> float:
-        if self.text == "":
-            raise ValueError("Empty text cannot be converted to number")
-        try:
-            return float(self.text)
-        except ValueError as exc:
-            raise ValueError(f"'{self.text}' is not a valid number") from exc
+        number = self._number
+        if number is None:
+            try:
+                number = float(self._text)
+            except ValueError:
+                number = _NOT_A_NUMBER
+            self._number = number
+        if number is _NOT_A_NUMBER:
+            if self._text == "":
+                raise ValueError("Empty text cannot be converted to number")
+            raise ValueError(f"'{self._text}' is not a valid number")
+        return number
 
     # Obligatorio
     def get_text(self) -> str:
-        return self.text
+        return self._text
 
     def get_value(self):
-        return self.text
+        return self._text
 
     # Mutador
     def set_text(self, text: str) -> None:
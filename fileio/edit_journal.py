@@ -0,0 +1,238 @@
+import csv
+import io
+import os
+import re
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from exceptions import FileNotFoundException
+from fileio.mapped_file import MappedSheetFile
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate, column_to_number
+
+JOURNAL_SUFFIX = ".journal"
+# Journal segment being folded into the base file by a compaction
+COMPACTING_SUFFIX = ".journal.compacting"
+
+# Compact once the journal outgrows the base file (and this floor): every
+# rewrite of the base is paid for by at least as many bytes of appended edits
+_COMPACT_MIN_BYTES = 1 << 20
+
+_RECORD = re.compile(r"([A-Z]+)(\d+)\t(.*)")
+_UNESCAPE = re.compile(r"\\(.)")
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def _unescape(text: str) -> str:
+    return _UNESCAPE.sub(lambda match: {'n': '\n', 'r': '\r'}.get(match.group(1), match.group(1)), text)
+
+
+def _split_row(body: str) -> List[str]:
+    """Fields of a base-file line, read like LoadFile and MappedSheetFile read them."""
+    return next(csv.reader([body], delimiter=';'), [])
+
+
+def _join_row(fields: List[str]) -> str:
+    """A base-file line of fields, quoting those holding ';' or '"' so they read back whole."""
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=';', lineterminator='').writerow(fields)
+    return buffer.getvalue()
+
+
+class EditJournal:
+    """
+    Append-only log of the edits made to a sheet since its .s2v base file was
+    written, kept beside it as <base>.journal. Every committed edit appends
+    one line, "<cell>\\t<text>", and flushes it, so persisting an edit costs
+    the same however big the sheet is. Loading replays the base file and
+    then the journal (see replay).
+
+    Compaction folds the journal back into a fresh base file. The journal is
+    first renamed to <base>.journal.compacting, so new edits go to a new
+    segment, and a background thread rewrites the base from the old one and
+    the compacting segment alone (rows no edit touched are copied verbatim),
+    swaps it in with os.replace and deletes the segment. A sheet paged from
+    the base file passes its MappedSheetFile as mapped: the mapping is
+    closed around the swap (a mapped file can't be replaced on Windows) and
+    then reopened on the new base, whose rows read the same. Records set a
+    cell to a text, so they can be replayed twice: a crash at any point
+    leaves files that replay to the same sheet. Texts holding ';' or '"'
+    are quoted into the base; a segment with a line break in a text is not
+    folded at all (a base row is one line), and stays to be replayed.
+    """
+
+    def __init__(self, base_path: str, truncate: bool = False, sync: bool = False,
+                 mapped: Optional[MappedSheetFile] = None) -> None:
+        self.base_path = base_path
+        self.path = base_path + JOURNAL_SUFFIX
+        self.compacting_path = base_path + COMPACTING_SUFFIX
+        # With sync every append is also fsynced, surviving power loss, not just a crash
+        self.sync = sync
+        self.mapped = mapped
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        # Set when the pending segment can't be folded into the base
+        self._unfoldable = False
+        try:
+            if truncate:
+                self.discard(base_path)
+            self._file = open(self.path, 'ab')
+            self._size = self._file.tell()
+            self._base_size = os.path.getsize(base_path) if os.path.exists(base_path) else 0
+        except OSError as e:
+            raise FileNotFoundException(f"Could not open journal: {e}")
+
+    @staticmethod
+    def exists(base_path: str) -> bool:
+        """Whether edits are journaled beside a base file."""
+        return os.path.exists(base_path + JOURNAL_SUFFIX) or os.path.exists(base_path + COMPACTING_SUFFIX)
+
+    @staticmethod
+    def discard(base_path: str) -> None:
+        """Delete the journal of a base file just rewritten with every edit."""
+        for path in (base_path + JOURNAL_SUFFIX, base_path + COMPACTING_SUFFIX):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __enter__(self) -> "EditJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for a running compaction and close the journal."""
+        self.wait()
+        with self._lock:
+            self._file.close()
+
+    def record(self, cells: Iterable[Cell]) -> None:
+        """Append the new text of each edited cell, as one flushed write."""
+        data = "".join(
+            f"{cell.coordinate.column}{cell.coordinate.row}\t{_escape(cell.get_textual_representation())}\n"
+            for cell in cells
+        ).encode('utf-8')
+        with self._lock:
+            self._file.write(data)
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+            self._size += len(data)
+        if self._size >= max(self._base_size, _COMPACT_MIN_BYTES):
+            self.compact()
+
+    def records(self) -> Iterator[Tuple[str, int, str]]:
+        """(column, row, text) of every journaled edit, oldest first, including a segment being compacted."""
+        for path in (self.compacting_path, self.path):
+            yield from self._read_records(path)
+
+    def replay(self, spreadsheet, parse: Callable[[str], object]) -> int:
+        """
+        Apply the journal to a sheet just loaded from the base file, in one
+        transaction, with parse turning a text into cell content. Returns the
+        number of cells edited. Call it before the journal is attached, so
+        the replayed edits are not journaled again.
+        """
+        edits: Dict[Tuple[str, int], str] = {}
+        for column, row, text in self.records():
+            edits[(column, row)] = text
+        try:
+            with spreadsheet.transaction(evaluate=False) as transaction:
+                for (column, row), text in edits.items():
+                    transaction.set_cell_content(Coordinate(column, row), parse(text))
+        except Exception as e:
+            raise FileNotFoundException(f"Corrupt journal {self.path}: {e}")
+        return len(edits)
+
+    def compact(self, wait: bool = False) -> None:
+        """Fold the journal into a fresh base file on a background thread (and block until done with wait)."""
+        self.wait()
+        with self._lock:
+            if self._unfoldable:
+                return
+            pending = os.path.exists(self.compacting_path)
+            if not pending and not self._size:
+                return
+            if not pending:
+                # A segment left by an interrupted compaction is folded first, on its own
+                self._file.close()
+                os.replace(self.path, self.compacting_path)
+                self._file = open(self.path, 'ab')
+                self._size = 0
+            # Not a daemon: exiting waits for the base file to be swapped in
+            self._compactor = threading.Thread(target=self._fold, name="journal-compaction")
+            self._compactor.start()
+        if wait:
+            self.wait()
+
+    def wait(self) -> None:
+        """Block until a running compaction is done."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def _fold(self) -> None:
+        overlay: Dict[int, Dict[int, str]] = {}
+        for column, row, text in self._read_records(self.compacting_path):
+            if '\n' in text or '\r' in text:
+                # Kept in the segment, which is replayed before the journal
+                self._unfoldable = True
+                return
+            overlay.setdefault(row, {})[column_to_number(column)] = text
+        temp_path = self.base_path + ".tmp"
+        with open(temp_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as target:
+            # Lines end like the base's: every value followed by ';' (run_saver) or not
+            terminator, row, ending = ';', 0, '\n'
+            if os.path.exists(self.base_path):
+                with open(self.base_path, 'r', newline='', encoding='utf-8') as source:
+                    for row, line in enumerate(source, start=1):
+                        body = line.rstrip('\r\n')
+                        ending = line[len(body):]
+                        if body:
+                            terminator = ';' if body.endswith(';') else ''
+                        edits = overlay.pop(row, None)
+                        if edits is None:
+                            target.write(line)
+                            continue
+                        fields = _split_row(body[:-1] if terminator else body)
+                        target.write(self._edited_line(fields, edits, terminator) + ending)
+            if overlay:
+                if row and not ending:
+                    target.write('\n')
+                for edited_row in sorted(overlay):
+                    target.write((terminator + '\n') * (edited_row - row - 1))
+                    target.write(self._edited_line([], overlay[edited_row], terminator) + '\n')
+                    row = edited_row
+            self._base_size = target.tell()
+        if self.mapped is not None:
+            self.mapped.swap(lambda: os.replace(temp_path, self.base_path))
+        else:
+            os.replace(temp_path, self.base_path)
+        os.remove(self.compacting_path)
+
+    @staticmethod
+    def _edited_line(fields: List[str], edits: Dict[int, str], terminator: str) -> str:
+        for col_num, text in edits.items():
+            if col_num > len(fields):
+                fields.extend([''] * (col_num - len(fields)))
+            fields[col_num - 1] = text
+        return _join_row(fields) + terminator
+
+    @staticmethod
+    def _read_records(path: str) -> Iterator[Tuple[str, int, str]]:
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, 'r', newline='', encoding='utf-8') as file:
+                for line in file:
+                    if not line.endswith('\n'):
+                        # Torn last record from an interrupted append: never committed
+                        break
+                    match = _RECORD.fullmatch(line[:-1])
+                    if match:
+                        yield match.group(1), int(match.group(2)), _unescape(match.group(3))
+        except OSError as e:
+            raise FileNotFoundException(f"Failed to read journal: {e}")
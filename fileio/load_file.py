@@ -1,13 +1,24 @@
 import os
 import csv
+from typing import Iterator, List, Tuple
 from exceptions import (
     InvalidFilePathException,
     InvalidFileNameException,
     FileNotFoundException
 )
+from fileio.compressed_file import COMPRESSED_EXTENSIONS, open_sheet_file, split_extension
+from spreadsheet.coordinate import number_to_column
 from ui.display import DisplayContent
 
 
+def row_cell_texts(row_idx: int, row_values: List[str]) -> Iterator[Tuple[str, int, str]]:
+    """(column, row, text) of the non-empty cells of one parsed row."""
+    for col_idx, cell_text in enumerate(row_values, start=1):
+        text = cell_text.strip().rstrip(';')
+        if text:
+            yield number_to_column(col_idx), row_idx, text
+
+
 class LoadFile:
     def __init__(self):
         self.show = DisplayContent()
@@ -24,18 +35,26 @@ class LoadFile:
             raise InvalidFilePathException("No path provided.")
         if not os.path.exists(file_path):
             raise FileNotFoundException(f"File does not exist: {file_path}")
-        _, ext = os.path.splitext(file_path)
-        if ext.lower() not in ['.csv', '.txt', '.s2v']:
+        _, ext = split_extension(file_path)
+        if ext.lower() not in ['.csv', '.txt', '.s2v', '.s2b', *COMPRESSED_EXTENSIONS]:
             raise InvalidFileNameException(f"Unsupported file format: {ext}")
 
     def load_spreadsheet_data(self, file_path: str) -> list:
+        return list(self.iter_rows(file_path))
+
+    def iter_rows(self, file_path: str) -> Iterator[List[str]]:
+        """Rows of the file, read lazily one at a time (decompressed as they are read for .s2v.gz/.s2v.xz)."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                reader = csv.reader(file, delimiter=';')
-                return list(reader)
+            with open_sheet_file(file_path) as file:
+                yield from csv.reader(file, delimiter=';')
         except Exception as e:
             raise FileNotFoundException(f"Failed to read file: {e}")
 
+    def iter_cell_texts(self, file_path: str) -> Iterator[Tuple[str, int, str]]:
+        """(column, row, text) of every non-empty cell, streamed row by row."""
+        for row_idx, row_values in enumerate(self.iter_rows(file_path), start=1):
+            yield from row_cell_texts(row_idx, row_values)
+
     def run_loader(self):
         file_path = self.prompt_for_file_path()
         if file_path:
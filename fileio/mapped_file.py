@@ -0,0 +1,118 @@
+import csv
+import mmap
+import threading
+from array import array
+from itertools import accumulate, islice, repeat
+from operator import add
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from exceptions import FileNotFoundException
+from fileio.load_file import row_cell_texts
+
+# Bytes indexed per step: the index runs at most this far past the rows asked for
+_SCAN_CHUNK = 1 << 20
+
+
+class MappedSheetFile:
+    """
+    Read-only view of a .s2v file for random access to its rows, meant for
+    files too big to load. Opening only maps the file; the row-offset index
+    is extended chunk by chunk as far as the rows asked for, and a row is
+    split into cell texts only when it is read. Once the index reaches the
+    end of the file the row count is known, and rows past it are answered
+    without touching the file again. Rows are taken to be single lines (the
+    savers never quote a newline into a cell).
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        # Held by every read, so swap() never closes the mapping under one
+        self._lock = threading.RLock()
+        self._open()
+
+    def _open(self) -> None:
+        try:
+            self._file = open(self.file_path, 'rb')
+            size = self._file.seek(0, 2)
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        except OSError as e:
+            raise FileNotFoundException(f"Failed to read file: {e}")
+        self._size = size
+        # Start offset of every indexed row; row r spans _starts[r-1] up to _starts[r]
+        self._starts = array('q', [0])
+        # Set once the whole file is indexed
+        self._rows: Optional[int] = 0 if size == 0 else None
+
+    def __enter__(self) -> "MappedSheetFile":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def swap(self, replace: Callable[[], None]) -> None:
+        """
+        Close the file, run replace (which puts a file with the same rows in
+        its place) and map the new one; reads wait meanwhile. The row index
+        is rebuilt as rows are read again.
+        """
+        with self._lock:
+            self.close()
+            try:
+                replace()
+            finally:
+                self._open()
+
+    @property
+    def complete(self) -> bool:
+        """Whether every row is indexed (and row_count costs nothing)."""
+        return self._rows is not None
+
+    def index_rows(self, upto: int) -> int:
+        """Index the file up to row `upto`; returns how many of rows 1..upto exist."""
+        if self._rows is not None:
+            return min(upto, self._rows)
+        with self._lock:
+            return self._index_rows(upto)
+
+    def _index_rows(self, upto: int) -> int:
+        starts, data, size = self._starts, self._map, self._size
+        while len(starts) <= upto and self._rows is None:
+            position = starts[-1]
+            end = data.rfind(b'\n', position, position + _SCAN_CHUNK)
+            if end < 0:
+                # No newline in the chunk: one very long row, or the last one
+                end = data.find(b'\n', position + _SCAN_CHUNK) if position + _SCAN_CHUNK < size else -1
+                if end < 0:
+                    starts.append(size)
+                    self._rows = len(starts) - 1
+                    break
+            # Row lengths from one split of the chunk; the running sum gives the row starts
+            lengths = map(add, map(len, data[position:end].split(b'\n')), repeat(1))
+            starts.extend(islice(accumulate(lengths, initial=position), 1, None))
+            if end + 1 >= size:
+                self._rows = len(starts) - 1
+                break
+        return min(upto, len(starts) - 1)
+
+    @property
+    def row_count(self) -> int:
+        """Number of rows (indexes the whole file)."""
+        return self.index_rows(2 ** 62)
+
+    def row_values(self, row: int) -> List[str]:
+        """Raw field texts of a row (1-based); [] past the end of the file."""
+        with self._lock:
+            if self.index_rows(row) < row:
+                return []
+            line = self._map[self._starts[row - 1]:self._starts[row]].decode('utf-8').rstrip('\r\n')
+        return next(csv.reader([line], delimiter=';'), [])
+
+    def iter_cell_texts(self, row_lo: int, row_hi: int) -> Iterator[Tuple[str, int, str]]:
+        """(column, row, text) of the non-empty cells of rows row_lo..row_hi, like LoadFile.iter_cell_texts."""
+        for row in range(row_lo, self.index_rows(row_hi) + 1):
+            yield from row_cell_texts(row, self.row_values(row))
@@ -1,8 +1,11 @@
 import os
-import csv  
+import csv
+from typing import Any, Callable, Optional
 from spreadsheet.cell import Cell
 from spreadsheet.coordinate import Coordinate
 from spreadsheet.spreadsheet import Spreadsheet
+from fileio.compressed_file import COMPRESSED_EXTENSIONS, open_sheet_file, split_extension
+from fileio.snapshot_file import SnapshotFile
 from exceptions import (
     InvalidFileNameException,
     InvalidFilePathException,
@@ -23,10 +26,10 @@ class SaveFile:
         return directory_path
 
     def validate_file_name(self, file_name: str):
-        name, ext = os.path.splitext(file_name)
-        if not name or ext.lower() not in ['.s2v', '.txt']:
+        name, ext = split_extension(file_name)
+        if not name or ext.lower() not in ['.s2v', '.txt', '.s2b', *COMPRESSED_EXTENSIONS]:
             raise InvalidFileNameException(
-                "Invalid file name or extension. Must be .s2v or .txt"
+                "Invalid file name or extension. Must be .s2v, .s2v.gz, .s2v.xz, .s2b or .txt"
             )
 
     def validate_directory_path(self, directory_path: str):
@@ -44,9 +47,50 @@ class SaveFile:
         except Exception as e:
             raise Exception(f"Unexpected error while saving: {e}")
 
+    def write_rows(self, file_path: str, spreadsheet: Spreadsheet, cell_text: Callable[[Any], str],
+                   terminator: str = '', full_width: bool = False, newline: Optional[str] = None):
+        """
+        Stream a sheet to file_path, one ';'-separated line per row from row 1
+        to the last used one. The occupied cells come from the store already
+        sorted by (row, column), so no grid is built: gaps and empty rows are
+        written as bare separators. cell_text renders a raw number or text,
+        or a Cell. Lines end with terminator + newline; with full_width every
+        line is padded to the last used column of the sheet, otherwise to the
+        last one of its row. A .gz/.xz file_path is compressed as it is written.
+        """
+        cells = spreadsheet.cells
+        width = cells.last_column() if full_width else 0
+        empty_line = ';' * (width - 1) + terminator + '\n' if width else terminator + '\n'
+        with open_sheet_file(file_path, 'w', newline=newline, buffering=1 << 20) as file:
+            next_row = 1
+            for row, row_cells in cells.iter_rows():
+                if row > next_row:
+                    file.write(empty_line * (row - next_row))
+                texts = []
+                for col_num, value in row_cells:
+                    if col_num > len(texts) + 1:
+                        texts.extend([''] * (col_num - len(texts) - 1))
+                    texts.append(cell_text(value))
+                if len(texts) < width:
+                    texts.extend([''] * (width - len(texts)))
+                elif not width and not any(texts):
+                    # Row-width lines: a row of empty texts is an empty line
+                    texts = []
+                file.write(';'.join(texts) + terminator + '\n')
+                next_row = row + 1
+
     def display_save_confirmation(self):
         print("File saved successfully.")
 
+    @staticmethod
+    def _cell_text(value) -> str:
+        """Saved text of a raw number or text, or of a Cell (its textual representation)."""
+        if type(value) is str:
+            return value
+        if type(value) is int or type(value) is float:
+            return str(value)
+        return value.get_textual_representation()
+
     def _column_to_number(self, column: str) -> int:
         """Convert column letter(s) to number (A=1, B=2, ..., Z=26, AA=27, etc.)"""
         result = 0
@@ -63,8 +107,8 @@ class SaveFile:
             num //= 26
         return result
 
-    def run_saver(self, spreadsheet):
-        """Save the spreadsheet to a file."""
+    def run_saver(self, spreadsheet) -> str:
+        """Save the spreadsheet to a file; returns its path."""
         # Get file details from user
         file_name = input("Enter the file name: ")
         directory_path = input("Enter the directory path: ")
@@ -73,42 +117,22 @@ class SaveFile:
         self.validate_file_name(file_name)
         self.validate_directory_path(directory_path) 
         
-        if not file_name.endswith('.s2v'):
+        if file_name.endswith('.s2b'):
+            # Binary snapshot: restored without parsing, see SnapshotFile
+            full_path = os.path.join(directory_path, file_name)
+            SnapshotFile().save(spreadsheet, full_path)
+            print(f"Spreadsheet saved to: {full_path}")
+            return full_path
+
+        if not file_name.endswith(('.s2v', *COMPRESSED_EXTENSIONS)):
             full_path = os.path.join(directory_path, file_name + ".s2v")
         else:
             full_path = os.path.join(directory_path, file_name)
         
-        # Get bounds using the new List structure
-        if not spreadsheet.cells:
-            # Empty spreadsheet
-            max_row = 0
-            max_col_num = 0
-        else:
-            max_row = max((cell.coordinate.row for cell in spreadsheet.cells), default=0)
-            max_col_num = max((self._column_to_number(cell.coordinate.column) for cell in spreadsheet.cells), default=0)
-        
-        # Create the data grid
-        data = []
-        for row in range(1, max_row + 1):
-            row_data = []
-            for col_num in range(1, max_col_num + 1):
-                col_letter = self._number_to_column(col_num)
-                
-                # Find cell using the new List structure
-                cell = spreadsheet.get_cell(Coordinate(col_letter, row))
-                
-                if cell:
-                    # Get the cell's textual representation for saving
-                    cell_content = cell.get_textual_representation()
-                    row_data.append(cell_content)  
-                else:
-                    row_data.append("")  
-            data.append(row_data)
         try:
-            with open(full_path, 'w', newline='', encoding='utf-8') as file:
-                for row in data:
-                    line = ';'.join(row) + ';\n'  # Add semicolon after each value and at end
-                    file.write(line)
+            # Sparse: cells stream out in row order, every value followed by ';'
+            self.write_rows(full_path, spreadsheet, self._cell_text, terminator=';', full_width=True, newline='')
             print(f"Spreadsheet saved to: {full_path}")
         except Exception as e:
-            raise FileNotFoundException(f"Could not save file: {e}")
\ No newline at end of file
+            raise FileNotFoundException(f"Could not save file: {e}")
+        return full_path
\ No newline at end of file
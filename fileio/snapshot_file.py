@@ -0,0 +1,237 @@
+import gc
+import io
+import pickle
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import Any, Dict, List
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from content.text_content import TextContent
+from exceptions import FileNotFoundException
+from formula.formula_template import FormulaTemplate
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import column_to_number, number_to_column
+from spreadsheet.spreadsheet import Spreadsheet
+
+MAGIC = b"S2B\x03"
+_BYTE_ORDER = b"<" if sys.byteorder == "little" else b">"
+
+# Kinds of object cell
+_TEXT = 0
+_NUMBER = 1               # a number the tile buffers can't hold, kept as its text
+_FORMULA = 2              # not compiled (broken, or never evaluated)
+_FORMULA_COMPILED = 3     # compiled, edges not registered (on or behind a cycle)
+_FORMULA_REGISTERED = 4   # compiled and registered in the dependency graph
+
+# The only globals the pickled programs and dependency graph may refer to
+_SNAPSHOT_CLASSES = frozenset([
+    ("builtins", "set"), ("builtins", "frozenset"),
+    ("content.number", "Number"),
+    ("formula.formula_template", "FormulaAnchor"),
+    ("formula.function", "SUMA"), ("formula.function", "MAX"),
+    ("formula.function", "MIN"), ("formula.function", "PROMEDIO"),
+    ("formula.function", "CellArgument"), ("formula.function", "CellRangeArgument"),
+    ("formula.function", "RelativeCellArgument"), ("formula.function", "RelativeCellRangeArgument"),
+    ("formula.function", "NumericArgument"), ("formula.function", "FunctionArgumentWrapper"),
+    ("formula.operand", "NumericOperand"), ("formula.operand", "CellOperand"),
+    ("formula.operand", "RelativeCellOperand"), ("formula.operand", "FunctionOperand"),
+    ("formula.operator", "ArithmeticOperator"), ("formula.operator", "ParenthesisOperator"),
+    ("spreadsheet.cell_range", "CellRange"), ("spreadsheet.coordinate", "Coordinate"),
+    ("spreadsheet.dependency_manager", "DependencyManager"),
+    ("spreadsheet.range_index", "RangeIndex"),
+    ("spreadsheet.row_index", "RowIndex"),
+])
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickles formula programs, writing references to the sheet as a placeholder."""
+
+    def __init__(self, file, spreadsheet: Spreadsheet) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spreadsheet = spreadsheet
+
+    def persistent_id(self, obj: Any):
+        return "sheet" if obj is self._spreadsheet else None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Restores programs into the new sheet, refusing any global not in _SNAPSHOT_CLASSES."""
+
+    def __init__(self, file, spreadsheet: Spreadsheet) -> None:
+        super().__init__(file)
+        self._spreadsheet = spreadsheet
+
+    def persistent_load(self, pid: Any):
+        if pid != "sheet":
+            raise pickle.UnpicklingError(f"Unknown snapshot reference: {pid!r}")
+        return self._spreadsheet
+
+    def find_class(self, module: str, name: str):
+        # An exact pair only: a dotted name would walk attributes off the class
+        if "." not in name and (module, name) in _SNAPSHOT_CLASSES:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Class not allowed in a snapshot: {module}.{name}")
+
+
+class SnapshotFile:
+    """
+    Binary snapshot (.s2b) of a sheet, restored without parsing any text.
+
+    Layout: MAGIC, a byte-order mark, then length-prefixed blocks:
+      strings   interned table (lengths + one UTF-8 blob) for every text,
+                formula and boxed number
+      numbers   one packed column per used column: 64-bit rows, type tags
+                and the raw doubles, copied straight into the tile buffers
+      objects   parallel arrays (column, row, kind, string id, template id)
+                for the text and formula cells
+      programs  pickled compiled programs, one per distinct formula template,
+                plus the dependency graph with its topological order
+    Formulas come back compiled and registered but without values; they are
+    all dirty, as after a load. The programs are unpickled against an
+    explicit list of the formula, content and graph classes they are made
+    of; anything else in the pickle stream is refused.
+    """
+
+    def save(self, spreadsheet: Spreadsheet, file_path: str) -> None:
+        cells = spreadsheet.cells
+        strings: Dict[str, int] = {}
+        templates: Dict[int, int] = {}
+        template_states = []
+        columns, rows, kinds = array('I'), array('q'), bytearray()
+        string_ids, template_ids = array('I'), array('i')
+
+        for cell in cells.iter_all_objects():
+            content = cell.content
+            if isinstance(content, FormulaContent):
+                text = content.formula
+                template = content._template
+                if template is None:
+                    kind, template_id = _FORMULA, -1
+                else:
+                    template_id = templates.get(id(template))
+                    if template_id is None:
+                        template_id = templates[id(template)] = len(template_states)
+                        template_states.append(template.snapshot_state())
+                    kind = _FORMULA_REGISTERED if content._dependencies_registered else _FORMULA_COMPILED
+            elif isinstance(content, NumericContent):
+                kind, text, template_id = _NUMBER, repr(content.get_number()), -1
+            else:
+                kind, text, template_id = _TEXT, cell.get_textual_representation(), -1
+            columns.append(column_to_number(cell.coordinate.column))
+            rows.append(cell.coordinate.row)
+            kinds.append(kind)
+            string_ids.append(strings.setdefault(text, len(strings)))
+            template_ids.append(template_id)
+
+        programs = io.BytesIO()
+        _SnapshotPickler(programs, spreadsheet).dump((template_states, spreadsheet.dep_manager))
+
+        try:
+            with open(file_path, 'wb') as file:
+                file.write(MAGIC + _BYTE_ORDER)
+                encoded = [text.encode('utf-8') for text in strings]
+                self._write_block(file, array('I', map(len, encoded)).tobytes())
+                self._write_block(file, b"".join(encoded))
+                numeric = list(cells.numeric_columns())
+                self._write_block(file, array('I', [len(numeric)]).tobytes())
+                for col_num, col_rows, tags, values in numeric:
+                    self._write_block(file, array('I', [col_num]).tobytes())
+                    self._write_block(file, col_rows.tobytes())
+                    self._write_block(file, tags)
+                    self._write_block(file, values.tobytes())
+                for block in (columns.tobytes(), rows.tobytes(), bytes(kinds),
+                              string_ids.tobytes(), template_ids.tobytes(), programs.getvalue()):
+                    self._write_block(file, block)
+        except OSError as e:
+            raise FileNotFoundException(f"Could not save file: {e}")
+
+    def load(self, file_path: str) -> Spreadsheet:
+        try:
+            with open(file_path, 'rb') as file:
+                data = file.read()
+        except OSError as e:
+            raise FileNotFoundException(f"Failed to read file: {e}")
+        if data[:len(MAGIC)] != MAGIC:
+            raise FileNotFoundException(f"Not a spreadsheet snapshot: {file_path}")
+        # Restoring allocates hundreds of thousands of containers in one go:
+        # keep the cyclic collector from rescanning them all along the way
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            return self._restore(data)
+        except Exception as e:
+            raise FileNotFoundException(f"Corrupt snapshot {file_path}: {e}")
+        finally:
+            if collecting:
+                gc.enable()
+
+    def _restore(self, data: bytes) -> Spreadsheet:
+        swap = data[len(MAGIC):len(MAGIC) + 1] != _BYTE_ORDER
+        blocks = self._blocks(data, len(MAGIC) + 1)
+
+        def packed(typecode: str) -> array:
+            values = array(typecode)
+            values.frombytes(next(blocks))
+            if swap:
+                values.byteswap()
+            return values
+
+        sheet = Spreadsheet()
+        store = sheet.cells
+
+        lengths = packed('I')
+        raw = bytes(next(blocks))
+        offsets = list(accumulate(lengths, initial=0))
+        strings = [raw[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(lengths))]
+
+        for _ in range(packed('I')[0]):
+            col_num = packed('I')[0]
+            col_rows = packed('q')
+            tags = bytes(next(blocks))
+            values = packed('d')
+            store.put_numeric_column(col_num, col_rows, tags, values)
+
+        columns, rows, kinds = packed('I'), packed('q'), bytes(next(blocks))
+        string_ids, template_ids = packed('I'), packed('i')
+        template_states, dep_manager = _SnapshotUnpickler(io.BytesIO(next(blocks)), sheet).load()
+        templates = [FormulaTemplate.from_snapshot_state(state, sheet) for state in template_states]
+
+        formulas: List[str] = []
+        objects = []
+        for col_num, row, kind, string_id, template_id in zip(columns, rows, kinds, string_ids, template_ids):
+            column = number_to_column(col_num)
+            text = strings[string_id]
+            if kind == _TEXT:
+                content = TextContent(text)
+            elif kind == _NUMBER:
+                content = NumericContent(int(text) if text.lstrip('-').isdecimal() else float(text))
+            else:
+                content = FormulaContent(text)
+                if template_id >= 0:
+                    content._template = templates[template_id]
+                    content._anchor = (col_num, row)
+                    content._dependencies_registered = kind == _FORMULA_REGISTERED
+                formulas.append(f"{column}{row}")
+            objects.append((col_num, row, Cell((column, row), content)))
+        store.put_objects(objects)
+
+        sheet.dep_manager = dep_manager
+        sheet._dirty.update(formulas)
+        return sheet
+
+    @staticmethod
+    def _write_block(file, payload: bytes) -> None:
+        file.write(struct.pack('<Q', len(payload)))
+        file.write(payload)
+
+    @staticmethod
+    def _blocks(data: bytes, position: int):
+        view = memoryview(data)
+        while position < len(data):
+            (length,) = struct.unpack_from('<Q', data, position)
+            position += 8
+            yield view[position:position + length]
+            position += length
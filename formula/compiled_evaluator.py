@@ -0,0 +1,103 @@
+import math
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from exceptions import InvalidPostfixException, EvaluationErrorException
+from .formula_element import FormulaElement
+from .operand import Operand, NumericOperand
+from .operator import Operator
+from .postfix_evaluator import PostfixExpressionEvaluator
+
+
+def _divide(left: Union[int, float], right: Union[int, float]) -> Union[int, float]:
+    if right == 0:
+        raise EvaluationErrorException("Division by zero")
+    return left / right
+
+
+class PostfixCompiler:
+    """
+    Turns a postfix program into a single Python function. Finite literals
+    are inlined (inf and nan, which have no literal, are bound like operands),
+    every other operand becomes a call to its bound get_value, and operators
+    become native Python operators, so evaluation is one call with no visitor
+    dispatch, stack or symbol comparisons.
+    """
+
+    def compile(self, postfix_expression: List[FormulaElement]) -> Callable[[], Any]:
+        if not postfix_expression:
+            raise InvalidPostfixException("Empty postfix expression")
+
+        namespace: Dict[str, Any] = {"_div": _divide}
+        stack: List[str] = []
+        for index, element in enumerate(postfix_expression):
+            if isinstance(element, NumericOperand):
+                value = element.get_value()
+                if type(value) is float and not math.isfinite(value):
+                    # inf/nan have no literal: bind them like any other operand
+                    name = f"_c{index}"
+                    namespace[name] = value
+                    stack.append(name)
+                else:
+                    stack.append(repr(value))
+            elif isinstance(element, Operand):
+                name = f"_o{index}"
+                namespace[name] = element.get_value
+                stack.append(f"{name}()")
+            elif isinstance(element, Operator):
+                symbol = element.get_symbol()
+                if len(stack) < 2:
+                    raise InvalidPostfixException(f"Not enough operands for operator '{symbol}'")
+                right = stack.pop()
+                left = stack.pop()
+                if symbol in ('+', '-', '*'):
+                    stack.append(f"({left} {symbol} {right})")
+                elif symbol == '/':
+                    stack.append(f"_div({left}, {right})")
+                else:
+                    raise EvaluationErrorException(f"Unsupported operator: {symbol}")
+            else:
+                raise InvalidPostfixException(f"Invalid token type: {type(element)}")
+
+        if len(stack) != 1:
+            raise InvalidPostfixException(
+                f"Invalid postfix expression: expected 1 result, got {len(stack)}"
+            )
+        source = f"def _formula():\n    return {stack[0]}\n"
+        exec(compile(source, "<formula>", "exec"), namespace)
+        return namespace["_formula"]
+
+
+class CompiledExpressionEvaluator:
+    """
+    Drop-in alternative to PostfixExpressionEvaluator: the first evaluation of
+    a program compiles it, later evaluations of the same program just call the
+    compiled function. Programs too deep for the Python compiler fall back to
+    the visitor evaluator.
+    """
+
+    def __init__(self):
+        self._compiler = PostfixCompiler()
+        self._program: Optional[List[FormulaElement]] = None
+        self._function: Optional[Callable[[], Any]] = None
+        self._fallback: Optional[PostfixExpressionEvaluator] = None
+
+    def evaluate_postfix_expression(
+        self,
+        postfix_expression: List[FormulaElement],
+    ) -> Union[int, float]:
+        if postfix_expression is not self._program:
+            try:
+                function, fallback = self._compiler.compile(postfix_expression), None
+            except (RecursionError, MemoryError, SyntaxError):
+                function, fallback = None, PostfixExpressionEvaluator()
+            self._program, self._function, self._fallback = postfix_expression, function, fallback
+        if self._fallback is not None:
+            return self._fallback.evaluate_postfix_expression(postfix_expression)
+        return self._function()
+
+
+# Evaluation backends selectable by name
+EVALUATION_BACKENDS = {
+    "visitor": PostfixExpressionEvaluator,
+    "compiled": CompiledExpressionEvaluator,
+}
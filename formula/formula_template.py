@@ -0,0 +1,140 @@
+from typing import Any, List, Optional, Set, Tuple, TYPE_CHECKING
+from weakref import WeakValueDictionary
+
+from spreadsheet.coordinate import number_to_column, split_cell_name
+from .compiled_evaluator import EVALUATION_BACKENDS
+from .formula_element import FormulaElement
+from .function import (CellArgument, CellRangeArgument, FunctionArgumentWrapper,
+                       RelativeCellArgument, RelativeCellRangeArgument)
+from .operand import CellOperand, FunctionOperand, RelativeCellOperand
+from .parser import Parser
+from .postfix_converter import PostfixConverter
+from .tokenizer import CELL, RANGE, Token
+
+if TYPE_CHECKING:
+    from spreadsheet.spreadsheet import Spreadsheet
+
+# Hashable relative (R1C1-style) form of a token list
+TemplateKey = Tuple[Any, ...]
+
+
+def template_key(source: str, tokens: Tuple[Token, ...], column: int, row: int) -> TemplateKey:
+    """
+    Relative form of a formula written in cell (column, row), from its
+    scan() tokens: every reference becomes its offset from that cell, so
+    '=A1*2+B1' in C1 and '=A7*2+B7' in C7 give the same key.
+    """
+    key = []
+    for kind, start, end in tokens:
+        if kind == CELL:
+            ref_col, ref_row = split_cell_name(source[start:end])
+            key.append((kind, ref_col - column, ref_row - row))
+        elif kind == RANGE:
+            origin, destination = source[start:end].split(':')
+            origin_col, origin_row = split_cell_name(origin)
+            dest_col, dest_row = split_cell_name(destination)
+            key.append((kind, origin_col - column, origin_row - row, dest_col - column, dest_row - row))
+        else:
+            key.append((kind, source[start:end]))
+    return tuple(key)
+
+
+class FormulaAnchor:
+    """The cell a shared template program is currently evaluated for."""
+    __slots__ = ("column", "row")
+
+    def __init__(self, column: int, row: int) -> None:
+        self.column = column
+        self.row = row
+
+
+class FormulaTemplate:
+    """
+    Parsed and compiled program shared by every formula with the same
+    relative form. References in the program are offsets from the anchor,
+    which is pointed at a cell for the duration of each evaluation.
+    """
+    __slots__ = ("key", "anchor", "elements", "program", "evaluator", "_cell_offsets", "_range_offsets",
+                 "__weakref__")
+
+    def __init__(self, key: TemplateKey, source: str, tokens: Tuple[Token, ...], column: int, row: int,
+                 spreadsheet: "Spreadsheet", backend: str) -> None:
+        self.key = key
+        self.anchor = FormulaAnchor(column, row)
+        parsed = Parser(source, tokens).parse_tokens(spreadsheet)
+        self.elements: List[FormulaElement] = [self._relativize(element, spreadsheet) for element in parsed]
+        self.program: List[FormulaElement] = PostfixConverter().convert_to_postfix(self.elements)
+        self.evaluator = EVALUATION_BACKENDS[backend]()
+        # References as offsets, so each cell's absolute references are plain additions
+        cells, ranges = spreadsheet.dep_manager.get_references_from_tokens(self.elements)
+        self._cell_offsets = [self._offset(cell) for cell in cells]
+        self._range_offsets = [(col_lo - column, row_lo - row, col_hi - column, row_hi - row)
+                               for col_lo, row_lo, col_hi, row_hi in ranges]
+
+    @classmethod
+    def for_cell(cls, source: str, tokens: Tuple[Token, ...], column: int, row: int,
+                 spreadsheet: "Spreadsheet", backend: str) -> "FormulaTemplate":
+        """Template for a formula at (column, row), shared with equal relative formulas of the sheet."""
+        registry: "WeakValueDictionary[TemplateKey, FormulaTemplate]" = spreadsheet.formula_templates
+        key = (backend, template_key(source, tokens, column, row))
+        template = registry.get(key)
+        if template is None:
+            template = cls(key, source, tokens, column, row, spreadsheet, backend)
+            registry[key] = template
+        return template
+
+    def snapshot_state(self) -> Tuple[Any, ...]:
+        """Everything but the evaluator, for a binary snapshot (see fileio.snapshot_file)."""
+        return (self.key, self.anchor, self.elements, self.program, self._cell_offsets, self._range_offsets)
+
+    @classmethod
+    def from_snapshot_state(cls, state: Tuple[Any, ...], spreadsheet: "Spreadsheet") -> "FormulaTemplate":
+        """Rebuild a template from snapshot_state() without parsing, and register it in the sheet."""
+        template = cls.__new__(cls)
+        (template.key, template.anchor, template.elements, template.program, template._cell_offsets,
+         template._range_offsets) = state
+        template.evaluator = EVALUATION_BACKENDS[template.key[0]]()
+        spreadsheet.formula_templates[template.key] = template
+        return template
+
+    def evaluate(self, column: int, row: int) -> Any:
+        anchor = self.anchor
+        previous = anchor.column, anchor.row
+        anchor.column, anchor.row = column, row
+        try:
+            return self.evaluator.evaluate_postfix_expression(self.program)
+        finally:
+            # Evaluations nest when a precedent is pulled mid-formula
+            anchor.column, anchor.row = previous
+
+    def references(self, column: int, row: int) -> Tuple[Set[str], List[Tuple[int, int, int, int]]]:
+        """Absolute single-cell references and range rectangles of the formula at (column, row)."""
+        cells = {f"{number_to_column(column + col_offset)}{row + row_offset}"
+                 for col_offset, row_offset in self._cell_offsets}
+        ranges = [(column + col_lo, row + row_lo, column + col_hi, row + row_hi)
+                  for col_lo, row_lo, col_hi, row_hi in self._range_offsets]
+        return cells, ranges
+
+    def _offset(self, cell_name: str) -> Tuple[int, int]:
+        column, row = split_cell_name(cell_name)
+        return column - self.anchor.column, row - self.anchor.row
+
+    def _relativize(self, element: Optional[FormulaElement], spreadsheet: "Spreadsheet") -> Any:
+        if isinstance(element, CellOperand):
+            offset = self._offset(f"{element.coordinate.column}{element.coordinate.row}")
+            return RelativeCellOperand(offset, self.anchor, spreadsheet)
+        if isinstance(element, FunctionOperand):
+            element.arguments = [self._relativize_argument(arg, spreadsheet) for arg in element.arguments]
+        return element
+
+    def _relativize_argument(self, argument: Any, spreadsheet: "Spreadsheet") -> Any:
+        if isinstance(argument, CellArgument):
+            offset = self._offset(f"{argument.coordinate.column}{argument.coordinate.row}")
+            return RelativeCellArgument(offset, self.anchor, spreadsheet)
+        if isinstance(argument, CellRangeArgument):
+            cell_range = argument.cell_range
+            return RelativeCellRangeArgument(self._offset(cell_range.origin_cell), self._offset(cell_range.dest_cell),
+                                             self.anchor, spreadsheet)
+        if isinstance(argument, FunctionArgumentWrapper):
+            self._relativize(argument.function_operand, spreadsheet)
+        return argument
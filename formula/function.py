@@ -1,14 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Union, Optional
+import re
+from typing import Any, List, Union, Optional, Tuple
 from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate, number_to_column
 from content.number import Number
 from spreadsheet.cell_range import CellRange
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from spreadsheet.spreadsheet import Spreadsheet
-    import re
-from formula.operand import FunctionOperand
+    from formula.formula_template import FormulaAnchor
+from formula.operand import BLANK_VALUE, FunctionOperand
+from formula.range_aggregates import NumericBlock, RangeSummary, block_count, block_max, block_min, block_sum
+from spreadsheet.aggregate_index import summary_integer_total, summary_total
 
 
 class Function(ABC):
@@ -16,6 +20,15 @@ class Function(ABC):
     def evaluate(self, arguments: List[Any]) -> Any:
         pass
 
+    def evaluate_blocks(self, arguments: List[Any], blocks: List[NumericBlock]) -> Any:
+        """
+        Evaluate with the numbers of range arguments still packed in blocks.
+        Functions without a vectorized version unpack them and call evaluate.
+        """
+        for block in blocks:
+            arguments.extend(block.to_list())
+        return self.evaluate(arguments)
+
 class SUMA(Function):
     """
     Computes the sum of all arguments.
@@ -26,6 +39,10 @@ class SUMA(Function):
             total += value
         return total
 
+    def evaluate_blocks(self, arguments: List[Any], blocks: List[NumericBlock]) -> Any:
+        total = self.evaluate(arguments)
+        return total + block_sum(blocks) if blocks else total
+
 class MAX(Function):
     """
     Returns the maximum value among arguments, or 0 if no arguments.
@@ -39,6 +56,9 @@ class MAX(Function):
                 max_val = value
         return max_val
 
+    def evaluate_blocks(self, arguments: List[Any], blocks: List[NumericBlock]) -> Any:
+        return self.evaluate(arguments + block_max(blocks))
+
 class MIN(Function):
     """
     Returns the minimum value among arguments, or 0 if no arguments.
@@ -52,6 +72,9 @@ class MIN(Function):
                 min_val = value
         return min_val
 
+    def evaluate_blocks(self, arguments: List[Any], blocks: List[NumericBlock]) -> Any:
+        return self.evaluate(arguments + block_min(blocks))
+
 class PROMEDIO(Function):
     """
     Returns the arithmetic mean of arguments, or 0 if no arguments.
@@ -64,6 +87,15 @@ class PROMEDIO(Function):
             count += 1
         return total / count if count > 0 else 0
 
+    def evaluate_blocks(self, arguments: List[Any], blocks: List[NumericBlock]) -> Any:
+        total = 0
+        for value in arguments:
+            total += value
+        count = len(arguments) + block_count(blocks)
+        if blocks:
+            total += block_sum(blocks)
+        return total / count if count > 0 else 0
+
 
 
 # Function argument types
@@ -72,32 +104,105 @@ class FunctionArgument(ABC):
     @abstractmethod
     def get_value():
         pass
+
+    def collect_values(self, values: List[Any], blocks: List[NumericBlock]) -> None:
+        """Add this argument's values to a function call: lists are flattened into values."""
+        v = self.get_value()
+        if isinstance(v, list):
+            values.extend(v)
+        else:
+            values.append(v)
     
 class CellArgument(FunctionArgument):
-    def __init__(self, cell: Cell) -> None:
-        self.cell = cell
+    """Single cell argument, resolved by coordinate on every evaluation.
+    An empty cell reads as BLANK_VALUE, as in an operand (MIN(A1;3) is 0
+    with A1 empty); only empty cells inside a range are skipped."""
+
+    def __init__(self, coordinate: Coordinate, spreadsheet: 'Spreadsheet') -> None:
+        self.coordinate = coordinate
+        self.spreadsheet = spreadsheet
+
+    @property
+    def cell(self) -> Optional[Cell]:
+        return self.spreadsheet.get_cell(self.coordinate)
 
     def get_value(self): 
-        return self.cell.get_value()
+        return self.spreadsheet.get_cell_value(self.coordinate, BLANK_VALUE)
     
     @classmethod
     def create_from_token(cls, token_value, spreadsheet: 'Spreadsheet' = None) -> 'CellArgument':
-        """Create CellOperand from cell reference token"""
-        cell = Cell.from_token(token_value, spreadsheet)
-        return cls(cell)
+        """Create CellArgument from cell reference token"""
+        if spreadsheet is None:
+            raise ValueError("Spreadsheet is required to create CellArgument")
+        match = re.fullmatch(r'([A-Z]+)(\d+)', str(token_value).upper())
+        if not match:
+            raise ValueError(f"Invalid cell reference: {token_value}")
+        return cls(Coordinate(match.group(1), int(match.group(2))), spreadsheet)
 
 class CellRangeArgument(FunctionArgument):
     """
-    Returns the values of all the cells inside the range
+    Returns the values of all the cells inside the range.
+    The cells are looked up on every evaluation, so cells added to the range
+    after the formula was compiled are seen.
     """
     def __init__(self, origin: str, destination: str, spreadsheet: 'Spreadsheet') -> None:
         self.cell_range: CellRange = CellRange(origin, destination)
-        self.cells: List[Cell] = self.cell_range.get_values(spreadsheet)
+        self.spreadsheet = spreadsheet
+
+    @property
+    def cells(self) -> List[Cell]:
+        return self.cell_range.get_values(self.spreadsheet)
     
     def get_value(self) -> List:
         """
         Returns a list of values for all cells in the range."""
-        return [cell.get_value() for cell in self.cells]
+        return [cell.get_value(self.spreadsheet) for cell in self.cells]
+
+    def collect_values(self, values: List[Any], blocks: List[NumericBlock]) -> None:
+        """
+        Numeric cells go in one block read straight from the tile buffers (or a
+        summary from the aggregate index); other cells are evaluated one by one.
+        """
+        cell_range = self.cell_range
+        summary = cell_range.get_summary(self.spreadsheet)
+        if summary is not None:
+            # Tall all-numeric range: O(log n) answer from the column aggregate trees
+            _, count, floats, _, smallest, largest = summary
+            total = summary_integer_total(summary) if floats == 0 else summary_total(summary)
+            blocks.append(RangeSummary(total, count, floats == 0, smallest, largest,
+                                       lambda: NumericBlock(*cell_range.get_numbers(self.spreadsheet)[:2])))
+            return
+        numbers, integral, objects = cell_range.get_numbers(self.spreadsheet)
+        blocks.append(NumericBlock(numbers, integral))
+        values.extend(cell.get_value(self.spreadsheet) for cell in objects)
+
+class RelativeCellArgument(CellArgument):
+    """Single cell argument of a shared formula template, as an offset from the anchor cell."""
+
+    def __init__(self, offset: Tuple[int, int], anchor: 'FormulaAnchor', spreadsheet: 'Spreadsheet') -> None:
+        self.offset = offset
+        self.anchor = anchor
+        self.spreadsheet = spreadsheet
+
+    @property
+    def coordinate(self) -> Coordinate:
+        return Coordinate(number_to_column(self.anchor.column + self.offset[0]), self.anchor.row + self.offset[1])
+
+class RelativeCellRangeArgument(CellRangeArgument):
+    """Range argument of a shared formula template: both corners are offsets from the anchor cell."""
+
+    def __init__(self, origin: Tuple[int, int], destination: Tuple[int, int],
+                 anchor: 'FormulaAnchor', spreadsheet: 'Spreadsheet') -> None:
+        self.origin = origin
+        self.destination = destination
+        self.anchor = anchor
+        self.spreadsheet = spreadsheet
+
+    @property
+    def cell_range(self) -> CellRange:
+        column, row = self.anchor.column, self.anchor.row
+        return CellRange(f"{number_to_column(column + self.origin[0])}{row + self.origin[1]}",
+                         f"{number_to_column(column + self.destination[0])}{row + self.destination[1]}")
 
 class NumericArgument(FunctionArgument):
     def __init__(self, value: Union[int, float]) -> None:
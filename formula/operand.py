@@ -1,17 +1,21 @@
 from abc import ABC, abstractmethod
 import re
-from typing import Union, Any, List, Dict, Type, TYPE_CHECKING
+from typing import Union, Any, List, Dict, Optional, Tuple, Type, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .formula_element import FormulaElementVisitor
     from .function import Function, FunctionArgument
+    from .formula_template import FormulaAnchor
+    from .range_aggregates import NumericBlock
     from spreadsheet.spreadsheet import Spreadsheet
 
-from content.numerical_content import NumericContent
 from spreadsheet.cell import Cell
-from spreadsheet.coordinate import Coordinate
+from spreadsheet.coordinate import Coordinate, number_to_column
 from content.number import Number
 
+# Value of a reference to an empty cell, shared by every such reference
+BLANK_VALUE = 0.0
+
 class Operand(ABC):
     """Clase base para operandos (números, referencias a celdas, funciones)."""
 
@@ -46,13 +50,21 @@ class NumericOperand(Operand):
 
 class CellOperand(Operand):
     """Represents a reference to a cell in the spreadsheet.
-    Missing cells are treated as zero, and never embed errors in the sheet."""
+    The reference is kept by coordinate and resolved on every evaluation, so a
+    compiled formula stays valid when the referenced cell is replaced.
+    A missing cell reads as BLANK_VALUE: it is never materialized in the sheet,
+    only tracked as a dependency edge, so writing it later invalidates the formula."""
+
+    def __init__(self, coordinate: Coordinate, spreadsheet: "Spreadsheet") -> None:
+        self.coordinate = coordinate
+        self.spreadsheet = spreadsheet
 
-    def __init__(self, cell: 'Cell') -> None:
-        self.cell = cell
+    @property
+    def cell(self) -> Optional[Cell]:
+        return self.spreadsheet.get_cell(self.coordinate)
 
     def get_value(self) -> Union[int, float]:
-        return self.cell.content.get_value()
+        return self.spreadsheet.get_cell_value(self.coordinate, BLANK_VALUE)
 
     @classmethod
     def create_from_token(cls, token_value, spreadsheet: "Spreadsheet" = None) -> "CellOperand":
@@ -64,17 +76,23 @@ class CellOperand(Operand):
         if not m:
             raise ValueError(f"Invalid cell reference: {token_value}")
         col, row = m.groups()
+        return cls(Coordinate(col, int(row)), spreadsheet)
+
+
+class RelativeCellOperand(CellOperand):
+    """Cell reference of a shared formula template: an offset from the anchor
+    cell the template is being evaluated for."""
+
+    def __init__(self, offset: Tuple[int, int], anchor: "FormulaAnchor", spreadsheet: "Spreadsheet") -> None:
+        self.offset = offset
+        self.anchor = anchor
+        self.spreadsheet = spreadsheet
+
+    @property
+    def coordinate(self) -> Coordinate:
+        return Coordinate(number_to_column(self.anchor.column + self.offset[0]), self.anchor.row + self.offset[1])
 
-        cell = spreadsheet.get_cell(Coordinate(col, int(row)))
-        if cell is None:
-            coord_tuple = (col, row)
-            placeholder = Cell(coord_tuple, NumericContent(0.0))
-            spreadsheet.add_cell(Coordinate(col, int(row)), placeholder)
-            cell = placeholder
-        else:
-            setattr(cell, "_sheet", spreadsheet)
 
-        return cls(cell)
 class FunctionOperand(Operand):
     """Representa una función (SUMA, PROMEDIO, MAX, MIN, etc.) sin argumentos inicializados."""
 
@@ -84,13 +102,10 @@ class FunctionOperand(Operand):
 
     def get_value(self) -> Union[int, float]:
         values: List[Union[int, float]] = []
+        blocks: List["NumericBlock"] = []
         for arg in self.arguments:
-            v = arg.get_value()
-            if isinstance(v, list):
-                values.extend(v)
-            else:
-                values.append(v)
-        return self.function.evaluate(values)
+            arg.collect_values(values, blocks)
+        return self.function.evaluate_blocks(values, blocks)
 
     @classmethod
     def create_from_token(cls, token_value, spreadsheet: 'Spreadsheet' = None) -> "FunctionOperand":
@@ -7,22 +7,30 @@ from formula.operand import Operand, NumericOperand, CellOperand, FunctionOperan
 from formula.operator import Operator, ArithmeticOperator, ParenthesisOperator
 from formula.function import FunctionArgument, CellArgument, CellRangeArgument, NumericArgument, FunctionArgumentWrapper
 from formula.formula_element import FormulaElement
+from formula.tokenizer import (Token, RANGE, FUNC, CELL, NUMBER, PLUS, MINUS, TIMES, DIVIDE,
+                               LPAREN, RPAREN, SEMI, KIND_NAMES)
 
 class Parser:
     """
     Simplified parser that converts tokens into operands and operators.
     Function arguments are handled as FunctionArgument objects, not operands.
+    Tokens are scan() offsets into source.
     """
     
-    def __init__(self, tokens: List[Tuple[str, str]]):
+    def __init__(self, source: str, tokens: Tuple[Token, ...]):
+        self.source = source
         self.tokens = tokens
         self.pos = 0
 
-    def current_token(self) -> Union[Tuple[str, str], None]:
+    def text(self, token: Token) -> str:
+        """Source text of a token"""
+        return self.source[token[1]:token[2]]
+
+    def current_token(self) -> Union[Token, None]:
         """Get current token without advancing"""
         return self.tokens[self.pos] if self.pos < len(self.tokens) else None
 
-    def advance(self) -> Union[Tuple[str, str], None]:
+    def advance(self) -> Union[Token, None]:
         """Get current token and advance position"""
         token = self.current_token()
         if token:
@@ -53,31 +61,32 @@ class Parser:
         if not token:
             return None
             
-        token_type, token_value = token
+        token_type = token[0]
+        token_value = self.text(token)
         
         # Try to create operand first
-        if token_type == 'NUMBER':
+        if token_type == NUMBER:
             self.advance()
             return NumericOperand.create_from_token(token_value)
             
-        elif token_type == 'CELL':
+        elif token_type == CELL:
             self.advance()
             return CellOperand.create_from_token(token_value, spreadsheet)
             
-        elif token_type == 'FUNC':
+        elif token_type == FUNC:
             return self._parse_function(token_value, spreadsheet)
             
         # Try to create operator
-        elif token_type in ['PLUS', 'MINUS', 'TIMES', 'DIVIDE'] or token_value in ['+', '-', '*', '/']:
+        elif token_type in (PLUS, MINUS, TIMES, DIVIDE):
             self.advance()
             return ArithmeticOperator.create_from_token(token_value)
             
-        elif token_type in ['LPAREN', 'RPAREN'] or token_value in ['(', ')']:
+        elif token_type in (LPAREN, RPAREN):
             self.advance()
             return ParenthesisOperator.create_from_token(token_value)
             
         else:
-            raise SyntaxErrorException(f"Unknown token: {token_type} '{token_value}'")
+            raise SyntaxErrorException(f"Unknown token: {KIND_NAMES[token_type]} '{token_value}'")
 
     def _parse_function(self, func_name: str, spreadsheet: Spreadsheet) -> FunctionOperand:
         """Parse a function with its arguments"""
@@ -88,18 +97,18 @@ class Parser:
         
         # Expect opening parenthesis
         token = self.current_token()
-        if not token or token[0] != 'LPAREN':
+        if not token or token[0] != LPAREN:
             raise SyntaxErrorException(f"Expected '(' after function {func_name}")
         self.advance()  # consume '('
         
         # Parse arguments
         arguments = []
-        if self.current_token() and self.current_token()[0] != 'RPAREN':
+        if self.current_token() and self.current_token()[0] != RPAREN:
             arguments = self._parse_function_arguments(spreadsheet)
         
         # Expect closing parenthesis
         token = self.current_token()
-        if not token or token[0] != 'RPAREN':
+        if not token or token[0] != RPAREN:
             raise SyntaxErrorException(f"Expected ')' to close function {func_name}")
         self.advance()  # consume ')'
         
@@ -120,13 +129,13 @@ class Parser:
             token = self.current_token()
             if not token:
                 break
-            elif token[0] == 'SEMI':
+            elif token[0] == SEMI:
                 self.advance()  # consume ';'
                 continue
-            elif token[0] == 'RPAREN':
+            elif token[0] == RPAREN:
                 break
             else:
-                raise SyntaxErrorException(f"Expected ';' or ')' in function arguments, got {token[1]}")
+                raise SyntaxErrorException(f"Expected ';' or ')' in function arguments, got {self.text(token)}")
         
         return arguments
 
@@ -136,29 +145,30 @@ class Parser:
         if not token:
             return None
             
-        token_type, token_value = token
+        token_type = token[0]
+        token_value = self.text(token)
         
-        if token_type == 'NUMBER':
+        if token_type == NUMBER:
             self.advance()
             # Convert to numeric value
             value = float(token_value) if '.' in token_value else int(token_value)
             return NumericArgument(value)
             
-        elif token_type == 'CELL':
+        elif token_type == CELL:
             self.advance()
             # Create cell and wrap in CellArgument
             return CellArgument.create_from_token(token_value, spreadsheet)
             
-        elif token_type == 'RANGE':
+        elif token_type == RANGE:
             self.advance()
             # Parse range like "A1:B3"
             start_ref, end_ref = token_value.split(':')
             return CellRangeArgument(start_ref, end_ref, spreadsheet)
             
-        elif token_type == 'FUNC':
+        elif token_type == FUNC:
             # Handle nested function - parse it as a FunctionOperand and wrap it
             nested_function = self._parse_function(token_value, spreadsheet)
             return FunctionArgumentWrapper(nested_function)
             
         else:
-            raise SyntaxErrorException(f"Invalid function argument: {token_type} '{token_value}'")
\ No newline at end of file
+            raise SyntaxErrorException(f"Invalid function argument: {KIND_NAMES[token_type]} '{token_value}'")
\ No newline at end of file
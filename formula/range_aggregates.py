@@ -0,0 +1,117 @@
+"""
+Aggregates over numeric blocks of a range (the unboxed numbers of the tile
+store). Sums of integers are exact; other sums use math.fsum (correctly
+rounded, so a result never depends on whether NumPy is installed or on the
+order of the cells), falling back to the plain float sum (+-inf, as + gives)
+when the total overflows. NumPy, when installed, only speeds up min/max,
+which are exact either way.
+Tall ranges arrive pre-reduced as RangeSummary from the aggregate index.
+"""
+from array import array
+from typing import Callable, List, Union
+
+from spreadsheet.aggregate_index import safe_fsum
+
+try:
+    import numpy
+except ImportError:  # optional dependency
+    numpy = None
+
+# Below this every integer is a double: an fsum of integers under it is exact
+_EXACT_INT_LIMIT = 2 ** 53
+
+
+class NumericBlock:
+    """Numbers of one range argument; integral when every cell held an int."""
+    __slots__ = ("values", "integral")
+
+    def __init__(self, values: array, integral: bool) -> None:
+        self.values = values
+        self.integral = integral
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_list(self) -> List[Union[int, float]]:
+        return [int(value) for value in self.values] if self.integral else self.values.tolist()
+
+    def total(self) -> float:
+        return safe_fsum(self.values)
+
+    def integer_total(self) -> int:
+        """Exact sum of an integral block."""
+        total = safe_fsum(self.values)
+        if -_EXACT_INT_LIMIT < total < _EXACT_INT_LIMIT:
+            return int(total)
+        return sum(map(int, self.values))
+
+    def largest(self) -> float:
+        if numpy is not None:
+            return float(numpy.frombuffer(self.values, dtype=numpy.float64).max())
+        return max(self.values)
+
+    def smallest(self) -> float:
+        if numpy is not None:
+            return float(numpy.frombuffer(self.values, dtype=numpy.float64).min())
+        return min(self.values)
+
+
+class RangeSummary:
+    """
+    Numbers of a range argument already reduced by the aggregate index: the
+    same interface as NumericBlock without the values, which are only fetched
+    if a function needs them one by one.
+    """
+    __slots__ = ("integral", "_total", "_count", "_min", "_max", "_fetch")
+
+    def __init__(self, total: Union[int, float], count: int, integral: bool, smallest: float, largest: float,
+                 fetch: Callable[[], NumericBlock]) -> None:
+        self.integral = integral
+        self._total = total
+        self._count = count
+        self._min = smallest
+        self._max = largest
+        self._fetch = fetch
+
+    def __len__(self) -> int:
+        return self._count
+
+    def to_list(self) -> List[Union[int, float]]:
+        return self._fetch().to_list()
+
+    def total(self) -> float:
+        return float(self._total)
+
+    def integer_total(self) -> int:
+        """Exact sum of an integral summary (given as an int)."""
+        return self._total
+
+    def largest(self) -> float:
+        return self._max
+
+    def smallest(self) -> float:
+        return self._min
+
+
+def _as_number(value: float, integral: bool) -> Union[int, float]:
+    return int(value) if integral else float(value)
+
+
+def block_count(blocks: List[NumericBlock]) -> int:
+    return sum(len(block) for block in blocks)
+
+
+def block_sum(blocks: List[NumericBlock]) -> Union[int, float]:
+    if all(block.integral for block in blocks):
+        return sum(block.integer_total() for block in blocks)
+    return safe_fsum(block.total() for block in blocks)
+
+
+def block_max(blocks: List[NumericBlock]) -> List[Union[int, float]]:
+    """Largest number of each non-empty block."""
+    return [_as_number(block.largest(), block.integral) for block in blocks if len(block)]
+
+
+def block_min(blocks: List[NumericBlock]) -> List[Union[int, float]]:
+    """Smallest number of each non-empty block."""
+    return [_as_number(block.smallest(), block.integral) for block in blocks if len(block)]
@@ -1,51 +1,81 @@
 import re
-from exceptions import TokenizingErrorException 
+from functools import lru_cache
+from typing import List, Tuple
+
+from exceptions import TokenizingErrorException
+
+# Token kinds
+RANGE = 0       # Cell ranges like A1:B3
+FUNC = 1        # Functions
+CELL = 2        # Single cell references
+NUMBER = 3      # Numbers (integer or decimal)
+PLUS = 4
+MINUS = 5
+TIMES = 6
+DIVIDE = 7
+LPAREN = 8
+RPAREN = 9
+SEMI = 10
+COLON = 11
+SKIP = 12       # Whitespace, dropped
+MISMATCH = 13   # Catch-all for unexpected characters
+
+KIND_NAMES = ('RANGE', 'FUNC', 'CELL', 'NUMBER', 'PLUS', 'MINUS', 'TIMES', 'DIVIDE',
+              'LPAREN', 'RPAREN', 'SEMI', 'COLON', 'SKIP', 'MISMATCH')
+
+# A token: (kind, start, end), the text being source[start:end]
+Token = Tuple[int, int, int]
+
+# Formula texts whose tokens are kept for reuse
+SCAN_CACHE_SIZE = 4096
+
+# One alternation compiled once for every formula; the kind of a match is
+# the index of its group (the patterns themselves capture nothing)
+_SCANNER = re.compile('|'.join(f'({pattern})' for pattern in (
+    r'[A-Z]+\d+:[A-Z]+\d+',
+    r'SUMA|PROMEDIO|MAX|MIN',
+    r'[A-Z]+\d+',
+    r'\d+(?:\.\d+)?',
+    r'\+',
+    r'-',
+    r'\*',
+    r'/',
+    r'\(',
+    r'\)',
+    r';',
+    r':',
+    r'[ \t]+',
+    r'.',
+)))
+
+
+@lru_cache(maxsize=SCAN_CACHE_SIZE)
+def scan(source: str) -> Tuple[Token, ...]:
+    """
+    Tokens of a formula expression as (kind, start, end) offsets into it,
+    whitespace dropped. Results are cached by text (and shared: a tuple of
+    tuples), so the many cells holding the same formula scan it once.
+    """
+    tokens: List[Token] = []
+    pos = 0
+    for match in _SCANNER.finditer(source):
+        start, end = match.span()
+        if start != pos:
+            # Only a line break escapes the catch-all
+            raise TokenizingErrorException(f"Unexpected character at position {pos}: '{source[pos]}'")
+        kind = match.lastindex - 1
+        if kind == MISMATCH:
+            raise TokenizingErrorException(f"Incorrect formula: '{source[start:end]}' in '{source}'")
+        if kind != SKIP:
+            tokens.append((kind, start, end))
+        pos = end
+    if pos != len(source):
+        raise TokenizingErrorException(f"Unexpected character at position {pos}: '{source[pos]}'")
+    return tuple(tokens)
+
 
 class Tokenizer:
-    def __init__(self):
-        # Define all token patterns with clear naming
-        self.token_specification = [
-            ('RANGE', r'[A-Z]+\d+:[A-Z]+\d+'),             # Cell ranges like A1:B3
-            ('FUNC', r'SUMA|PROMEDIO|MAX|MIN'),            # Functions
-            ('CELL', r'[A-Z]+\d+'),                        # Single cell references
-            ('NUMBER', r'\d+(\.\d+)?'),                    # Numbers (integer or decimal)
-            ('PLUS', r'\+'),
-            ('MINUS', r'-'),
-            ('TIMES', r'\*'),
-            ('DIVIDE', r'/'),
-            ('LPAREN', r'\('),
-            ('RPAREN', r'\)'),
-            ('SEMI', r';'),
-            ('COLON', r':'),
-            ('SKIP', r'[ \t]+'),                           # Skip whitespace
-            ('MISMATCH', r'.'),                            # Catch-all for unexpected characters
-        ]
-        self.token_regex = re.compile('|'.join(
-            f'(?P<{name}>{pattern})' for name, pattern in self.token_specification
-        ))
-
-    def tokenize(self, formula):
-        tokens = []
-        pos = 0
-
-        while pos < len(formula):
-            match = self.token_regex.match(formula, pos)
-            if not match:
-                raise TokenizingErrorException(f"Unexpected character at position {pos}: '{formula[pos]}'")
-
-            kind = match.lastgroup
-            value = match.group(kind)
-
-            if kind == 'SKIP':
-                pass  # Ignore whitespace
-            elif kind == 'NUMBER':
-                # value = float(value) if '.' in value else int(value)
-                tokens.append((kind, value))
-            elif kind == 'MISMATCH':
-                raise TokenizingErrorException(f"Incorrect formula: '{value}' in '{formula}'")
-            else:
-                tokens.append((kind, value))
-
-            pos = match.end()
-
-        return tokens
+    """(name, text) view of scan, for callers that want the tokens spelled out."""
+
+    def tokenize(self, formula: str) -> List[Tuple[str, str]]:
+        return [(KIND_NAMES[kind], formula[start:end]) for kind, start, end in scan(formula)]
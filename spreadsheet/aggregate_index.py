@@ -0,0 +1,113 @@
+import math
+from itertools import chain
+from typing import Iterable, List, Tuple
+
+# Exact sum of a run of doubles, as non-overlapping partials (largest first)
+Partials = Tuple[float, ...]
+
+# Aggregate of a run of slots: (sum partials, numeric count, float count, object count, min, max)
+Summary = Tuple[Partials, int, int, int, float, float]
+
+EMPTY_SUMMARY: Summary = ((), 0, 0, 0, math.inf, -math.inf)
+
+
+def safe_fsum(values: Iterable[float]) -> float:
+    """
+    math.fsum, or the plain float sum when the exact total doesn't fit a
+    double (fsum raises): ±inf on overflow, nan for inf - inf, as + gives.
+    """
+    values = list(values)
+    try:
+        return math.fsum(values)
+    except (OverflowError, ValueError):
+        return sum(values, 0.0)
+
+
+def exact_partials(values: Iterable[float]) -> Partials:
+    """
+    The exact sum of values as a few doubles whose fsum is fsum(values): the
+    correctly rounded total, then the rounded remainder, until nothing is
+    left. Merging partials instead of rounded sums keeps every combination
+    of segments equal, bit for bit, to one fsum over all their cells.
+    """
+    values = list(values)
+    total = safe_fsum(values)
+    if not math.isfinite(total):
+        return (total,)
+    partials = [total]
+    while True:
+        rest = safe_fsum(chain(values, (-partial for partial in partials)))
+        if not rest or not math.isfinite(rest):
+            break
+        partials.append(rest)
+    return tuple(partials)
+
+
+def summary_total(summary: Summary) -> float:
+    """Correctly rounded sum of a summary's numbers."""
+    return safe_fsum(summary[0])
+
+
+def summary_integer_total(summary: Summary) -> int:
+    """Exact sum of a summary of integers: their partials are integers too."""
+    return sum(int(partial) for partial in summary[0])
+
+
+def combine(left: Summary, right: Summary) -> Summary:
+    if not left[0]:
+        partials = right[0]
+    elif not right[0]:
+        partials = left[0]
+    else:
+        partials = exact_partials(left[0] + right[0])
+    return (partials, left[1] + right[1], left[2] + right[2], left[3] + right[3],
+            min(left[4], right[4]), max(left[5], right[5]))
+
+
+class ColumnAggregateTree:
+    """
+    Segment tree over the tile segments of one column. Each leaf is the
+    summary of one TILE_ROWS-row segment, recomputed from the tile buffers
+    when a cell of that segment changes, and the internal nodes are rebuilt
+    along the path to the root. Point updates and range queries both touch
+    O(log n) nodes.
+    """
+
+    def __init__(self, leaves: List[Summary]) -> None:
+        capacity = 1
+        while capacity < len(leaves):
+            capacity *= 2
+        self._capacity = capacity
+        self._nodes: List[Summary] = [EMPTY_SUMMARY] * (2 * capacity)
+        self._nodes[capacity:capacity + len(leaves)] = leaves
+        for node in range(capacity - 1, 0, -1):
+            self._nodes[node] = combine(self._nodes[2 * node], self._nodes[2 * node + 1])
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def update(self, leaf: int, summary: Summary) -> None:
+        nodes = self._nodes
+        node = self._capacity + leaf
+        nodes[node] = summary
+        node //= 2
+        while node:
+            nodes[node] = combine(nodes[2 * node], nodes[2 * node + 1])
+            node //= 2
+
+    def query(self, first: int, last: int) -> Summary:
+        """Summary of leaves first..last (inclusive)."""
+        nodes = self._nodes
+        result = EMPTY_SUMMARY
+        lo, hi = first + self._capacity, last + self._capacity + 1
+        while lo < hi:
+            if lo & 1:
+                result = combine(result, nodes[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                result = combine(result, nodes[hi])
+            lo //= 2
+            hi //= 2
+        return result
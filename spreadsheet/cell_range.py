@@ -1,5 +1,5 @@
 from spreadsheet.cell import Cell
-from spreadsheet.coordinate import Coordinate
+from spreadsheet.coordinate import Coordinate, column_to_number, number_to_column, split_cell_name
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -12,10 +12,38 @@ class CellRange:
         self.origin_cell = origin.upper()
         self.dest_cell   = destination.upper()
         
+    def get_bounds(self) -> Tuple[int, int, int, int]:
+        """(col_lo, row_lo, col_hi, row_hi) of the range, as 1-based numbers."""
+        origin_col, origin_row = split_cell_name(self.origin_cell)
+        dest_col, dest_row = split_cell_name(self.dest_cell)
+        return (min(origin_col, dest_col), min(origin_row, dest_row),
+                max(origin_col, dest_col), max(origin_row, dest_row))
+
     def get_values(self, spreadsheet: 'Spreadsheet') -> List[Cell]:
         """
         Returns a list of cells in the range from origin_cell to dest_cell (inclusive).
         """
+        origin, destination = self._corners()
+
+        # Walk the tile store instead of probing every coordinate
+        values = list(spreadsheet.get_cells_in_range(origin, destination))
+        return values
+
+    def get_numbers(self, spreadsheet: 'Spreadsheet'):
+        """
+        The range as (numbers, integral, object cells): numeric cells packed in
+        an array('d'), whether all of them are integers, and the remaining cells.
+        """
+        origin, destination = self._corners()
+        return spreadsheet.get_range_numbers(origin, destination)
+
+    def get_summary(self, spreadsheet: 'Spreadsheet'):
+        """Aggregate summary from the sheet's column index, or None if the range must be scanned."""
+        origin, destination = self._corners()
+        return spreadsheet.get_range_summary(origin, destination)
+
+    def _corners(self) -> Tuple[Coordinate, Coordinate]:
+        """Validated top-left and bottom-right coordinates of the range."""
 
         def parse_ref(ref):
             match = re.match(r'^([A-Z]+)(\d+)$', ref)
@@ -30,31 +58,11 @@ class CellRange:
         if origin_col > dest_col or origin_row > dest_row:
             raise ValueError("Start cell must be before or the same as end cell")
 
-        def col_to_num(col):
-            num = 0
-            for c in col:
-                num = num * 26 + (ord(c) - ord('A') + 1)
-            return num
-
-        def num_to_col(num):
-            col = ''
-            while num > 0:
-                num, rem = divmod(num - 1, 26)
-                col = chr(rem + ord('A')) + col
-            return col
-
-        start_col_num = col_to_num(origin_col)
-        end_col_num = col_to_num(dest_col)
+        start_col_num = column_to_number(origin_col)
+        end_col_num = column_to_number(dest_col)
         start_row = min(origin_row, dest_row)
         end_row = max(origin_row, dest_row)
         start_col_num, end_col_num = min(start_col_num, end_col_num), max(start_col_num, end_col_num)
 
-        values = []
-        for col_num in range(start_col_num, end_col_num + 1):
-            col_str = num_to_col(col_num)
-            for row in range(start_row, end_row + 1):
-                coord = Coordinate(col_str, row)
-                cell = spreadsheet.get_cell(coord)
-                if cell:
-                    values.append(cell)
-        return values
\ No newline at end of file
+        return (Coordinate(number_to_column(start_col_num), start_row),
+                Coordinate(number_to_column(end_col_num), end_row))
@@ -1,3 +1,8 @@
+import re
+from functools import lru_cache
+
+_CELL_NAME = re.compile(r"([A-Z]+)(\d+)")
+
 class Coordinate:
     def __init__(self, column: str, row: int):
         self._row = row
@@ -26,3 +31,31 @@ class Coordinate:
 
     def __hash__(self):
         return hash((self._column, self._row))
+
+
+@lru_cache(maxsize=None)
+def column_to_number(column: str) -> int:
+    """Convert column letter(s) to number (A=1, B=2, ..., Z=26, AA=27, etc.)"""
+    result = 0
+    for char in column:
+        result = result * 26 + (ord(char) - ord('A') + 1)
+    return result
+
+
+@lru_cache(maxsize=None)
+def number_to_column(num: int) -> str:
+    """Convert number to column letter(s) (1=A, 2=B, ..., 26=Z, 27=AA, etc.)"""
+    result = ""
+    while num > 0:
+        num, rem = divmod(num - 1, 26)
+        result = chr(rem + ord('A')) + result
+    return result
+
+
+@lru_cache(maxsize=65536)
+def split_cell_name(name: str) -> tuple[int, int]:
+    """'AB12' -> (28, 12): column number and row of a cell name."""
+    match = _CELL_NAME.fullmatch(name)
+    if not match:
+        raise ValueError(f"Invalid cell reference: {name}")
+    return column_to_number(match.group(1)), int(match.group(2))
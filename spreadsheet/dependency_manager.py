@@ -1,82 +1,348 @@
-from typing import Set, Dict
+from typing import Set, Dict, List, Optional, Tuple, Iterable
 from exceptions import CircularDependencyException
 from formula.operand import CellOperand
 from formula.operand import FunctionOperand
 from formula.function import CellArgument, CellRangeArgument, FunctionArgumentWrapper
+from spreadsheet.coordinate import split_cell_name, number_to_column
+from spreadsheet.range_index import RangeIndex, Rect, rect_contains
+from spreadsheet.row_index import RowIndex
 
 class DependencyManager:
     def __init__(self):
-        # Maps "A1" -> {"B2", "C3", ...}
+        # Maps "A1" -> {"B2", "C3", ...} (the single cells A1 references)
         self.dependency_graph: Dict[str, Set[str]] = {}
+        # Reverse index: "B2" -> {"A1", ...} (the formulas that reference B2)
+        self.dependents: Dict[str, Set[str]] = {}
+        # Range precedents are kept as rectangles, never expanded per cell
+        self.range_index = RangeIndex()
+        # Topological position of every formula cell (precedents first)
+        self._order: Dict[str, int] = {}
+        self._lowest = 0
+        self._highest = 0
+        # Column number -> rows holding a formula, to find formulas inside ranges
+        self._formula_rows: Dict[int, RowIndex] = {}
+        # Previous positions of the nodes moved since checkpoint() (None: newly added)
+        self._undo_log: Optional[Dict[str, Optional[int]]] = None
 
-    def check_circular_dependencies(self, current_cell: str, referenced_cells: Set[str]):
+    def check_circular_dependencies(self, current_cell: str, referenced_cells: Set[str],
+                                    referenced_ranges: Iterable[Rect] = ()):
         """
-        Raise CircularDependencyException if any referenced_cells introduce a cycle
-        back to current_cell.
+        Raise CircularDependencyException if any referenced_cells (or a cell
+        inside referenced_ranges) introduce a cycle back to current_cell.
+
+        A precedent can only depend on current_cell if it sits after it in the
+        maintained topological order, so usually no search is needed at all;
+        otherwise the search is bounded to the affected slice of the order.
         """
+        referenced_ranges = list(referenced_ranges)
         # First check direct circular dependency
         if current_cell in referenced_cells:
             raise CircularDependencyException(f"Circular dependency detected: {current_cell} references itself")
-        
-        # Then check indirect circular dependencies
-        visited = set()
-        path = set()
-
-        def has_cycle_to_current(cell: str) -> bool:
-            if cell == current_cell:
-                return True
-            if cell in path:  # Found a cycle, but not to current_cell
-                return False
-            if cell in visited:
-                return False
-                
-            visited.add(cell)
-            path.add(cell)
-            
-            # Check all dependencies of this cell
-            for neighbor in self.dependency_graph.get(cell, set()):
-                if has_cycle_to_current(neighbor):
-                    return True
-                    
-            path.remove(cell)
-            return False
-
-        # Check if any of the referenced cells can reach back to current_cell
-        for ref_cell in referenced_cells:
-            if has_cycle_to_current(ref_cell):
-                raise CircularDependencyException(f"Circular dependency detected: {current_cell} -> {ref_cell} -> ... -> {current_cell}")
+        col, row = split_cell_name(current_cell)
+        for rect in referenced_ranges:
+            if rect_contains(rect, col, row):
+                raise CircularDependencyException(f"Circular dependency detected: {current_cell} references itself")
+
+        # Then check indirect circular dependencies: only formulas can lead back
+        precedents = self._formula_precedents(referenced_cells, referenced_ranges)
+        if not precedents:
+            return
+        if current_cell in self._order:
+            lower = self._order[current_cell]
+            suspects = {p for p in precedents if self._order[p] > lower}
+        elif self.get_dependents(current_cell):
+            suspects = precedents
+        else:
+            return  # nothing depends on current_cell yet
+        if not suspects:
+            return
 
-    def update_dependencies(self, current_cell: str, referenced_cells: Set[str]):
+        upper = max(self._order[p] for p in suspects)
+        for reached in self._forward_search(current_cell, upper):
+            if reached in suspects:
+                raise CircularDependencyException(f"Circular dependency detected: {current_cell} -> {reached} -> ... -> {current_cell}")
+
+    def update_dependencies(self, current_cell: str, referenced_cells: Set[str],
+                            referenced_ranges: Iterable[Rect] = ()):
         """
-        After ensuring no cycle, record the new edges into the dependency_graph.
+        After ensuring no cycle, record the new edges into the dependency_graph,
+        the reverse dependents index and the range index, and repair the
+        topological order around the new edges.
         """
+        referenced_ranges = list(referenced_ranges)
+        self._drop_edges(current_cell)
         self.dependency_graph[current_cell] = referenced_cells.copy()
+        for ref_cell in referenced_cells:
+            self.dependents.setdefault(ref_cell, set()).add(current_cell)
+        for rect in referenced_ranges:
+            self.range_index.add(current_cell, rect)
 
-    def get_referenced_cells_from_tokens(self, parsed_tokens) -> Set[str]:
-        """Extract cell references from parsed typed tokens."""
+        precedents = self._formula_precedents(referenced_cells, referenced_ranges)
+        if current_cell not in self._order:
+            if self._undo_log is not None:
+                self._undo_log.setdefault(current_cell, None)
+            self._add_position(current_cell)
+            if self.get_dependents(current_cell):
+                # Already referenced: place it first, then fix the incoming edges
+                self._lowest -= 1
+                self._order[current_cell] = self._lowest
+            else:
+                # Fresh formula: placing it last satisfies every incoming edge
+                self._highest += 1
+                self._order[current_cell] = self._highest
+                return
+        for precedent in precedents:
+            if self._order[precedent] > self._order[current_cell]:
+                self._reorder(precedent, current_cell)
+
+    def build_dependencies(self, references: Dict[str, Tuple[Set[str], List[Rect]]]) -> Set[str]:
+        """
+        Register many formulas at once (bulk load into an empty graph): record
+        every edge, then number the formulas with one Kahn pass instead of
+        repairing the order edge by edge. Formulas on or behind a cycle are
+        left unregistered and returned; they are checked when evaluated.
+        """
+        added: Dict[int, List[int]] = {}
+        for cell, (referenced_cells, referenced_ranges) in references.items():
+            self.dependency_graph[cell] = set(referenced_cells)
+            for ref_cell in referenced_cells:
+                self.dependents.setdefault(ref_cell, set()).add(cell)
+            for rect in referenced_ranges:
+                self.range_index.add(cell, rect)
+            col, row = split_cell_name(cell)
+            added.setdefault(col, []).append(row)
+            self._order[cell] = 0
+        for col, rows in added.items():
+            self._formula_rows.setdefault(col, RowIndex()).update(rows)
+
+        # Formulas registered before the bulk already sit earlier in the order
+        precedents = {cell: self._formula_precedents(referenced_cells, referenced_ranges) & references.keys()
+                      for cell, (referenced_cells, referenced_ranges) in references.items()}
+        waiting = {cell: len(found) for cell, found in precedents.items()}
+        successors: Dict[str, List[str]] = {}
+        for cell, found in precedents.items():
+            for precedent in found:
+                successors.setdefault(precedent, []).append(cell)
+
+        ready = [cell for cell, count in waiting.items() if count == 0]
+        while ready:
+            cell = ready.pop()
+            self._highest += 1
+            self._order[cell] = self._highest
+            for successor in successors.get(cell, ()):
+                waiting[successor] -= 1
+                if waiting[successor] == 0:
+                    ready.append(successor)
+
+        unresolved = {cell for cell, count in waiting.items() if count}
+        for cell in unresolved:
+            self.remove_dependencies(cell)
+        return unresolved
+
+    def remove_dependencies(self, current_cell: str):
+        """Forget the edges of a cell that no longer holds a formula."""
+        self._drop_edges(current_cell)
+        if self._order.pop(current_cell, None) is not None:
+            self._remove_position(current_cell)
+
+    def checkpoint(self, cells: Iterable[str]):
+        """
+        Remember the edges and positions of the given cells, and from now on
+        the previous position of every other node the order moves, so that
+        restore() can put the graph back exactly as it is now. Only the given
+        cells may have their edges changed until restore() or release().
+        """
+        saved = {}
+        for cell in cells:
+            referenced_cells = self.dependency_graph.get(cell)
+            saved[cell] = (None if referenced_cells is None else set(referenced_cells),
+                           list(self.range_index.get_rects(cell)), self._order.get(cell))
+        self._undo_log = {}
+        return saved, self._lowest, self._highest
+
+    def restore(self, checkpoint) -> None:
+        """Undo every change to the graph and the order since checkpoint()."""
+        saved, lowest, highest = checkpoint
+        moved, self._undo_log = self._undo_log or {}, None
+        for cell in saved:
+            self.remove_dependencies(cell)
+        for cell, position in moved.items():
+            if cell in saved:
+                continue
+            if position is None:
+                self.remove_dependencies(cell)
+            else:
+                self._order[cell] = position
+        for cell, (referenced_cells, referenced_ranges, position) in saved.items():
+            if referenced_cells is not None:
+                self.dependency_graph[cell] = referenced_cells
+                for ref_cell in referenced_cells:
+                    self.dependents.setdefault(ref_cell, set()).add(cell)
+            for rect in referenced_ranges:
+                self.range_index.add(cell, rect)
+            if position is not None:
+                self._order[cell] = position
+                self._add_position(cell)
+        self._lowest, self._highest = lowest, highest
+
+    def release(self) -> None:
+        """Keep the changes made since checkpoint()."""
+        self._undo_log = None
+
+    def _drop_edges(self, current_cell: str):
+        for ref_cell in self.dependency_graph.pop(current_cell, ()):
+            dependents = self.dependents.get(ref_cell)
+            if dependents is not None:
+                dependents.discard(current_cell)
+                if not dependents:
+                    del self.dependents[ref_cell]
+        self.range_index.discard(current_cell)
+
+    # ------------------------------------------------------------------
+    # Dynamic topological order (Pearce-Kelly)
+    # ------------------------------------------------------------------
+    def topological_position(self, cell: str) -> int:
+        """Position of a formula cell in the maintained topological order."""
+        return self._order[cell]
+
+    def _reorder(self, source: str, target: str):
+        """
+        Restore the order after adding the edge source -> target while
+        ord[source] > ord[target]: only nodes whose position lies between
+        the two are visited and shuffled.
+        """
+        lower, upper = self._order[target], self._order[source]
+        forward = []
+        for reached in self._forward_search(target, upper):
+            if reached == source:
+                raise CircularDependencyException(f"Circular dependency detected: {target} -> ... -> {source} -> {target}")
+            forward.append(reached)
+        backward = self._backward_search(source, lower)
+
+        backward.sort(key=self._order.__getitem__)
+        forward.sort(key=self._order.__getitem__)
+        affected = backward + forward
+        slots = sorted(self._order[node] for node in affected)
+        if self._undo_log is not None:
+            for node in affected:
+                self._undo_log.setdefault(node, self._order[node])
+        for node, slot in zip(affected, slots):
+            self._order[node] = slot
+
+    def _forward_search(self, start: str, upper: int) -> List[str]:
+        """Nodes reachable from start (start included) with position <= upper."""
+        seen = {start}
+        result = [start]
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for dependent in self.get_dependents(node):
+                if dependent not in seen and self._order.get(dependent, upper + 1) <= upper:
+                    seen.add(dependent)
+                    result.append(dependent)
+                    stack.append(dependent)
+        return result
+
+    def _backward_search(self, start: str, lower: int) -> List[str]:
+        """Nodes that reach start (start included) with position >= lower."""
+        seen = {start}
+        result = [start]
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            precedents = self._formula_precedents(self.dependency_graph.get(node, ()),
+                                                  self.range_index.get_rects(node))
+            for precedent in precedents:
+                if precedent not in seen and self._order[precedent] >= lower:
+                    seen.add(precedent)
+                    result.append(precedent)
+                    stack.append(precedent)
+        return result
+
+    def _formula_precedents(self, referenced_cells: Iterable[str], referenced_ranges: Iterable[Rect]) -> Set[str]:
+        """The precedents that are formulas themselves (the only ones that can form cycles)."""
+        precedents = {cell for cell in referenced_cells if cell in self._order}
+        for col_lo, row_lo, col_hi, row_hi in referenced_ranges:
+            if col_hi - col_lo + 1 <= len(self._formula_rows):
+                columns = (col for col in range(col_lo, col_hi + 1) if col in self._formula_rows)
+            else:
+                columns = (col for col in self._formula_rows if col_lo <= col <= col_hi)
+            for col in columns:
+                column = number_to_column(col)
+                for row in self._formula_rows[col].irange(row_lo, row_hi):
+                    precedents.add(f"{column}{row}")
+        return precedents
+
+    def _add_position(self, cell: str):
+        col, row = split_cell_name(cell)
+        rows = self._formula_rows.get(col)
+        if rows is None:
+            rows = self._formula_rows[col] = RowIndex()
+        rows.add(row)
+
+    def _remove_position(self, cell: str):
+        col, row = split_cell_name(cell)
+        rows = self._formula_rows.get(col)
+        if rows is None:
+            return
+        rows.discard(row)
+        if not rows:
+            del self._formula_rows[col]
+
+    def get_referenced_ranges(self, current_cell: str) -> List[Rect]:
+        return self.range_index.get_rects(current_cell)
+
+    def get_dependents(self, cell: str) -> Set[str]:
+        """Formulas that reference the given cell directly or through a range."""
+        dependents = set(self.dependents.get(cell, ()))
+        if len(self.range_index):
+            dependents |= self.range_index.stab(*split_cell_name(cell))
+        return dependents
+
+    def get_transitive_dependents(self, cell: str) -> Set[str]:
+        """Every formula whose value depends (directly or not) on the given cell."""
+        return self.get_transitive_dependents_of((cell,))
+
+    def get_transitive_dependents_of(self, cells: Iterable[str]) -> Set[str]:
+        """Every formula depending on any of the given cells, in a single traversal."""
+        result: Set[str] = set()
+        pending = [dependent for cell in cells for dependent in self.get_dependents(cell)]
+        while pending:
+            dependent = pending.pop()
+            if dependent in result:
+                continue
+            result.add(dependent)
+            pending.extend(self.get_dependents(dependent))
+        return result
+
+    def get_references_from_tokens(self, parsed_tokens) -> Tuple[Set[str], List[Rect]]:
+        """Extract single-cell references and range rectangles from parsed typed tokens."""
         referenced_cells = set()
-        
+        referenced_ranges: List[Rect] = []
+
         if parsed_tokens is None:
-            return referenced_cells
-        
+            return referenced_cells, referenced_ranges
+
         for element in parsed_tokens:
             if isinstance(element, CellOperand):
-                cell_name = f"{element.cell.coordinate.column}{element.cell.coordinate.row}"
+                cell_name = f"{element.coordinate.column}{element.coordinate.row}"
                 referenced_cells.add(cell_name)
             elif isinstance(element, FunctionOperand):
-                self._extract_from_function_args(element.arguments, referenced_cells)
-        
-        return referenced_cells
-    
-    def _extract_from_function_args(self, arguments, referenced_cells: Set[str]):
-        """Extract references from function arguments - handles ranges efficiently."""
+                self._extract_from_function_args(element.arguments, referenced_cells, referenced_ranges)
+
+        return referenced_cells, referenced_ranges
+
+    def get_referenced_cells_from_tokens(self, parsed_tokens) -> Set[str]:
+        """Extract single-cell references from parsed typed tokens (ranges excluded)."""
+        return self.get_references_from_tokens(parsed_tokens)[0]
+
+    def _extract_from_function_args(self, arguments, referenced_cells: Set[str], referenced_ranges: List[Rect]):
+        """Extract references from function arguments - ranges stay as rectangles."""
         for arg in arguments:
             if isinstance(arg, CellArgument):
-                cell_name = f"{arg.cell.coordinate.column}{arg.cell.coordinate.row}"
+                cell_name = f"{arg.coordinate.column}{arg.coordinate.row}"
                 referenced_cells.add(cell_name)
             elif isinstance(arg, CellRangeArgument):
-                for cell in arg.cells:
-                    cell_name = f"{cell.coordinate.column}{cell.coordinate.row}"
-                    referenced_cells.add(cell_name)
+                referenced_ranges.append(arg.cell_range.get_bounds())
             elif isinstance(arg, FunctionArgumentWrapper):
-                self._extract_from_function_args(arg.function_operand.arguments, referenced_cells)
\ No newline at end of file
+                self._extract_from_function_args(arg.function_operand.arguments, referenced_cells, referenced_ranges)
@@ -0,0 +1,187 @@
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Set
+
+from spreadsheet.cell import Cell
+from spreadsheet.tile_store import TILE_ROW_SHIFT, TILE_ROWS, TiledCellStore
+
+# Parsed value of a cell text: a plain int/float (stored unboxed) or a CellContent
+Classifier = Callable[[str], Any]
+
+
+class PagedCellStore(TiledCellStore):
+    """
+    Tiled store backed by a row-addressable file (MappedSheetFile). Rows are
+    paged in one band of TILE_ROWS rows at a time, the first time anything
+    touches the band: a lookup, a write (so a later page-in never overwrites
+    an edit) or a range. Opening costs nothing and memory grows with the
+    bands actually used; iterating or counting every cell pages in the rest.
+    Emptiness and the used rows come from the file's row index plus the
+    first and last bands holding cells, and a printout shows only the
+    resident rows (see resident_rows), so neither reads the whole file.
+    """
+
+    def __init__(self, source, classify: Classifier) -> None:
+        super().__init__()
+        self._source = source
+        self._classify = classify
+        self._paged: Set[int] = set()
+        self._fully_paged = False
+
+    def _page_rows(self, row_lo: int, row_hi: int) -> None:
+        if self._fully_paged or (self._source.complete and row_lo > self._source.row_count):
+            return
+        row_hi = self._source.index_rows(row_hi)
+        for band in range((row_lo - 1) >> TILE_ROW_SHIFT, ((row_hi - 1) >> TILE_ROW_SHIFT) + 1):
+            if band in self._paged:
+                continue
+            self._paged.add(band)
+            first = band * TILE_ROWS + 1
+            for column, row, text in self._source.iter_cell_texts(first, first + TILE_ROWS - 1):
+                value = self._classify(text)
+                if type(value) is int or type(value) is float:
+                    TiledCellStore.put_number(self, column, row, value)
+                else:
+                    TiledCellStore.put(self, Cell((column, row), value))
+        source = self._source
+        if source.complete and len(self._paged) == (source.row_count + TILE_ROWS - 1) >> TILE_ROW_SHIFT:
+            self._fully_paged = True
+
+    def _bands(self) -> int:
+        return (self._source.row_count + TILE_ROWS - 1) >> TILE_ROW_SHIFT
+
+    def _page_all(self) -> None:
+        if not self._fully_paged:
+            self._page_rows(1, self._source.row_count)
+            self._fully_paged = True
+
+    def get(self, column: str, row: int) -> Optional[Cell]:
+        self._page_rows(row, row)
+        return super().get(column, row)
+
+    def value(self, column: str, row: int, spreadsheet=None, default=None) -> Any:
+        self._page_rows(row, row)
+        return super().value(column, row, spreadsheet, default)
+
+    def contains(self, column: str, row: int) -> bool:
+        self._page_rows(row, row)
+        return super().contains(column, row)
+
+    def put(self, cell: Cell) -> None:
+        self._page_rows(cell.coordinate.row, cell.coordinate.row)
+        super().put(cell)
+
+    def put_many(self, cells: Iterable[Cell]) -> List[Optional[Cell]]:
+        cells = list(cells)
+        for cell in cells:
+            self._page_rows(cell.coordinate.row, cell.coordinate.row)
+        return super().put_many(cells)
+
+    def put_number(self, column: str, row: int, number) -> None:
+        self._page_rows(row, row)
+        super().put_number(column, row, number)
+
+    def remove(self, column: str, row: int) -> Optional[Cell]:
+        self._page_rows(row, row)
+        return super().remove(column, row)
+
+    def iter_range(self, col_lo: int, col_hi: int, row_lo: int, row_hi: int) -> Iterator[Cell]:
+        self._page_rows(row_lo, row_hi)
+        return super().iter_range(col_lo, col_hi, row_lo, row_hi)
+
+    def iter_objects(self, col_lo: int, col_hi: int, row_lo: int, row_hi: int) -> Iterator[Cell]:
+        self._page_rows(row_lo, row_hi)
+        return super().iter_objects(col_lo, col_hi, row_lo, row_hi)
+
+    def range_numbers(self, col_lo: int, col_hi: int, row_lo: int, row_hi: int):
+        self._page_rows(row_lo, row_hi)
+        return super().range_numbers(col_lo, col_hi, row_lo, row_hi)
+
+    def range_summary(self, col_lo: int, col_hi: int, row_lo: int, row_hi: int):
+        self._page_rows(row_lo, row_hi)
+        return super().range_summary(col_lo, col_hi, row_lo, row_hi)
+
+    def numeric_columns(self):
+        self._page_all()
+        return super().numeric_columns()
+
+    def put_numeric_column(self, col_num: int, rows, tags: bytes, values) -> None:
+        self._page_all()
+        super().put_numeric_column(col_num, rows, tags, values)
+
+    def put_objects(self, entries) -> None:
+        self._page_all()
+        super().put_objects(entries)
+
+    def iter_all_objects(self) -> Iterator[Cell]:
+        self._page_all()
+        return super().iter_all_objects()
+
+    def iter_rows(self):
+        self._page_all()
+        return super().iter_rows()
+
+    def last_column(self) -> int:
+        self._page_all()
+        return super().last_column()
+
+    def bounds(self):
+        """
+        Used range with exact rows, paging in bands from either end of the
+        file only until one holds a cell; the columns are those of the rows
+        read so far (exact once the file is fully paged).
+        """
+        if not self:
+            return None
+        used_rows = self._used_rows
+        for band in range(self._bands() - 1, -1, -1):
+            first = band * TILE_ROWS + 1
+            self._page_rows(first, first)
+            if used_rows.last() >= first:
+                break
+        for band in range(self._bands()):
+            last = (band + 1) * TILE_ROWS
+            self._page_rows(last, last)
+            if used_rows.first() <= last:
+                break
+        return super().bounds()
+
+    def resident_columns(self) -> Iterator[int]:
+        return super().used_columns()
+
+    def resident_rows(self, row_lo: int, row_hi: int) -> Iterator[int]:
+        """Rows row_lo..row_hi of the bands paged in (every one once the file is fully paged)."""
+        if self._fully_paged:
+            yield from range(row_lo, row_hi + 1)
+            return
+        row_count = self._source.row_count
+        for band in sorted(self._paged):
+            yield from range(max(row_lo, band * TILE_ROWS + 1), min(row_hi, (band + 1) * TILE_ROWS, row_count) + 1)
+        # Rows past the end of the file hold only edits, and are always resident
+        yield from range(max(row_lo, row_count + 1), row_hi + 1)
+
+    def used_columns(self) -> Iterator[int]:
+        self._page_all()
+        return super().used_columns()
+
+    def row_last_column(self, row: int) -> int:
+        self._page_rows(row, row)
+        return super().row_last_column(row)
+
+    def column_last_row(self, col_num: int) -> int:
+        self._page_all()
+        return super().column_last_row(col_num)
+
+    def __iter__(self) -> Iterator[Cell]:
+        self._page_all()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self._page_all()
+        return super().__len__()
+
+    def __bool__(self) -> bool:
+        """Whether any cell exists, paging in bands from the top only until one holds a cell."""
+        band = 0
+        while not self._count and not self._fully_paged and band < self._bands():
+            self._page_rows(band * TILE_ROWS + 1, band * TILE_ROWS + 1)
+            band += 1
+        return self._count > 0
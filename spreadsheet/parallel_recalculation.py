@@ -0,0 +1,211 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from spreadsheet.coordinate import number_to_column, split_cell_name
+
+if TYPE_CHECKING:
+    from spreadsheet.spreadsheet import Spreadsheet
+
+# A batch shipped to a worker: input values of the cells the formulas read
+# (outside the batch), the pickled compiled templates of its formulas (see
+# fileio.snapshot_file), and the formulas as (column, row, text, template
+# index), in topological order
+Batch = Tuple[List[Tuple[int, int, Any]], bytes, List[Tuple[int, int, str, int]]]
+
+
+def _evaluate_batch(batch: Batch) -> List[Any]:
+    """
+    Worker side: store the inputs and formulas in a scratch sheet, attach
+    the shipped programs (nothing is parsed) and evaluate the formulas in
+    the order given, which puts precedents first: the scratch sheet needs no
+    dependency graph. Returns the values, None where evaluation failed.
+    """
+    from content.formula_content import FormulaContent
+    from content.text_content import TextContent
+    from fileio.snapshot_file import _SnapshotUnpickler
+    from formula.formula_template import FormulaTemplate
+    from spreadsheet.cell import Cell
+    from spreadsheet.spreadsheet import Spreadsheet
+
+    inputs, programs, formulas = batch
+    sheet = Spreadsheet()
+    store = sheet.cells
+    templates = [FormulaTemplate.from_snapshot_state(state, sheet)
+                 for state in _SnapshotUnpickler(io.BytesIO(programs), sheet).load()]
+    objects = []
+    for col_num, row, value in inputs:
+        column = number_to_column(col_num)
+        if isinstance(value, (int, float)):
+            store.put_number(column, row, value)
+        else:
+            objects.append((col_num, row, Cell((column, row), TextContent(str(value)))))
+    contents = []
+    for col_num, row, formula, template_id in formulas:
+        column = number_to_column(col_num)
+        content = FormulaContent(formula)
+        content._template = templates[template_id]
+        content._anchor = (col_num, row)
+        objects.append((col_num, row, Cell((column, row), content)))
+        contents.append(content)
+    store.put_objects(objects)
+
+    values = []
+    for content in contents:
+        column, row = content._anchor
+        try:
+            content._computed_value = content._template.evaluate(column, row)
+        except Exception:
+            pass
+        values.append(content._computed_value)
+    return values
+
+
+class ParallelRecalculationEngine:
+    """
+    Recalculation across a process pool. The formulas to compute are split
+    into independent connected components of the dependency graph; the
+    components are packed into one batch per task and each batch is shipped
+    once, with the values it reads from outside, to be evaluated in a worker.
+    Components that read ranges, components and passes too small to pay
+    for the round trip, are evaluated in-process by the regular engine.
+
+    A batch carries the compiled programs of its formulas, pickled once per
+    distinct template the way a binary snapshot stores them, so workers
+    evaluate without parsing. Still opt-in: every pass pays for shipping the
+    inputs and programs and for rebuilding the scratch sheet, which only
+    more cores than that overhead win back, on large components;
+    Spreadsheet keeps the in-process engine unless set_recalculation_workers
+    asks otherwise.
+    """
+
+    # Below this many formulas a pass stays in-process
+    MIN_PARALLEL_FORMULAS = 2000
+    # Components smaller than this stay in-process: shipping them costs more than it saves
+    MIN_PARALLEL_COMPONENT = 256
+
+    @staticmethod
+    def available_workers(workers: int) -> int:
+        """workers capped at the machine's cores (1: no pool is worth starting)."""
+        return max(1, min(workers, os.cpu_count() or 1))
+
+    def __init__(self, spreadsheet: "Spreadsheet", workers: int) -> None:
+        self.spreadsheet = spreadsheet
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def recalculate(self, cell_names, stop_on_error: bool = False) -> List[str]:
+        sheet = self.spreadsheet
+        engine = sheet.recalc_engine
+        pending = engine._collect(cell_names, stop_on_error)
+        if len(pending) < self.MIN_PARALLEL_FORMULAS:
+            return engine.recalculate(list(pending), stop_on_error)
+
+        local: List[str] = []
+        batches: List[Tuple[List[Tuple[int, int, Any]], List[str]]] = [([], []) for _ in range(self.workers * 4)]
+        sizes = [0] * len(batches)
+        for component in self._components(pending):
+            if len(component) < self.MIN_PARALLEL_COMPONENT:
+                local.extend(component)
+                continue
+            inputs = self._component_inputs(component, pending)
+            if inputs is None:
+                local.extend(component)
+                continue
+            # Greedy balancing: the next component goes to the lightest batch
+            target = sizes.index(min(sizes))
+            sizes[target] += len(component)
+            batches[target][0].extend(inputs)
+            batches[target][1].extend(component)
+
+        evaluated = []
+        positions = sheet.dep_manager.topological_position
+        remote = [(sorted(names, key=positions), inputs) for inputs, names in batches if names]
+        if remote:
+            shipped = [self._pack(inputs, names, pending) for names, inputs in remote]
+            for (names, _), values in zip(remote, self._executor().map(_evaluate_batch, shipped)):
+                for name, value in zip(names, values):
+                    if value is None:
+                        # Failed in the worker: recompute here so the error surfaces as usual
+                        local.append(name)
+                    elif pending[name]._computed_value is None:
+                        pending[name]._computed_value = value
+                        evaluated.append(name)
+        if local:
+            evaluated.extend(engine.recalculate(local, stop_on_error))
+        return evaluated
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _pack(self, inputs: List[Tuple[int, int, Any]], names: List[str], pending: Dict[str, Any]) -> Batch:
+        """The batch for names (sorted): each distinct template pickled once, formulas pointing at it."""
+        from fileio.snapshot_file import _SnapshotPickler
+
+        template_ids: Dict[int, int] = {}
+        states = []
+        formulas = []
+        for name in names:
+            # Pending formulas are registered, hence compiled
+            content = pending[name]
+            template = content._template
+            template_id = template_ids.get(id(template))
+            if template_id is None:
+                template_id = template_ids[id(template)] = len(states)
+                states.append(template.snapshot_state())
+            col_num, row = content._anchor
+            formulas.append((col_num, row, content.formula, template_id))
+        programs = io.BytesIO()
+        _SnapshotPickler(programs, self.spreadsheet).dump(states)
+        return inputs, programs.getvalue(), formulas
+
+    def _components(self, pending: Dict[str, Any]) -> List[List[str]]:
+        """Connected components of the pending formulas (union-find over formula edges)."""
+        graph = self.spreadsheet.dep_manager.dependency_graph
+        parent = {name: name for name in pending}
+
+        def find(name: str) -> str:
+            while parent[name] != name:
+                parent[name] = parent[parent[name]]
+                name = parent[name]
+            return name
+
+        for name in pending:
+            for precedent in graph.get(name, ()):
+                if precedent in parent:
+                    root, other = find(name), find(precedent)
+                    if root != other:
+                        parent[other] = root
+        components: Dict[str, List[str]] = {}
+        for name in pending:
+            components.setdefault(find(name), []).append(name)
+        return list(components.values())
+
+    def _component_inputs(self, component: List[str],
+                          pending: Dict[str, Any]) -> Optional[List[Tuple[int, int, Any]]]:
+        """Values the component reads from outside itself, or None if it must stay in-process."""
+        sheet = self.spreadsheet
+        dep_manager = sheet.dep_manager
+        inputs = []
+        for name in component:
+            if dep_manager.get_referenced_ranges(name):
+                return None
+            for precedent in dep_manager.dependency_graph.get(name, ()):
+                if precedent in pending:
+                    continue
+                cell = sheet._get_cell_by_name(precedent)
+                if cell is None:
+                    continue
+                try:
+                    inputs.append((*split_cell_name(precedent), cell.get_value(sheet)))
+                except Exception:
+                    return None
+        return inputs
@@ -0,0 +1,93 @@
+from typing import Dict, Hashable, List, Set, Tuple
+
+# (col_lo, row_lo, col_hi, row_hi), 1-based and inclusive
+Rect = Tuple[int, int, int, int]
+
+
+def _dyadic_blocks(lo: int, hi: int) -> List[Tuple[int, int]]:
+    """
+    Canonical segment-tree blocks (level, index) covering [lo, hi]. Block
+    (level, i) spans the 0-based positions [i << level, (i + 1) << level).
+    """
+    blocks = []
+    lo, hi = lo - 1, hi  # half-open, 0-based
+    level = 0
+    while lo < hi:
+        if lo & 1:
+            blocks.append((level, lo))
+            lo += 1
+        if hi & 1:
+            hi -= 1
+            blocks.append((level, hi))
+        lo >>= 1
+        hi >>= 1
+        level += 1
+    return blocks
+
+
+class RangeIndex:
+    """
+    Spatial index of rectangles keyed by owner (a formula cell name).
+
+    Each rectangle is split into O(log rows x log cols) canonical blocks of a
+    2-D segment tree, so storage grows with the number of ranges rather than
+    their area, and a stabbing query for one cell only probes the blocks that
+    contain it.
+    """
+
+    def __init__(self) -> None:
+        self._blocks: Dict[Tuple[int, int, int, int], Set[Hashable]] = {}
+        self._owner_blocks: Dict[Hashable, List[Tuple[int, int, int, int]]] = {}
+        self._owner_rects: Dict[Hashable, List[Rect]] = {}
+        # (row level, col level) -> number of blocks stored at that pair
+        self._levels: Dict[Tuple[int, int], int] = {}
+
+    def add(self, owner: Hashable, rect: Rect) -> None:
+        col_lo, row_lo, col_hi, row_hi = rect
+        keys = self._owner_blocks.setdefault(owner, [])
+        self._owner_rects.setdefault(owner, []).append(rect)
+        for row_level, row_idx in _dyadic_blocks(row_lo, row_hi):
+            for col_level, col_idx in _dyadic_blocks(col_lo, col_hi):
+                key = (row_level, row_idx, col_level, col_idx)
+                owners = self._blocks.get(key)
+                if owners is None:
+                    owners = self._blocks[key] = set()
+                    levels = (row_level, col_level)
+                    self._levels[levels] = self._levels.get(levels, 0) + 1
+                owners.add(owner)
+                keys.append(key)
+
+    def discard(self, owner: Hashable) -> None:
+        """Remove every rectangle registered for owner."""
+        self._owner_rects.pop(owner, None)
+        for key in self._owner_blocks.pop(owner, ()):
+            owners = self._blocks.get(key)
+            if owners is None:
+                continue
+            owners.discard(owner)
+            if not owners:
+                del self._blocks[key]
+                levels = (key[0], key[2])
+                self._levels[levels] -= 1
+                if not self._levels[levels]:
+                    del self._levels[levels]
+
+    def get_rects(self, owner: Hashable) -> List[Rect]:
+        return self._owner_rects.get(owner, [])
+
+    def stab(self, col: int, row: int) -> Set[Hashable]:
+        """Owners of every rectangle containing the cell (col, row)."""
+        result: Set[Hashable] = set()
+        c, r = col - 1, row - 1
+        for row_level, col_level in self._levels:
+            owners = self._blocks.get((row_level, r >> row_level, col_level, c >> col_level))
+            if owners:
+                result |= owners
+        return result
+
+    def __len__(self) -> int:
+        return len(self._owner_rects)
+
+
+def rect_contains(rect: Rect, col: int, row: int) -> bool:
+    return rect[0] <= col <= rect[2] and rect[1] <= row <= rect[3]
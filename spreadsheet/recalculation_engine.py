@@ -0,0 +1,75 @@
+from typing import Dict, Iterable, List, TYPE_CHECKING
+
+from spreadsheet.coordinate import Coordinate, number_to_column
+
+if TYPE_CHECKING:
+    from spreadsheet.spreadsheet import Spreadsheet
+    from content.formula_content import FormulaContent
+
+
+class RecalculationEngine:
+    """
+    Push-based recalculation: gathers every formula a request needs with an
+    explicit work stack, then evaluates them in the DependencyManager's
+    topological order. Precedents are always computed before the formulas
+    that read them, so evaluation never recurses from one formula into
+    another, and each formula is evaluated once per pass.
+    """
+
+    def __init__(self, spreadsheet: "Spreadsheet") -> None:
+        self.spreadsheet = spreadsheet
+
+    def recalculate(self, cell_names: Iterable[str], stop_on_error: bool = True) -> List[str]:
+        """
+        Compute the given formula cells plus any precedent formula without a
+        value, and return the names evaluated. With stop_on_error=False a
+        failing formula is left without a value (reading it raises again)
+        and the pass carries on with the rest.
+        """
+        pending = self._collect(cell_names, stop_on_error)
+        positions = self.spreadsheet.dep_manager.topological_position
+        evaluated = []
+        for name in sorted(pending, key=positions):
+            content = pending[name]
+            if content._computed_value is not None:
+                continue
+            try:
+                content._computed_value = content._compute_value(self.spreadsheet, name)
+            except Exception:
+                if stop_on_error:
+                    raise
+                continue
+            evaluated.append(name)
+        return evaluated
+
+    def _collect(self, cell_names: Iterable[str], stop_on_error: bool) -> Dict[str, "FormulaContent"]:
+        """Formulas to evaluate, registered with the dependency manager (cycle-checked)."""
+        sheet = self.spreadsheet
+        dep_manager = sheet.dep_manager
+        pending: Dict[str, "FormulaContent"] = {}
+        stack: List[str] = list(cell_names)
+        while stack:
+            name = stack.pop()
+            if name in pending:
+                continue
+            cell = sheet._get_cell_by_name(name)
+            if cell is None or not sheet._is_formula(cell.content):
+                continue
+            content = cell.content
+            if content._computed_value is not None:
+                continue
+            if not content._dependencies_registered:
+                try:
+                    content.check_circular_dependencies(sheet, name)
+                except Exception:
+                    if stop_on_error:
+                        raise
+                    continue
+            pending[name] = content
+
+            stack.extend(dep_manager.dependency_graph.get(name, ()))
+            for col_lo, row_lo, col_hi, row_hi in dep_manager.get_referenced_ranges(name):
+                for precedent in sheet.get_formula_cells_in_range(Coordinate(number_to_column(col_lo), row_lo),
+                                                                  Coordinate(number_to_column(col_hi), row_hi)):
+                    stack.append(f"{precedent.coordinate.column}{precedent.coordinate.row}")
+        return pending
@@ -0,0 +1,157 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Rows per chunk before it is split in two
+_CHUNK_ROWS = 1024
+
+
+class RowIndex:
+    """
+    Sorted set of row numbers (the occupied rows of one column), kept as a
+    list of sorted array('q') chunks plus the largest row of each: a
+    two-level B-tree. Adding or removing a row bisects the chunk maxima and
+    shifts at most one chunk, whatever the insertion order, and irange
+    enumerates the k rows inside [lo, hi] in O(k + log n).
+    """
+
+    __slots__ = ("_chunks", "_maxes", "_len")
+
+    def __init__(self, rows: Iterable[int] = ()) -> None:
+        self._chunks: List[array] = []
+        self._maxes: List[int] = []
+        self._len = 0
+        self.update(rows)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[int]:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def __contains__(self, row: int) -> bool:
+        i = bisect_left(self._maxes, row)
+        if i == len(self._maxes):
+            return False
+        chunk = self._chunks[i]
+        return chunk[bisect_left(chunk, row)] == row
+
+    def __getstate__(self) -> List[bytes]:
+        # Raw bytes, so a snapshot's restricted unpickler needs no array class
+        return [chunk.tobytes() for chunk in self._chunks]
+
+    def __setstate__(self, state: List[bytes]) -> None:
+        self._chunks = []
+        for data in state:
+            chunk = array('q')
+            chunk.frombytes(data)
+            self._chunks.append(chunk)
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = sum(map(len, self._chunks))
+
+    def add(self, row: int) -> bool:
+        """Insert a row; False if it was already there."""
+        maxes = self._maxes
+        if not maxes:
+            self._chunks.append(array('q', (row,)))
+            maxes.append(row)
+            self._len = 1
+            return True
+        i = bisect_left(maxes, row)
+        if i == len(maxes):
+            # Past the end: the common case of rows filled top to bottom
+            i -= 1
+            chunk = self._chunks[i]
+            chunk.append(row)
+            maxes[i] = row
+        else:
+            chunk = self._chunks[i]
+            j = bisect_left(chunk, row)
+            if chunk[j] == row:
+                return False
+            chunk.insert(j, row)
+        self._len += 1
+        if len(chunk) > 2 * _CHUNK_ROWS:
+            self._chunks[i:i + 1] = [chunk[:_CHUNK_ROWS], chunk[_CHUNK_ROWS:]]
+            maxes[i:i + 1] = [chunk[_CHUNK_ROWS - 1], chunk[-1]]
+        return True
+
+    def discard(self, row: int) -> bool:
+        """Remove a row; False if it was not there."""
+        maxes = self._maxes
+        i = bisect_left(maxes, row)
+        if i == len(maxes):
+            return False
+        chunk = self._chunks[i]
+        j = bisect_left(chunk, row)
+        if chunk[j] != row:
+            return False
+        del chunk[j]
+        self._len -= 1
+        if not chunk:
+            del self._chunks[i]
+            del maxes[i]
+        elif j == len(chunk):
+            maxes[i] = chunk[-1]
+        return True
+
+    def update(self, rows: Iterable[int]) -> None:
+        """Add many rows: appended in bulk when they all follow the current ones, else merged."""
+        rows = sorted(set(rows))
+        if not rows:
+            return
+        if self._maxes and rows[0] <= self._maxes[-1]:
+            rows = sorted(set(self).union(rows))
+            self._chunks, self._maxes, self._len = [], [], 0
+        if self._chunks and len(self._chunks[-1]) < _CHUNK_ROWS:
+            # Top up the last chunk first
+            room = _CHUNK_ROWS - len(self._chunks[-1])
+            self._chunks[-1].extend(rows[:room])
+            rows = rows[room:]
+        for start in range(0, len(rows), _CHUNK_ROWS):
+            self._chunks.append(array('q', rows[start:start + _CHUNK_ROWS]))
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = sum(map(len, self._chunks))
+
+    def irange(self, lo: int, hi: int) -> Iterator[int]:
+        """Rows in [lo, hi], ascending."""
+        maxes = self._maxes
+        i = bisect_left(maxes, lo)
+        if i == len(maxes):
+            return
+        chunks = self._chunks
+        j = bisect_left(chunks[i], lo)
+        for chunk in chunks[i:]:
+            if chunk[-1] <= hi:
+                yield from chunk[j:]
+            else:
+                yield from chunk[j:bisect_right(chunk, hi)]
+                return
+            j = 0
+
+    def span(self, lo: int, hi: int) -> Optional[Tuple[int, int]]:
+        """(first, last) rows in [lo, hi], or None when there is none."""
+        maxes = self._maxes
+        i = bisect_left(maxes, lo)
+        if i == len(maxes):
+            return None
+        chunks = self._chunks
+        first = chunks[i][bisect_left(chunks[i], lo)]
+        if first > hi:
+            return None
+        k = bisect_right(maxes, hi)
+        if k < len(maxes):
+            chunk = chunks[k]
+            position = bisect_right(chunk, hi)
+            if position:
+                return first, chunk[position - 1]
+        return first, chunks[k - 1][-1]
+
+    def first(self) -> int:
+        """Smallest row (0 when empty)."""
+        return self._chunks[0][0] if self._chunks else 0
+
+    def last(self) -> int:
+        """Largest row (0 when empty)."""
+        return self._maxes[-1] if self._maxes else 0
@@ -1,23 +1,128 @@
 import re
-from typing import Dict, Set, List, Optional
+from weakref import WeakValueDictionary
+from typing import Any, Dict, Set, List, Optional, Iterable, Iterator, Tuple
 from spreadsheet.cell import Cell
-from spreadsheet.coordinate import Coordinate
+from spreadsheet.coordinate import Coordinate, column_to_number, number_to_column
 from spreadsheet.dependency_manager import DependencyManager
+from spreadsheet.tile_store import TiledCellStore
+from spreadsheet.paged_store import PagedCellStore
+from spreadsheet.recalculation_engine import RecalculationEngine
+from spreadsheet.parallel_recalculation import ParallelRecalculationEngine
+from spreadsheet.transaction import SpreadsheetTransaction
 
 class Spreadsheet:
+    # Calculation modes
+    AUTOMATIC = "automatic"   # stale formulas are recomputed as soon as they are read
+    DEFERRED = "deferred"     # edits only mark formulas dirty; the first read recalculates them all
+    MANUAL = "manual"         # stale values are kept until recalculate() is called
+    CALCULATION_MODES = (AUTOMATIC, DEFERRED, MANUAL)
+
     def __init__(self):
-        self.cells: List[Cell] = []
+        # Tiled cell store: numeric cells unboxed, text/formulas as sparse objects
+        self._cells = TiledCellStore()
         self.dep_manager = DependencyManager()
+        self.recalc_engine = RecalculationEngine(self)
+        # Set with set_recalculation_workers: full passes on a process pool
+        self.parallel_engine: Optional[ParallelRecalculationEngine] = None
+        # Formula cells whose value is missing or stale
+        self._dirty: Set[str] = set()
+        self.calculation_mode: str = Spreadsheet.AUTOMATIC
+        # Compiled formula programs shared by formulas with the same relative form
+        self.formula_templates: WeakValueDictionary = WeakValueDictionary()
+        # Edit journal of the file the sheet was loaded from (EditJournal): committed edits are appended to it
+        self.journal = None
+
+    def set_calculation_mode(self, mode: str) -> None:
+        if mode not in self.CALCULATION_MODES:
+            raise ValueError(f"Unknown calculation mode: {mode}")
+        self.calculation_mode = mode
+
+    def transaction(self, evaluate: bool = True) -> SpreadsheetTransaction:
+        """
+        Batch of edits applied as one unit, meant for a with block:
+
+            with sheet.transaction() as transaction:
+                transaction.set_cell(coords, cell)
+
+        The edits are committed when the block exits normally and discarded
+        if it raises; a failing commit leaves the sheet as it was. With
+        evaluate=False the commit only checks syntax and cycles.
+        """
+        return SpreadsheetTransaction(self, evaluate)
+
+    def set_recalculation_workers(self, workers: int) -> None:
+        """
+        Opt in to running large full recalculations on a pool of up to this
+        many processes (1 = in-process, the default). Capped at the number of
+        cores; see ParallelRecalculationEngine for when the pool pays off.
+        """
+        if workers < 1:
+            raise ValueError(f"Invalid number of recalculation workers: {workers}")
+        if self.parallel_engine is not None:
+            self.parallel_engine.shutdown()
+        workers = ParallelRecalculationEngine.available_workers(workers)
+        self.parallel_engine = ParallelRecalculationEngine(self, workers) if workers > 1 else None
+
+    @property
+    def cells(self) -> TiledCellStore:
+        """Read-only, sized iterable over every stored cell (materialized on demand)."""
+        return self._cells
 
     def get_cell(self, coords: Coordinate) -> Optional[Cell]:
-        for cell in self.cells:
-            if cell.coordinate == coords:
-                return cell
-        return None
-    
+        return self._cells.get(coords.column, coords.row)
+
+    def get_cell_value(self, coords: Coordinate, default: Any = None) -> Any:
+        """Value of the cell at coords (default if empty), without materializing unboxed cells."""
+        return self._cells.value(coords.column, coords.row, self, default)
+
+    def has_cell(self, coords: Coordinate) -> bool:
+        """Whether a cell exists at coords (cheaper than get_cell for unboxed numbers)."""
+        return self._cells.contains(coords.column, coords.row)
+
+    def get_cells_in_range(self, origin: Coordinate, destination: Coordinate) -> Iterator[Cell]:
+        """Occupied cells of the rectangle origin:destination, column by column."""
+        return self._cells.iter_range(
+            column_to_number(origin.column), column_to_number(destination.column),
+            origin.row, destination.row
+        )
+
+    def get_formula_cells_in_range(self, origin: Coordinate, destination: Coordinate) -> Iterator[Cell]:
+        """Formula cells of the rectangle origin:destination, without visiting numeric cells."""
+        objects = self._cells.iter_objects(
+            column_to_number(origin.column), column_to_number(destination.column),
+            origin.row, destination.row
+        )
+        return (cell for cell in objects if self._is_formula(cell.content))
+
+    def get_range_numbers(self, origin: Coordinate, destination: Coordinate):
+        """Rectangle origin:destination as (numbers array('d'), all integers?, object cells)."""
+        return self._cells.range_numbers(
+            column_to_number(origin.column), column_to_number(destination.column),
+            origin.row, destination.row
+        )
+
+    def get_range_summary(self, origin: Coordinate, destination: Coordinate):
+        """Indexed aggregate summary of a tall all-numeric rectangle, or None (see TiledCellStore.range_summary)."""
+        return self._cells.range_summary(
+            column_to_number(origin.column), column_to_number(destination.column),
+            origin.row, destination.row
+        )
+
+    def used_range(self) -> Optional[Tuple[Coordinate, Coordinate]]:
+        """Top-left and bottom-right corners of the occupied cells, or None when empty (O(1))."""
+        bounds = self._cells.bounds()
+        if bounds is None:
+            return None
+        min_row, max_row, min_col, max_col = bounds
+        return Coordinate(number_to_column(min_col), min_row), Coordinate(number_to_column(max_col), max_row)
+
     def get_cell_name(self, content) -> str:
         """Find the cell name that contains the given content."""
-        for cell in self.cells:
+        key = self._cells.find_content(content)
+        if key is not None:
+            return f"{key[0]}{key[1]}"
+        # The content may have been swapped directly on a stored cell
+        for cell in self._cells:
             if cell.content is content:
                 return f"{cell.coordinate.column}{cell.coordinate.row}"
         raise ValueError("Cell containing this content was not found.")
@@ -33,116 +138,192 @@ class Spreadsheet:
         if cell.coordinate != coords:
             cell.coordinate = coords  
         
-        # Remove existing cell at these coordinates
+        # Replace any existing cell at these coordinates
         self._remove_cell_at_coords(coords)
-        
-        # Add the new cell to the list
-        self.cells.append(cell)
+        self._store_cell(cell)
+
+        cell_name = f"{coords.column}{coords.row}"
+        if self._is_formula(cell.content):
+            self._dirty.add(cell_name)
+        else:
+            # A plain value references nothing: drop edges left by an old formula
+            self.dep_manager.remove_dependencies(cell_name)
+            self._dirty.discard(cell_name)
         
         # Invalidate dependent formulas
-        cell_name = f"{coords.column}{coords.row}"
         self._invalidate_dependent_formulas(cell_name)
 
+        if self.journal is not None:
+            self.journal.record((cell,))
+
+    def page_from(self, source, classify) -> None:
+        """
+        Back this empty sheet by a row-addressable file (MappedSheetFile):
+        rows become cells, parsed with classify, as they are first touched
+        (see PagedCellStore) instead of all being loaded up front.
+        """
+        if len(self._cells):
+            raise ValueError("Only an empty spreadsheet can be paged from a file")
+        self._cells = PagedCellStore(source, classify)
+
+    def load_cells(self, entries: Iterable[Tuple[str, int, Any]]) -> int:
+        """
+        Bulk insert for filling a fresh sheet from a file. Entries are
+        (column, row, value) with value a plain int/float (stored unboxed, no
+        Cell built) or a CellContent. Cells are stored with no per-cell removal
+        or invalidation; afterwards every formula is compiled and the dependency
+        graph is built in one pass. Returns the number of cells loaded.
+        """
+        formulas = []
+        count = 0
+        for column, row, value in entries:
+            if type(value) is int or type(value) is float:
+                self._cells.put_number(column, row, value)
+            else:
+                self._cells.put(Cell((column, row), value))
+                if self._is_formula(value):
+                    formulas.append((f"{column}{row}", value))
+            count += 1
+
+        references = {}
+        for cell_name, content in formulas:
+            try:
+                content.compile(self, cell_name)
+            except Exception:
+                # Broken formula: its error surfaces when it is evaluated, as after an edit
+                continue
+            references[cell_name] = content._references
+        unresolved = self.dep_manager.build_dependencies(references)
+        for cell_name, content in formulas:
+            content._dependencies_registered = cell_name in references and cell_name not in unresolved
+            self._dirty.add(cell_name)
+        return count
+
+    @staticmethod
+    def _is_formula(content) -> bool:
+        from content.formula_content import FormulaContent
+        return isinstance(content, FormulaContent)
+
+    def _store_cell(self, cell: Cell) -> None:
+        """Index a cell by its coordinate and its content, without invalidation."""
+        self._cells.put(cell)
+
+    def _store_cells(self, cells: List[Cell]) -> List[Optional[Cell]]:
+        """Index many cells at once, without invalidation; returns the cells they replaced."""
+        return self._cells.put_many(cells)
+
     def _remove_cell_at_coords(self, coords: Coordinate):
         """Remove existing cell at coordinates."""
-        for i, cell in enumerate(self.cells):
-            if cell.coordinate == coords:
-                self.cells.pop(i)
-                return
+        self._cells.remove(coords.column, coords.row)
+
+    def _restore_cell(self, coords: Coordinate, previous: Optional[Cell]) -> None:
+        """Put back the cell that was at coords before a failed edit (None leaves it empty)."""
+        self._put_back_cell(coords, previous)
+        self._invalidate_dependent_formulas(f"{coords.column}{coords.row}")
+
+    def _put_back_cell(self, coords: Coordinate, previous: Optional[Cell]) -> None:
+        """_restore_cell without the invalidation, for callers restoring many cells at once."""
+        cell_name = f"{coords.column}{coords.row}"
+        self._remove_cell_at_coords(coords)
+        self.dep_manager.remove_dependencies(cell_name)
+        if previous is not None:
+            self._store_cell(previous)
+            content = previous.content
+            if self._is_formula(content) and content._references is not None:
+                referenced_cells, referenced_ranges = content._references
+                self.dep_manager.update_dependencies(cell_name, referenced_cells, referenced_ranges)
+
+    def _get_cell_by_name(self, cell_name: str) -> Optional[Cell]:
+        match = re.fullmatch(r"([A-Z]+)(\d+)", cell_name)
+        if not match:
+            return None
+        return self._cells.get(match.group(1), int(match.group(2)))
 
     def _invalidate_dependent_formulas(self, changed_cell_name: str):
         """
-        Find all formulas that reference the changed cell and invalidate their computed values.
-        This forces them to recalculate when next accessed.
-        """        
-        # Get all cells that depend on the changed cell
-        dependent_cells = []
-        for cell_name, dependencies in self.dep_manager.dependency_graph.items():
-            if changed_cell_name in dependencies:
-                dependent_cells.append(cell_name)
-        
-        # Invalidate all dependent formulas 
-        visited = set()
-        to_invalidate = dependent_cells[:]
-        
-        while to_invalidate:
-            cell_name = to_invalidate.pop(0)
-            if cell_name in visited:
-                continue
-                
-            visited.add(cell_name)
-            
-            # Find the actual cell using LIST iteration
-            for cell in self.cells:
-                current_cell_name = f"{cell.coordinate.column}{cell.coordinate.row}"
-                if current_cell_name == cell_name:
-                    if hasattr(cell.content, '_computed_value'):
-                        cell.content._computed_value = None
-
-                    for other_cell, other_deps in self.dep_manager.dependency_graph.items():
-                        if cell_name in other_deps and other_cell not in visited:
-                            to_invalidate.append(other_cell)
-                    break
+        Invalidate the computed value of every formula that depends on the
+        changed cell, forcing them to recalculate when next accessed.
+        Only the affected cells are visited, via the reverse dependents index.
+        """
+        self._invalidate_dependents_of((changed_cell_name,))
+
+    def _invalidate_dependents_of(self, changed_cell_names: Iterable[str]) -> None:
+        """Invalidate the dependents of several changed cells with one graph traversal."""
+        for cell_name in self.dep_manager.get_transitive_dependents_of(changed_cell_names):
+            cell = self._get_cell_by_name(cell_name)
+            if cell is not None and hasattr(cell.content, '_computed_value'):
+                if self.calculation_mode != Spreadsheet.MANUAL:
+                    cell.content._computed_value = None
+                self._dirty.add(cell_name)
+
+    def recalculate(self, cell_names: Optional[Iterable[str]] = None) -> int:
+        """
+        Compute formulas in topological order with the recalculation engine:
+        the given cells (and the precedents they need), or every dirty formula.
+        Returns the number of formulas evaluated.
+        """
+        if cell_names is None:
+            # Full pass: drop stale values (kept in manual mode) and evaluate
+            # everything; a failing formula just stays without a value
+            cell_names, self._dirty = self._dirty, set()
+            for cell_name in cell_names:
+                cell = self._get_cell_by_name(cell_name)
+                if cell is not None and self._is_formula(cell.content):
+                    cell.content.invalidate_value()
+            engine = self.parallel_engine or self.recalc_engine
+            return len(engine.recalculate(cell_names, stop_on_error=False))
+
+        evaluated = self.recalc_engine.recalculate(cell_names)
+        self._dirty.difference_update(evaluated)
+        return len(evaluated)
+
+    def ensure_calculated(self) -> None:
+        """Before a read: in deferred mode, flush every pending recalculation at once."""
+        if self.calculation_mode == Spreadsheet.DEFERRED and self._dirty:
+            self.recalculate()
 
     def set_cell_content(self, coords: Coordinate, content):
         """Convenience method to set cell content"""
         from spreadsheet.cell import Cell
         
-        cell = Cell(coords, content)
+        cell = Cell((coords.column, coords.row), content)
         self.add_cell(coords, cell)
 
     def print_spreadsheet(self) -> None:
         """Print the spreadsheet in a formatted table view."""
-        if not self.cells:
+        self.ensure_calculated()
+        cells = self._cells
+        if not cells:
             print("(empty spreadsheet)")
             return
 
-        # Get all cell coordinates
-        coords = [cell.coordinate for cell in self.cells]
-        
-        if not coords:
-            print("(empty spreadsheet)")
-            return
+        # Bounds and occupied columns (in spreadsheet order: A, B, ..., Z, AA, AB, ...) are kept by the store.
+        # A sheet paged from a file shows only the rows read so far: printing must not read it all
+        min_row, max_row, _, _ = cells.bounds()
+        col_numbers = list(cells.resident_columns())
+        columns = [number_to_column(col_num) for col_num in col_numbers]
+        rows = list(cells.resident_rows(min_row, max_row))
 
-        # Find bounds
-        min_row = min(coord.row for coord in coords)
-        max_row = max(coord.row for coord in coords)
-        
-        # Get all unique columns and sort them in SPREADSHEET ORDER (A, B, ..., Z, AA, AB, ...)
-        columns = list(set(coord.column for coord in coords))
-        
-        def column_sort_key(col):
-            """Convert column to sortable number: A=1, B=2, ..., Z=26, AA=27, AB=28, etc."""
-            result = 0
-            for char in col:
-                result = result * 26 + (ord(char) - ord('A') + 1)
-            return result
-        
-        columns.sort(key=column_sort_key)  # Now A, B, C, ..., Z, AA, AB, etc.
-        
-        # Calculate column widths
-        col_widths = {}
-        for col in columns:
-            max_width = len(col)  # Header width
-            for row in range(min_row, max_row + 1):
-                coord = Coordinate(col, row)
-                cell = self.get_cell(coord)
+        def cell_text(cell) -> str:
+            try:
+                if hasattr(cell.content, 'get_value'):
+                    if hasattr(cell.content, 'formula'):  # Formula content needs spreadsheet
+                        return str(cell.content.get_value(self))
+                    return str(cell.content.get_value())
+                return str(cell.content)
+            except Exception as e:
+                return "ERROR"
+
+        # Contents of the printed rows, and column widths from them
+        contents = {}
+        col_widths = {col: max(len(col), 3) for col in columns}  # Minimum width of 3
+        for row in rows:
+            for col in columns:
+                cell = self.get_cell(Coordinate(col, row))
                 if cell:
-                    try:
-                        if hasattr(cell.content, 'get_value'):
-                            if hasattr(cell.content, 'formula'):  # Formula content needs spreadsheet
-                                content_str = str(cell.content.get_value(self))
-                            else:
-                                content_str = str(cell.content.get_value())
-                        else:
-                            content_str = str(cell.content)
-                    except Exception as e:
-                        content_str = "ERROR"
-                    
-                    max_width = max(max_width, len(content_str))
-            col_widths[col] = max(max_width, 3)  # Minimum width of 3
-        
-        # Rest of the method stays the same...
+                    content = contents[(col, row)] = cell_text(cell)
+                    col_widths[col] = max(col_widths[col], len(content))
+
         # Print header
         print("   ", end="")
         for col in columns:
@@ -158,29 +339,15 @@ class Spreadsheet:
         print("┐")
         
         # Print rows
-        for row in range(min_row, max_row + 1):
+        for index, row in enumerate(rows):
             print(f"{row:2}│", end="")
             for col in columns:
-                coord = Coordinate(col, row)
-                cell = self.get_cell(coord)
-                if cell:
-                    try:
-                        if hasattr(cell.content, 'get_value'):
-                            if hasattr(cell.content, 'formula'):  # Formula content needs spreadsheet
-                                content = str(cell.content.get_value(self))
-                            else:
-                                content = str(cell.content.get_value())
-                        else:
-                            content = str(cell.content)
-                    except Exception as e:
-                        content = "ERROR"
-                else:
-                    content = ""
+                content = contents.get((col, row), "")
                 print(f" {content:^{col_widths[col]}} │", end="")
             print()
             
             # Print row separator (except for last row)
-            if row < max_row:
+            if index < len(rows) - 1:
                 print("  ├", end="")
                 for i, col in enumerate(columns):
                     print("─" * (col_widths[col] + 2), end="")
@@ -194,4 +361,6 @@ class Spreadsheet:
             print("─" * (col_widths[col] + 2), end="")
             if i < len(columns) - 1:
                 print("┴", end="")
-        print("┘")
\ No newline at end of file
+        print("┘")
+        if len(rows) < max_row - min_row + 1:
+            print(f"({max_row - min_row + 1 - len(rows)} rows of the file not read yet are left out)")
@@ -1,12 +1,17 @@
 from ui.terminal_ui import TerminalUI
 import os
 import re
+from typing import Optional
 
 from content.numerical_content import NumericContent
 from content.text_content import TextContent
 from content.formula_content import FormulaContent
+from fileio.compressed_file import COMPRESSED_EXTENSIONS
+from fileio.edit_journal import EditJournal
 from fileio.load_file import LoadFile
+from fileio.mapped_file import MappedSheetFile
 from fileio.save_file import SaveFile
+from fileio.snapshot_file import SnapshotFile
 from spreadsheet.spreadsheet import Spreadsheet
 from spreadsheet.cell import Cell
 from spreadsheet.coordinate import Coordinate
@@ -24,6 +29,15 @@ from exceptions import (
 )
 
 class SpreadsheetController:
+    # Errors that reject an edit (the previous cell is kept)
+    EDIT_ERRORS = (
+        CircularDependencyException,
+        InvalidPostfixException,
+        EvaluationErrorException,
+        SyntaxErrorException,
+        RecursionError
+    )
+
     def __init__(self, spreadsheet: Spreadsheet):
         self.UI = TerminalUI()
         self.spreadsheet: Spreadsheet = spreadsheet
@@ -51,9 +65,20 @@ class SpreadsheetController:
                 print("Invalid command format. Use E <cell coordinate> <new cell content>")
         elif command.startswith("L"):
             self.load_spreadsheet(command.split(maxsplit=1)[1])
+        elif command.startswith("O"):
+            self.open_spreadsheet(command.split(maxsplit=1)[1])
         elif command.startswith("S"):
             self.save_spreadsheet(self.spreadsheet)
+        elif command == "R":
+            self.recalculate_spreadsheet()
+        elif command.startswith("M"):
+            parts = command.split(maxsplit=1)
+            if len(parts) == 2:
+                self.set_calculation_mode(parts[1].strip().lower())
+            else:
+                print("Invalid command format. Use M <automatic|deferred|manual>")
         elif command == "X":
+            self._close_journal()
             print("Exiting program.")
             return False  # Signal to exit
         else:
@@ -64,47 +89,111 @@ class SpreadsheetController:
     def load_spreadsheet(self, file_path: str):
         try:
             self.loader.validate_file_format(file_path)
-            raw_data = self.loader.load_spreadsheet_data(file_path)
 
-            new_sheet = Spreadsheet()
-            def num_to_col(num: int) -> str:
-                col = ''
-                while num > 0:
-                    num, rem = divmod(num - 1, 26)
-                    col = chr(rem + ord('A')) + col
-                return col
-
-            for row_idx, row_values in enumerate(raw_data, start=1):
-                for col_idx, cell_text in enumerate(row_values):
-                    text = cell_text.strip().rstrip(';')
-                    if not text:
-                        continue
-                    col_letter = num_to_col(col_idx + 1)
-                    coord = Coordinate(col_letter, row_idx)
-                    if text.startswith('='):
-                        content_obj = FormulaContent(text)
-                    elif re.fullmatch(r"\d+\.\d+", text):
-                        content_obj = NumericContent(float(text))
-                    elif re.fullmatch(r"\d+", text):
-                        content_obj = NumericContent(int(text))
-                    else:
-                        content_obj = TextContent(text)
-                    new_sheet.add_cell(coord, Cell((col_letter, row_idx), content_obj))
+            if file_path.lower().endswith('.s2b'):
+                # Binary snapshot: cells, compiled programs and graph, no parsing
+                new_sheet = SnapshotFile().load(file_path)
+            else:
+                # Stream the file straight into a fresh sheet: rows are read lazily
+                # and cells inserted in bulk, the dependency graph is built once
+                new_sheet = Spreadsheet()
+                new_sheet.load_cells(
+                    (column, row, self._classify_loaded_text(text))
+                    for column, row, text in self.loader.iter_cell_texts(file_path)
+                )
+                self._attach_journal(new_sheet, file_path)
+            new_sheet.set_calculation_mode(self.spreadsheet.calculation_mode)
 
+            self._close_journal()
             self.spreadsheet = new_sheet
             self.spreadsheet.print_spreadsheet()
             print("Spreadsheet loaded.")
-        except (InvalidFilePathException, InvalidFileNameException, FileNotFoundException) as e:
+        except (InvalidFilePathException, InvalidFileNameException, FileNotFoundException) + self.EDIT_ERRORS as e:
+            # A hand-edited or corrupted file is reported, like a bad edit, and the sheet kept
+            print(f"Error: {e}")
+
+    def open_spreadsheet(self, file_path: str):
+        """
+        Open a (large) file without loading it: the file is memory-mapped
+        and its rows become cells only as edits, reads and ranges touch them.
+        """
+        if file_path.lower().endswith(COMPRESSED_EXTENSIONS):
+            # A compressed file has no row offsets to map: stream it in instead
+            self.load_spreadsheet(file_path)
+            return
+        try:
+            self.loader.validate_file_format(file_path)
+            new_sheet = Spreadsheet()
+            new_sheet.set_calculation_mode(self.spreadsheet.calculation_mode)
+            source = MappedSheetFile(file_path)
+            try:
+                new_sheet.page_from(source, self._classify_loaded_text)
+                self._attach_journal(new_sheet, file_path, mapped=source)
+            except Exception:
+                source.close()
+                raise
+            self._close_journal()
+            self.spreadsheet = new_sheet
+            print("Spreadsheet opened; rows are read as they are used.")
+        except (InvalidFilePathException, InvalidFileNameException, FileNotFoundException) + self.EDIT_ERRORS as e:
             print(f"Error: {e}")
 
+    @staticmethod
+    def _classify_loaded_text(text: str):
+        """
+        Content of a loaded cell; plain numbers stay raw so the store keeps them
+        unboxed. isdecimal() accepts exactly what the regex \\d+ matches.
+        """
+        if text.startswith('='):
+            return FormulaContent(text)
+        elif text.isdecimal():
+            return int(text)
+        integer, point, fraction = text.partition('.')
+        if point and integer.isdecimal() and fraction.isdecimal():
+            return float(text)
+        return TextContent(text)
+
+    def _attach_journal(self, sheet: Spreadsheet, file_path: str, truncate: bool = False,
+                        mapped: Optional[MappedSheetFile] = None):
+        """
+        Journal the edits of a sheet backed by a .s2v file, replaying the
+        edits journaled since the file was last written first (none with
+        truncate, for a file just saved). mapped is the file a paged sheet
+        reads its rows from, reopened when a compaction replaces it.
+        """
+        if not file_path.lower().endswith('.s2v'):
+            return
+        journal = EditJournal(file_path, truncate=truncate, mapped=mapped)
+        try:
+            journal.replay(sheet, self._parse_content)
+        except Exception:
+            journal.close()
+            raise
+        sheet.journal = journal
+
+    def _close_journal(self):
+        if self.spreadsheet.journal is not None:
+            self.spreadsheet.journal.close()
+            self.spreadsheet.journal = None
+
     def save_spreadsheet(self, spreadsheet: Spreadsheet):
         try:
-            self.saver.run_saver(spreadsheet)
+            if spreadsheet.journal is not None:
+                # A compaction must not swap its base file in over this save
+                spreadsheet.journal.wait()
+            file_path = self.saver.run_saver(spreadsheet)
+            if file_path.lower().endswith('.s2v'):
+                # The new file holds every edit: journal from it, starting empty
+                self._close_journal()
+                self._attach_journal(spreadsheet, file_path, truncate=True)
         except (InvalidFileNameException, InvalidFilePathException, FileNotFoundException) as e:
             print(f"Error: {e}")
 
     def create_new_spreadsheet(self):
+        mode = self.spreadsheet.calculation_mode
+        self._close_journal()
         self.spreadsheet = Spreadsheet()
+        self.spreadsheet.set_calculation_mode(mode)
         self.spreadsheet.print_spreadsheet()
         print("New spreadsheet created.")
 
@@ -113,61 +202,91 @@ class SpreadsheetController:
             column, row_num = self.parse_coordinate(cell_coord)
             coord = Coordinate(column, row_num)
 
-            # Build the new content object
-            if cell_content.startswith('='):
-                content_obj = FormulaContent(cell_content)
-            elif re.fullmatch(r"\d+\.\d+", cell_content):
-                content_obj = NumericContent(float(cell_content))
-            elif re.fullmatch(r"\d+", cell_content):
-                content_obj = NumericContent(int(cell_content))
-            else:
-                content_obj = TextContent(cell_content)
-
-            # Get previous cell using the new List structure
-            prev_cell = self.spreadsheet.get_cell(coord)  
-
-            # Create new cell
-            new_cell = Cell((column, row_num), content_obj)
-            
-            # Temporarily add the new cell to test for errors
-            self.spreadsheet.add_cell(coord, new_cell)
-
-            # Try to evaluate the cell content to check for errors
+            # Apply the edit as a one-cell transaction: it is checked (and, in
+            # automatic mode, evaluated) on commit, and a failing commit puts
+            # the previous cell back. Outside automatic mode only syntax and
+            # cycles are checked; evaluation and redraw wait for the next read
+            # or recalc command
             try:
-                if isinstance(content_obj, FormulaContent):
-                    new_cell.content.get_value(self.spreadsheet)
-                
-                self.spreadsheet.print_spreadsheet()
-                
-            except (
-                CircularDependencyException,
-                InvalidPostfixException,
-                EvaluationErrorException,
-                SyntaxErrorException,
-                RecursionError
-            ) as e:
-                # Roll back using the new List structure
-                if prev_cell is not None:
-                    # Remove the new cell and restore the previous one
-                    self.spreadsheet._remove_cell_at_coords(coord)
-                    self.spreadsheet.cells.append(prev_cell)
-                else:
-                    # Just remove the new cell
-                    self.spreadsheet._remove_cell_at_coords(coord)
+                with self.spreadsheet.transaction() as transaction:
+                    transaction.set_cell(coord, Cell((column, row_num), self._parse_content(cell_content)))
+
+                if self.spreadsheet.calculation_mode == Spreadsheet.AUTOMATIC:
+                    self.spreadsheet.print_spreadsheet()
 
+            except self.EDIT_ERRORS as e:
                 print(f"Error: {e}")
                 self.spreadsheet.print_spreadsheet()
 
         except InvalidCellReferenceException as e:
             print(f"Error: {e}")
 
+    def edit_cells(self, edits: list[tuple[str, str]]):
+        """
+        Apply a run of (coordinate, content) edits in one transaction: one
+        cycle check, one invalidation, one recalculation and one redraw. If
+        the batch fails as a whole, the edits are replayed one at a time so
+        each bad one is reported and rolled back on its own.
+        """
+        if len(edits) < 2:
+            for cell_coord, cell_content in edits:
+                self.edit_cell(cell_coord, cell_content)
+            return
+        try:
+            with self.spreadsheet.transaction() as transaction:
+                for cell_coord, cell_content in edits:
+                    column, row_num = self.parse_coordinate(cell_coord)
+                    transaction.set_cell(Coordinate(column, row_num),
+                                         Cell((column, row_num), self._parse_content(cell_content)))
+        except self.EDIT_ERRORS + (InvalidCellReferenceException,):
+            for cell_coord, cell_content in edits:
+                self.edit_cell(cell_coord, cell_content)
+            return
+        if self.spreadsheet.calculation_mode == Spreadsheet.AUTOMATIC:
+            self.spreadsheet.print_spreadsheet()
+
+    @staticmethod
+    def _parse_content(cell_content: str):
+        if cell_content.startswith('='):
+            return FormulaContent(cell_content)
+        elif re.fullmatch(r"\d+\.\d+", cell_content):
+            return NumericContent(float(cell_content))
+        elif re.fullmatch(r"\d+", cell_content):
+            return NumericContent(int(cell_content))
+        return TextContent(cell_content)
+
+    def recalculate_spreadsheet(self):
+        evaluated = self.spreadsheet.recalculate()
+        self.spreadsheet.print_spreadsheet()
+        print(f"Recalculated {evaluated} formula(s).")
+
+    def set_calculation_mode(self, mode: str):
+        try:
+            self.spreadsheet.set_calculation_mode(mode)
+            print(f"Calculation mode: {mode}")
+        except ValueError as e:
+            print(f"Error: {e}")
 
     def read_commands_from_file(self, file_path: str):
         try:
             with open(file_path, 'r') as cmd_file:
+                # Consecutive edits are applied together as one transaction
+                edits = []
                 for cmd_line in cmd_file:
                     cmd = cmd_line.strip()
-                    self.execute_command(cmd[:2].upper() + cmd[2:])
+                    cmd = cmd[:2].upper() + cmd[2:]
+                    parts = cmd.split(maxsplit=2)
+                    if cmd.startswith("E") and len(parts) == 3:
+                        edits.append((parts[1].upper(), parts[2]))
+                        continue
+                    self.edit_cells(edits)
+                    edits = []
+                    self.execute_command(cmd)
+                self.edit_cells(edits)
+            # Deferred mode: the edits above only marked formulas dirty, this
+            # first read recalculates them all in a single pass
+            if self.spreadsheet.calculation_mode == Spreadsheet.DEFERRED:
+                self.spreadsheet.print_spreadsheet()
         except FileNotFoundError:
             print(f"Error: File not found: {file_path}")
 
@@ -182,8 +301,14 @@ class SpreadsheetController:
                 print("Invalid command format. Use E <cell coordinate> <new cell content>")
         elif cmd.startswith("L"):
             self.load_spreadsheet(cmd.split(maxsplit=1)[1])
+        elif cmd.startswith("O"):
+            self.open_spreadsheet(cmd.split(maxsplit=1)[1])
         elif cmd.startswith("S"):
             self.save_spreadsheet(self.spreadsheet)
+        elif cmd == "R":
+            self.recalculate_spreadsheet()
+        elif cmd.startswith("M") and len(cmd.split(maxsplit=1)) == 2:
+            self.set_calculation_mode(cmd.split(maxsplit=1)[1].strip().lower())
         else:
             print("Invalid command in file. Skipping.")
 
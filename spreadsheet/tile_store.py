@@ -0,0 +1,756 @@
+import math
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from content.number import Number, NumberValue, checked_number
+from content.numerical_content import NumericContent
+from content.text_content import TextContent
+from spreadsheet.aggregate_index import ColumnAggregateTree, EMPTY_SUMMARY, Summary, combine, exact_partials
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import column_to_number, number_to_column
+from spreadsheet.row_index import RowIndex
+
+# Tiles are TILE_COLS x TILE_ROWS blocks of the sheet (4096 slots). They are
+# narrow and tall because real sheets are a few columns wide and many rows
+# deep; slots are column-major so a run of rows in one column is contiguous.
+TILE_COL_SHIFT = 3
+TILE_ROW_SHIFT = 9
+TILE_COLS = 1 << TILE_COL_SHIFT
+TILE_ROWS = 1 << TILE_ROW_SHIFT
+TILE_COL_MASK = TILE_COLS - 1
+TILE_ROW_MASK = TILE_ROWS - 1
+TILE_SLOTS = TILE_COLS * TILE_ROWS
+
+# Per-slot type tags
+TAG_EMPTY = 0
+TAG_INT = 1
+TAG_FLOAT = 2
+TAG_OBJECT = 3
+TAG_TEXT = 4
+
+# Largest integer a double holds exactly
+_MAX_EXACT_INT = 2 ** 53
+
+# bytes.translate table: 1 for unboxed numeric tags, 0 otherwise
+_NUMERIC_TAGS = bytes(1 if tag in (TAG_INT, TAG_FLOAT) else 0 for tag in range(256))
+
+# Ranges at least this tall are answered from the per-column aggregate trees
+INDEXED_MIN_ROWS = 2 * TILE_ROWS
+
+# Rows are stored in 64-bit row indexes
+MAX_ROW = 2 ** 63 - 1
+
+# The occupied columns of each row are kept in blocks of this many rows, only
+# for blocks holding an occupied row
+_ROW_COLUMNS_SHIFT = 12
+_ROW_COLUMNS_MASK = (1 << _ROW_COLUMNS_SHIFT) - 1
+
+
+class _StoredNumber(Number):
+    """Number of a materialized unboxed cell: setting its value writes it back to the store."""
+    __slots__ = ("_store", "_column", "_row")
+
+    def __init__(self, value: NumberValue, store: "TiledCellStore", column: str, row: int) -> None:
+        self._value = value
+        self._store = store
+        self._column = column
+        self._row = row
+
+    def _set_value(self, value: NumberValue) -> None:
+        old, self._value = self._value, checked_number(value)
+        self._store._write_back(self._column, self._row, old, self._value)
+
+    value = property(Number.value.fget, _set_value)
+
+
+class Tile:
+    """
+    One TILE_COLS x TILE_ROWS block: numeric values live unboxed in an
+    array('d') buffer, plain text as the str itself and anything else
+    (formulas, boxed numbers) as Cell objects, both sparse in objects.
+    """
+
+    __slots__ = ("tags", "values", "objects", "count")
+
+    def __init__(self) -> None:
+        self.tags = bytearray(TILE_SLOTS)
+        self.values: Optional[array] = None  # allocated on first numeric value
+        self.objects: Dict[int, Any] = {}  # slot -> str (TAG_TEXT) or Cell (TAG_OBJECT)
+        self.count = 0
+
+
+class TiledCellStore:
+    """
+    Cell storage engine behind Spreadsheet.
+
+    Numeric cells are kept as raw doubles plus a type tag and text cells as
+    their str; they are only turned into Cell -> Coordinate -> NumericContent
+    (or TextContent) chains when somebody asks for them, and value() reads
+    them without that. A text cell looked up with get() is boxed from then
+    on, so the caller gets the same Cell every time and edits to it stick;
+    iteration hands out throwaway Cells for the texts still unboxed. Numbers
+    come back as fresh views whose Number writes back to the store. Formula
+    cells stay as sparse Cell objects inside their tile.
+    Every column also keeps a sorted index of its occupied rows, so ranges
+    visit only occupied cells and skip empty columns and stretches. The used
+    range (occupied rows and columns, and the rightmost column of each row)
+    is maintained along with them, so bounds() and friends are O(1).
+    """
+
+    def __init__(self) -> None:
+        self._tiles: Dict[Tuple[int, int], Tile] = {}
+        # Back-pointer for object cells: id(content) -> (column, row)
+        self._content_index: Dict[int, Tuple[str, int]] = {}
+        self._count = 0
+        # Aggregate trees of the columns tall ranges were queried on: col_num -> tree
+        self._column_trees: Dict[int, ColumnAggregateTree] = {}
+        # Occupied rows of every non-empty column: col_num -> RowIndex
+        self._column_rows: Dict[int, RowIndex] = {}
+        # Used range: the non-empty columns and rows, and each row's occupied
+        # columns as a bitmask (bit col_num - 1; 0 = empty row, bit_length() =
+        # rightmost column), by block: row >> _ROW_COLUMNS_SHIFT -> [occupied rows, [mask per row]]
+        self._used_columns = RowIndex()
+        self._used_rows = RowIndex()
+        self._row_columns: Dict[int, list] = {}
+
+    # ------------------------------------------------------------------ helpers
+    @staticmethod
+    def _locate(col_num: int, row: int) -> Tuple[Tuple[int, int], int]:
+        c, r = col_num - 1, row - 1
+        return (c >> TILE_COL_SHIFT, r >> TILE_ROW_SHIFT), ((c & TILE_COL_MASK) << TILE_ROW_SHIFT) | (r & TILE_ROW_MASK)
+
+    @staticmethod
+    def _check_row(row: int) -> None:
+        """Reject a row the row indexes can't hold, before anything is stored."""
+        if not 0 < row <= MAX_ROW:
+            raise ValueError(f"Row out of range: {row}")
+
+    @staticmethod
+    def _unboxed_number(cell: Cell):
+        """Return the raw number of a plain numeric cell, or None if it must stay boxed."""
+        content = cell.content
+        if type(content) is not NumericContent:
+            return None
+        value = content.get_number()
+        if type(value) is float:
+            return value
+        if type(value) is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+            return value
+        return None
+
+    def _index_row(self, col_num: int, row: int) -> None:
+        """Record a newly occupied (col_num, row) in the row indexes and the used range."""
+        rows = self._column_rows.get(col_num)
+        if rows is None:
+            rows = self._column_rows[col_num] = RowIndex()
+            self._used_columns.add(col_num)
+        rows.add(row)
+        self._add_row_column(row, col_num)
+
+    def _add_row_column(self, row: int, col_num: int) -> None:
+        """Set col_num's bit in the row's column mask."""
+        block = self._row_columns.get(row >> _ROW_COLUMNS_SHIFT)
+        if block is None:
+            block = self._row_columns[row >> _ROW_COLUMNS_SHIFT] = [0, [0] * (1 << _ROW_COLUMNS_SHIFT)]
+        masks, i = block[1], row & _ROW_COLUMNS_MASK
+        if not masks[i]:
+            block[0] += 1
+            self._used_rows.add(row)
+        masks[i] |= 1 << (col_num - 1)
+
+    def _index_rows(self, col_num: int, rows: Iterable[int]) -> None:
+        """_index_row for many rows of one column (bulk inserts)."""
+        rows = list(rows)
+        if not rows:
+            return
+        index = self._column_rows.get(col_num)
+        if index is None:
+            self._column_rows[col_num] = RowIndex(rows)
+            self._used_columns.add(col_num)
+        else:
+            index.update(rows)
+        for row in rows:
+            self._add_row_column(row, col_num)
+
+    def _unindex_row(self, col_num: int, row: int) -> None:
+        rows = self._column_rows[col_num]
+        rows.discard(row)
+        if not rows:
+            del self._column_rows[col_num]
+            self._used_columns.discard(col_num)
+        # Clearing the bit leaves the next rightmost column in place: no other column is visited
+        block = self._row_columns[row >> _ROW_COLUMNS_SHIFT]
+        masks, i = block[1], row & _ROW_COLUMNS_MASK
+        masks[i] &= ~(1 << (col_num - 1))
+        if not masks[i]:
+            self._used_rows.discard(row)
+            block[0] -= 1
+            if not block[0]:
+                del self._row_columns[row >> _ROW_COLUMNS_SHIFT]
+
+    def _columns_within(self, col_lo: int, col_hi: int) -> Iterable[int]:
+        """Non-empty columns in [col_lo, col_hi], ascending, without visiting the empty ones."""
+        return self._used_columns.irange(col_lo, col_hi)
+
+    @staticmethod
+    def _object_cell(tile_col: int, tile_row: int, slot: int, entry) -> Cell:
+        """The Cell of an objects entry: stored as is, or built around an unboxed text."""
+        if type(entry) is not str:
+            return entry
+        column = number_to_column((tile_col << TILE_COL_SHIFT) + (slot >> TILE_ROW_SHIFT) + 1)
+        return Cell((column, (tile_row << TILE_ROW_SHIFT) + (slot & TILE_ROW_MASK) + 1), TextContent(entry))
+
+    def _materialize(self, tile: Tile, slot: int, column: str, row: int) -> Optional[Cell]:
+        tag = tile.tags[slot]
+        if tag == TAG_EMPTY:
+            return None
+        if tag == TAG_OBJECT:
+            return tile.objects[slot]
+        if tag == TAG_TEXT:
+            return Cell((column, row), TextContent(tile.objects[slot]))
+        value = tile.values[slot]
+        return Cell((column, row), NumericContent(_StoredNumber(int(value) if tag == TAG_INT else value, self, column, row)))
+
+    def _write_back(self, column: str, row: int, old: NumberValue, new: NumberValue) -> None:
+        """
+        A materialized number was set to new: store it, unless the cell has
+        been replaced since (it no longer holds the number old), as setting
+        the content of a replaced cell never changed the sheet.
+        """
+        tile_key, slot = self._locate(column_to_number(column), row)
+        tile = self._tiles.get(tile_key)
+        if tile is not None and tile.tags[slot] in (TAG_INT, TAG_FLOAT) and tile.values[slot] == old:
+            self.put_number(column, row, new)
+
+    # ---------------------------------------------------------------- public API
+    def get(self, column: str, row: int) -> Optional[Cell]:
+        tile_key, slot = self._locate(column_to_number(column), row)
+        tile = self._tiles.get(tile_key)
+        if tile is None:
+            return None
+        if tile.tags[slot] == TAG_TEXT:
+            # Boxed for good: the caller may hold on to the cell or edit it
+            cell = Cell((column, row), TextContent(tile.objects[slot]))
+            tile.objects[slot] = cell
+            tile.tags[slot] = TAG_OBJECT
+            self._content_index[id(cell.content)] = (column, row)
+            return cell
+        return self._materialize(tile, slot, column, row)
+
+    def value(self, column: str, row: int, spreadsheet=None, default=None) -> Any:
+        """
+        Value of the cell at (column, row) without materializing it: the raw
+        number or text of an unboxed cell, else the stored cell's
+        get_value(spreadsheet); default for an empty slot or a cell without content.
+        """
+        tile_key, slot = self._locate(column_to_number(column), row)
+        tile = self._tiles.get(tile_key)
+        if tile is None:
+            return default
+        tag = tile.tags[slot]
+        if tag == TAG_FLOAT:
+            return tile.values[slot]
+        if tag == TAG_INT:
+            return int(tile.values[slot])
+        if tag == TAG_TEXT:
+            return tile.objects[slot]
+        if tag == TAG_EMPTY:
+            return default
+        cell = tile.objects[slot]
+        return default if cell.content is None else cell.get_value(spreadsheet)
+
+    def contains(self, column: str, row: int) -> bool:
+        """Whether (column, row) holds a cell, without materializing it."""
+        tile_key, slot = self._locate(column_to_number(column), row)
+        tile = self._tiles.get(tile_key)
+        return tile is not None and tile.tags[slot] != TAG_EMPTY
+
+    def put(self, cell: Cell) -> None:
+        """Store a cell, replacing whatever occupied its coordinate."""
+        self._put(cell)
+        self._refresh_aggregates(column_to_number(cell.coordinate.column), cell.coordinate.row)
+
+    def put_many(self, cells: Iterable[Cell]) -> List[Optional[Cell]]:
+        """
+        Store several cells; returns the cell each one replaced (or None).
+        Aggregate trees are refreshed once per touched segment, not per cell.
+        """
+        previous = []
+        # One row per touched (column, tile row) segment of an indexed column
+        touched: Dict[Tuple[int, int], int] = {}
+        for cell in cells:
+            previous.append(self._put(cell))
+            col_num, row = column_to_number(cell.coordinate.column), cell.coordinate.row
+            if col_num in self._column_trees:
+                touched[(col_num, (row - 1) >> TILE_ROW_SHIFT)] = row
+        for (col_num, _), row in touched.items():
+            self._refresh_aggregates(col_num, row)
+        return previous
+
+    def _put(self, cell: Cell) -> Optional[Cell]:
+        column, row = cell.coordinate.column, cell.coordinate.row
+        self._check_row(row)
+        col_num = column_to_number(column)
+        previous = self._discard(column, row)
+
+        tile_key, slot = self._locate(col_num, row)
+        tile = self._tiles.get(tile_key)
+        if tile is None:
+            tile = self._tiles[tile_key] = Tile()
+
+        number = self._unboxed_number(cell)
+        if number is not None:
+            if tile.values is None:
+                tile.values = array('d', bytes(8 * TILE_SLOTS))
+            tile.values[slot] = number
+            tile.tags[slot] = TAG_FLOAT if type(number) is float else TAG_INT
+        elif type(cell.content) is TextContent:
+            tile.objects[slot] = cell.content.text
+            tile.tags[slot] = TAG_TEXT
+        else:
+            tile.objects[slot] = cell
+            tile.tags[slot] = TAG_OBJECT
+            if cell.content is not None:
+                self._content_index[id(cell.content)] = (column, row)
+        tile.count += 1
+        self._count += 1
+        self._index_row(col_num, row)
+        return previous
+
+    def put_number(self, column: str, row: int, number) -> None:
+        """Store a plain number without building its Cell (boxed if a double can't hold it)."""
+        if type(number) is int and not -_MAX_EXACT_INT <= number <= _MAX_EXACT_INT:
+            self.put(Cell((column, row), NumericContent(number)))
+            return
+        self._check_row(row)
+        col_num = column_to_number(column)
+        tile_key, slot = self._locate(col_num, row)
+        tile = self._tiles.get(tile_key)
+        if tile is not None and tile.tags[slot] != TAG_EMPTY:
+            self._discard(column, row)
+            tile = self._tiles.get(tile_key)
+        if tile is None:
+            tile = self._tiles[tile_key] = Tile()
+        if tile.values is None:
+            tile.values = array('d', bytes(8 * TILE_SLOTS))
+        tile.values[slot] = number
+        tile.tags[slot] = TAG_INT if type(number) is int else TAG_FLOAT
+        tile.count += 1
+        self._count += 1
+        self._index_row(col_num, row)
+        if self._column_trees:
+            self._refresh_aggregates(col_num, row)
+
+    def remove(self, column: str, row: int) -> Optional[Cell]:
+        """Drop the cell at (column, row); returns it materialized, or None."""
+        cell = self._discard(column, row)
+        if cell is not None:
+            self._refresh_aggregates(column_to_number(column), row)
+        return cell
+
+    def _discard(self, column: str, row: int) -> Optional[Cell]:
+        col_num = column_to_number(column)
+        tile_key, slot = self._locate(col_num, row)
+        tile = self._tiles.get(tile_key)
+        if tile is None or tile.tags[slot] == TAG_EMPTY:
+            return None
+        cell = self._materialize(tile, slot, column, row)
+        if tile.tags[slot] == TAG_TEXT:
+            del tile.objects[slot]
+        elif tile.tags[slot] == TAG_OBJECT:
+            del tile.objects[slot]
+            if cell.content is not None:
+                self._content_index.pop(id(cell.content), None)
+        tile.tags[slot] = TAG_EMPTY
+        tile.count -= 1
+        self._count -= 1
+        if tile.count == 0:
+            del self._tiles[tile_key]
+        self._unindex_row(col_num, row)
+        return cell
+
+    def numeric_columns(self) -> Iterator[Tuple[int, array, bytes, array]]:
+        """
+        Every column's unboxed numbers as packed buffers:
+        (col_num, rows array('q'), tags bytes, values array('d')), rows ascending.
+        """
+        by_column: Dict[int, List[Tuple[int, Tile]]] = {}
+        for (tile_col, tile_row), tile in self._tiles.items():
+            if tile.values is not None:
+                by_column.setdefault(tile_col, []).append((tile_row, tile))
+        for tile_col in sorted(by_column):
+            tiles = sorted(by_column[tile_col], key=lambda item: item[0])
+            for local in range(TILE_COLS):
+                base = local << TILE_ROW_SHIFT
+                rows, tags, values = array('q'), bytearray(), array('d')
+                for tile_row, tile in tiles:
+                    segment = tile.tags[base:base + TILE_ROWS]
+                    numeric = segment.translate(_NUMERIC_TAGS)
+                    if not numeric.count(1):
+                        continue
+                    first = (tile_row << TILE_ROW_SHIFT) + 1
+                    rows.extend(compress(range(first, first + TILE_ROWS), numeric))
+                    tags.extend(compress(segment, numeric))
+                    values.extend(compress(tile.values[base:base + TILE_ROWS], numeric))
+                if rows:
+                    yield (tile_col << TILE_COL_SHIFT) + local + 1, rows, bytes(tags), values
+
+    def put_numeric_column(self, col_num: int, rows: array, tags: bytes, values: array) -> None:
+        """
+        Bulk insert of one column as returned by numeric_columns, into slots
+        that must be empty. Runs filling a whole tile segment are copied as slices.
+        """
+        c = col_num - 1
+        base = (c & TILE_COL_MASK) << TILE_ROW_SHIFT
+        start = 0
+        while start < len(rows):
+            tile_row = (rows[start] - 1) >> TILE_ROW_SHIFT
+            end = bisect_left(rows, ((tile_row + 1) << TILE_ROW_SHIFT) + 1, start)
+            tile_key = (c >> TILE_COL_SHIFT, tile_row)
+            tile = self._tiles.get(tile_key)
+            if tile is None:
+                tile = self._tiles[tile_key] = Tile()
+            if tile.values is None:
+                tile.values = array('d', bytes(8 * TILE_SLOTS))
+            if end - start == TILE_ROWS:
+                tile.values[base:base + TILE_ROWS] = values[start:end]
+                tile.tags[base:base + TILE_ROWS] = tags[start:end]
+            else:
+                tile_values, tile_tags = tile.values, tile.tags
+                for i in range(start, end):
+                    slot = base | ((rows[i] - 1) & TILE_ROW_MASK)
+                    tile_values[slot] = values[i]
+                    tile_tags[slot] = tags[i]
+            tile.count += end - start
+            self._count += end - start
+            start = end
+        self._index_rows(col_num, rows)
+        # Rebuilt from the buffers on the next tall range query
+        self._column_trees.pop(col_num, None)
+
+    def iter_rows(self) -> Iterator[Tuple[int, List[Tuple[int, Any]]]]:
+        """
+        Occupied slots row by row, rows ascending and columns ascending within
+        a row, as (row, [(col_num, value)]): value is the raw number or str of
+        an unboxed cell (no Cell built) or the Cell object. One pass over the
+        tiles, a band of TILE_ROWS rows at a time.
+        """
+        bands: Dict[int, List[Tuple[int, Tile]]] = {}
+        for (tile_col, tile_row), tile in self._tiles.items():
+            bands.setdefault(tile_row, []).append((tile_col, tile))
+        for tile_row in sorted(bands):
+            first = (tile_row << TILE_ROW_SHIFT) + 1
+            rows: Dict[int, List[Tuple[int, Any]]] = {}
+            for tile_col, tile in sorted(bands[tile_row], key=lambda item: item[0]):
+                tags, values, objects = tile.tags, tile.values, tile.objects
+                for local in range(TILE_COLS):
+                    base = local << TILE_ROW_SHIFT
+                    segment = tags[base:base + TILE_ROWS]
+                    if segment.count(TAG_EMPTY) == TILE_ROWS:
+                        continue
+                    col_num = (tile_col << TILE_COL_SHIFT) + local + 1
+                    for offset in compress(range(TILE_ROWS), segment):
+                        tag = segment[offset]
+                        if tag == TAG_OBJECT or tag == TAG_TEXT:
+                            value = objects[base + offset]
+                        elif tag == TAG_INT:
+                            value = int(values[base + offset])
+                        else:
+                            value = values[base + offset]
+                        row_cells = rows.get(first + offset)
+                        if row_cells is None:
+                            rows[first + offset] = row_cells = []
+                        row_cells.append((col_num, value))
+            for row in sorted(rows):
+                yield row, rows[row]
+
+    def last_column(self) -> int:
+        """Highest occupied column number (0 when empty)."""
+        return self._used_columns.last()
+
+    def bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        """Used range as (first row, last row, first column, last column), or None when empty."""
+        if not self._count:
+            return None
+        return (self._used_rows.first(), self._used_rows.last(),
+                self._used_columns.first(), self._used_columns.last())
+
+    def used_columns(self) -> Iterator[int]:
+        """Numbers of the columns holding at least one cell, ascending."""
+        return iter(self._used_columns)
+
+    def resident_columns(self) -> Iterator[int]:
+        """used_columns() of the cells in memory: all of them here (see PagedCellStore)."""
+        return self.used_columns()
+
+    def resident_rows(self, row_lo: int, row_hi: int) -> Iterator[int]:
+        """Rows row_lo..row_hi whose cells are in memory: all of them here (see PagedCellStore)."""
+        return iter(range(row_lo, row_hi + 1))
+
+    def row_last_column(self, row: int) -> int:
+        """Rightmost occupied column of a row (0 when the row is empty)."""
+        block = self._row_columns.get(row >> _ROW_COLUMNS_SHIFT)
+        return block[1][row & _ROW_COLUMNS_MASK].bit_length() if block is not None else 0
+
+    def column_last_row(self, col_num: int) -> int:
+        """Bottom occupied row of a column (0 when the column is empty)."""
+        rows = self._column_rows.get(col_num)
+        return rows.last() if rows is not None else 0
+
+    def put_objects(self, entries: Iterable[Tuple[int, int, Cell]]) -> None:
+        """
+        Bulk insert of object cells, as (col_num, row, cell), into slots that
+        must be empty: no replacement, unboxing check or aggregate refresh.
+        """
+        tiles, content_index = self._tiles, self._content_index
+        count = 0
+        added: Dict[int, List[int]] = {}
+        for col_num, row, cell in entries:
+            c, r = col_num - 1, row - 1
+            tile_key = (c >> TILE_COL_SHIFT, r >> TILE_ROW_SHIFT)
+            slot = ((c & TILE_COL_MASK) << TILE_ROW_SHIFT) | (r & TILE_ROW_MASK)
+            tile = tiles.get(tile_key)
+            if tile is None:
+                tile = tiles[tile_key] = Tile()
+            if type(cell.content) is TextContent:
+                tile.objects[slot] = cell.content.text
+                tile.tags[slot] = TAG_TEXT
+            else:
+                tile.objects[slot] = cell
+                tile.tags[slot] = TAG_OBJECT
+                content_index[id(cell.content)] = (cell.coordinate.column, row)
+            tile.count += 1
+            rows = added.get(col_num)
+            if rows is None:
+                rows = added[col_num] = []
+            rows.append(row)
+            count += 1
+        self._count += count
+        for col_num, rows in added.items():
+            self._index_rows(col_num, rows)
+        # Rebuilt from the buffers on the next tall range query
+        self._column_trees.clear()
+
+    def iter_all_objects(self) -> Iterator[Cell]:
+        """Every object cell (text, formulas, boxed numbers), in no particular order."""
+        for (tile_col, tile_row), tile in list(self._tiles.items()):
+            for slot, entry in list(tile.objects.items()):
+                yield self._object_cell(tile_col, tile_row, slot, entry)
+
+    def find_content(self, content) -> Optional[Tuple[str, int]]:
+        """(column, row) of the object cell holding this content, if indexed, or of a materialized number."""
+        number = getattr(content, "number", None)
+        if type(number) is _StoredNumber and number._store is self:
+            key = (number._column, number._row)
+            return key if self.value(*key) == number.get_value() else None
+        key = self._content_index.get(id(content))
+        if key is None:
+            return None
+        cell = self.get(*key)
+        return key if cell is not None and cell.content is content else None
+
+    def iter_range(self, col_lo: int, col_hi: int, row_lo: int, row_hi: int) -> Iterator[Cell]:
+        """
+        Yield the occupied cells of a rectangle column by column, rows ascending.
+        The row indexes enumerate only occupied cells: O(k + log n) per column
+        for k cells, however large and empty the rectangle.
+        """
+        for col_num in self._columns_within(col_lo, col_hi):
+            column = number_to_column(col_num)
+            c = col_num - 1
+            tile_col = c >> TILE_COL_SHIFT
+            base = (c & TILE_COL_MASK) << TILE_ROW_SHIFT
+            tile_row, tile = -1, None
+            for row in self._column_rows[col_num].irange(row_lo, row_hi):
+                r = row - 1
+                if r >> TILE_ROW_SHIFT != tile_row:
+                    tile_row = r >> TILE_ROW_SHIFT
+                    tile = self._tiles.get((tile_col, tile_row))
+                cell = self._materialize(tile, base | (r & TILE_ROW_MASK), column, row) if tile else None
+                if cell is not None:
+                    yield cell
+
+    def iter_objects(self, col_lo: int, col_hi: int, row_lo: int, row_hi: int) -> Iterator[Cell]:
+        """
+        Yield only the boxed cells (formulas, boxed numbers) of a rectangle, in
+        iter_range order; unboxed numbers are skipped without being visited and
+        unboxed text without being materialized.
+        """
+        for col_num, row_lo, row_hi in self._occupied_spans(col_lo, col_hi, row_lo, row_hi):
+            c = col_num - 1
+            base = (c & TILE_COL_MASK) << TILE_ROW_SHIFT
+            for tile_row, tile in self._column_tiles(col_num, row_lo, row_hi):
+                if tile.objects:
+                    first = max(row_lo, (tile_row << TILE_ROW_SHIFT) + 1)
+                    last = min(row_hi, (tile_row + 1) << TILE_ROW_SHIFT)
+                    lo = base | ((first - 1) & TILE_ROW_MASK)
+                    hi = lo + (last - first) + 1
+                    for slot in sorted(tile.objects):
+                        if lo <= slot < hi and type(tile.objects[slot]) is not str:
+                            yield tile.objects[slot]
+
+    def range_numbers(self, col_lo: int, col_hi: int, row_lo: int,
+                      row_hi: int) -> Tuple[array, bool, List[Cell]]:
+        """
+        Contents of a rectangle split for aggregation: the unboxed numbers copied
+        from the tile buffers into one array('d'), whether they are all integers,
+        and the object cells (text, formulas) in iter_range order.
+        """
+        numbers = array('d')
+        integral = True
+        objects: List[Cell] = []
+        for col_num, row_lo, row_hi in self._occupied_spans(col_lo, col_hi, row_lo, row_hi):
+            c = col_num - 1
+            base = (c & TILE_COL_MASK) << TILE_ROW_SHIFT
+            for tile_row, tile in self._column_tiles(col_num, row_lo, row_hi):
+                first = max(row_lo, (tile_row << TILE_ROW_SHIFT) + 1)
+                last = min(row_hi, (tile_row + 1) << TILE_ROW_SHIFT)
+                lo = base | ((first - 1) & TILE_ROW_MASK)
+                hi = lo + (last - first) + 1
+                tags = tile.tags[lo:hi]
+                if tile.values is not None:
+                    numeric = tags.translate(_NUMERIC_TAGS)
+                    found = numeric.count(1)
+                    if found == hi - lo:
+                        numbers.extend(tile.values[lo:hi])
+                    elif found:
+                        numbers.extend(compress(tile.values[lo:hi], numeric))
+                    if found and integral and TAG_FLOAT in tags:
+                        integral = False
+                if tile.objects and (TAG_OBJECT in tags or TAG_TEXT in tags):
+                    objects.extend(self._object_cell(c >> TILE_COL_SHIFT, tile_row, slot, tile.objects[slot])
+                                   for slot in sorted(tile.objects) if lo <= slot < hi)
+        return numbers, integral, objects
+
+    def _column_tiles(self, col_num: int, row_lo: int, row_hi: int) -> Iterator[Tuple[int, Tile]]:
+        """
+        (tile row, tile) of the tiles holding rows row_lo..row_hi of a column,
+        in order; a missing tile sends the walk straight to the column's next
+        occupied row, so empty stretches cost one row index lookup.
+        """
+        tile_col = (col_num - 1) >> TILE_COL_SHIFT
+        tile_row, last_tile = (row_lo - 1) >> TILE_ROW_SHIFT, (row_hi - 1) >> TILE_ROW_SHIFT
+        while tile_row <= last_tile:
+            tile = self._tiles.get((tile_col, tile_row))
+            if tile is None:
+                row = next(self._column_rows[col_num].irange((tile_row << TILE_ROW_SHIFT) + 1, row_hi), None)
+                if row is None:
+                    return
+                tile_row = (row - 1) >> TILE_ROW_SHIFT
+                continue
+            yield tile_row, tile
+            tile_row += 1
+
+    def _occupied_spans(self, col_lo: int, col_hi: int, row_lo: int, row_hi: int) -> Iterator[Tuple[int, int, int]]:
+        """(col_num, first, last): the rectangle's rows of each column, trimmed to its occupied ones."""
+        for col_num in self._columns_within(col_lo, col_hi):
+            span = self._column_rows[col_num].span(row_lo, row_hi)
+            if span is not None:
+                yield col_num, span[0], span[1]
+
+    def range_summary(self, col_lo: int, col_hi: int, row_lo: int, row_hi: int) -> Optional[Summary]:
+        """
+        Aggregate summary (see aggregate_index.Summary) of a tall rectangle,
+        from the column trees plus the partial tile segments at both ends, or
+        None when the range is too short to benefit or holds object cells.
+        Rows below the bottom of every column (whole-column references such as
+        A1:A1048576) are cut off first.
+        """
+        columns = list(self._columns_within(col_lo, col_hi))
+        row_hi = min(row_hi, max((self._column_rows[col_num].last() for col_num in columns), default=0))
+        if row_hi < row_lo:
+            return EMPTY_SUMMARY
+        if row_hi - row_lo + 1 < INDEXED_MIN_ROWS:
+            return None
+        result = EMPTY_SUMMARY
+        first_tile, last_tile = (row_lo - 1) >> TILE_ROW_SHIFT, (row_hi - 1) >> TILE_ROW_SHIFT
+        if not all(self._tree_affordable(col_num, last_tile) for col_num in columns):
+            return None
+        for col_num in columns:
+            tree = self._column_tree(col_num, last_tile)
+            full_lo, full_hi = first_tile, last_tile
+            if (row_lo - 1) & TILE_ROW_MASK:
+                result = combine(result, self._segment_summary(col_num, first_tile, row_lo, (first_tile + 1) << TILE_ROW_SHIFT))
+                full_lo += 1
+            if row_hi & TILE_ROW_MASK:
+                result = combine(result, self._segment_summary(col_num, last_tile, (last_tile << TILE_ROW_SHIFT) + 1, row_hi))
+                full_hi -= 1
+            if full_lo <= full_hi:
+                result = combine(result, tree.query(full_lo, full_hi))
+            if result[3]:
+                return None
+        return result
+
+    def _column_tree(self, col_num: int, last_tile: int) -> ColumnAggregateTree:
+        """The column's aggregate tree, built (or regrown) to cover last_tile."""
+        tree = self._column_trees.get(col_num)
+        if tree is None or last_tile >= tree.capacity:
+            leaves = max(last_tile + 1, self._last_tile_row(col_num) + 1)
+            tree = ColumnAggregateTree([self._segment_summary(col_num, tile_row) for tile_row in range(leaves)])
+            self._column_trees[col_num] = tree
+        return tree
+
+    def _tree_affordable(self, col_num: int, last_tile: int) -> bool:
+        """
+        Whether a tree with a leaf per segment down to last_tile stays within
+        one leaf per cell of the column (plus a tile's worth): not so for a
+        few cells far down the sheet, which a scan of the row index answers.
+        """
+        return last_tile < len(self._column_rows[col_num]) + TILE_ROWS
+
+    def _last_tile_row(self, col_num: int) -> int:
+        rows = self._column_rows.get(col_num)
+        return (rows.last() - 1) >> TILE_ROW_SHIFT if rows is not None else 0
+
+    def _refresh_aggregates(self, col_num: int, row: int) -> None:
+        tree = self._column_trees.get(col_num)
+        if tree is None:
+            return
+        tile_row = (row - 1) >> TILE_ROW_SHIFT
+        if tile_row >= tree.capacity:
+            if col_num in self._column_rows and self._tree_affordable(col_num, tile_row):
+                self._column_tree(col_num, tile_row)
+            else:
+                # Rebuilt by the next tall range query, if it can afford one
+                del self._column_trees[col_num]
+        else:
+            try:
+                tree.update(tile_row, self._segment_summary(col_num, tile_row))
+            except (ArithmeticError, ValueError):
+                # The cell is already stored: drop the tree (derived from the
+                # tiles, rebuilt on demand) rather than leave the edit half done
+                del self._column_trees[col_num]
+
+    def _segment_summary(self, col_num: int, tile_row: int, first: int = None, last: int = None) -> Summary:
+        """Summary of rows first..last (default: the whole segment) of one column inside one tile."""
+        c = col_num - 1
+        tile = self._tiles.get((c >> TILE_COL_SHIFT, tile_row))
+        if tile is None:
+            return EMPTY_SUMMARY
+        base = (c & TILE_COL_MASK) << TILE_ROW_SHIFT
+        lo = base if first is None else base | ((first - 1) & TILE_ROW_MASK)
+        hi = base + TILE_ROWS if last is None else (base | ((last - 1) & TILE_ROW_MASK)) + 1
+        tags = tile.tags[lo:hi]
+        objects = tags.count(TAG_OBJECT) + tags.count(TAG_TEXT)
+        if tile.values is None:
+            return ((), 0, 0, objects, math.inf, -math.inf)
+        numeric = tags.translate(_NUMERIC_TAGS)
+        count = numeric.count(1)
+        if not count:
+            return ((), 0, 0, objects, math.inf, -math.inf)
+        values = tile.values[lo:hi] if count == hi - lo else array('d', compress(tile.values[lo:hi], numeric))
+        return (exact_partials(values), count, tags.count(TAG_FLOAT), objects, min(values), max(values))
+
+    def __iter__(self) -> Iterator[Cell]:
+        for (tile_col, tile_row), tile in list(self._tiles.items()):
+            tags = tile.tags
+            for slot in range(TILE_SLOTS):
+                if tags[slot] != TAG_EMPTY:
+                    col_num = (tile_col << TILE_COL_SHIFT) + (slot >> TILE_ROW_SHIFT) + 1
+                    row = (tile_row << TILE_ROW_SHIFT) + (slot & TILE_ROW_MASK) + 1
+                    yield self._materialize(tile, slot, number_to_column(col_num), row)
+
+    def __len__(self) -> int:
+        return self._count
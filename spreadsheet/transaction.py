@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+
+if TYPE_CHECKING:
+    from spreadsheet.spreadsheet import Spreadsheet
+
+
+class SpreadsheetTransaction:
+    """
+    Cell edits applied to a sheet as one unit. Edits are only buffered until
+    commit, which stores them all, compiles and cycle-checks the new formulas,
+    invalidates the dependents of every edited cell in a single traversal
+    and, in automatic mode, evaluates the new formulas in one recalculation
+    pass (skipped with evaluate=False, leaving evaluation errors to reads),
+    then appends the edits to the sheet's journal, if it has one.
+    If any step fails, even partway through storing the batch, the previous
+    cells, dependency graph and dirty set are put back and the error is
+    raised; discarding the transaction before commit costs nothing, since
+    the sheet was never touched.
+    """
+
+    def __init__(self, spreadsheet: "Spreadsheet", evaluate: bool = True) -> None:
+        self.spreadsheet = spreadsheet
+        self.evaluate = evaluate
+        # Last edit per coordinate, in edit order
+        self._edits: Dict[Tuple[str, int], Cell] = {}
+
+    def __enter__(self) -> "SpreadsheetTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def __len__(self) -> int:
+        return len(self._edits)
+
+    def set_cell(self, coords: Coordinate, cell: Cell) -> None:
+        if cell.coordinate != coords:
+            cell.coordinate = coords
+        self._edits[(coords.column, coords.row)] = cell
+
+    def set_cell_content(self, coords: Coordinate, content) -> None:
+        self.set_cell(coords, Cell((coords.column, coords.row), content))
+
+    def get_cell(self, coords: Coordinate) -> Optional[Cell]:
+        """The cell at coords as it will be after commit."""
+        cell = self._edits.get((coords.column, coords.row))
+        return cell if cell is not None else self.spreadsheet.get_cell(coords)
+
+    def rollback(self) -> None:
+        """Discard the buffered edits."""
+        self._edits.clear()
+
+    def commit(self) -> None:
+        sheet = self.spreadsheet
+        edits, self._edits = self._edits, {}
+        if not edits:
+            return
+        cells = list(edits.values())
+        names = [f"{column}{row}" for column, row in edits]
+        # Everything the commit may change is recorded before anything is stored
+        previous = [sheet._cells.get(column, row) for column, row in edits]
+        dirty = set(sheet._dirty)
+        checkpoint = sheet.dep_manager.checkpoint(names)
+        formulas: List[str] = []
+        try:
+            sheet._store_cells(cells)
+            for cell_name, cell in zip(names, cells):
+                sheet.dep_manager.remove_dependencies(cell_name)
+                if sheet._is_formula(cell.content):
+                    formulas.append(cell_name)
+                else:
+                    sheet._dirty.discard(cell_name)
+
+            # Every edit is in place, so the new edges are checked against the final graph
+            for cell_name, cell in zip(names, cells):
+                if sheet._is_formula(cell.content):
+                    cell.content.check_circular_dependencies(sheet, cell_name)
+
+            sheet._dirty.update(formulas)
+            sheet._invalidate_dependents_of(names)
+            if self.evaluate and formulas and sheet.calculation_mode == sheet.AUTOMATIC:
+                sheet.recalculate(formulas)
+        except Exception:
+            self._undo([cell.coordinate for cell in cells], previous, checkpoint, dirty)
+            raise
+        sheet.dep_manager.release()
+        if sheet.journal is not None:
+            sheet.journal.record(cells)
+
+    def _undo(self, coordinates: List[Coordinate], previous: List[Optional[Cell]], checkpoint, dirty: Set[str]) -> None:
+        """Put back every edited cell, the dependency graph and the dirty set as they were."""
+        sheet = self.spreadsheet
+        for coords, cell in zip(coordinates, previous):
+            sheet._remove_cell_at_coords(coords)
+            if cell is not None:
+                sheet._store_cell(cell)
+        sheet.dep_manager.restore(checkpoint)
+        sheet._invalidate_dependents_of(f"{coords.column}{coords.row}" for coords in coordinates)
+        sheet._dirty = dirty
@@ -0,0 +1,93 @@
+import math
+import random
+import unittest
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.aggregate_index import EMPTY_SUMMARY, combine, exact_partials, summary_total
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.tile_store import INDEXED_MIN_ROWS, TiledCellStore
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def ill_conditioned(count: int, seed: int):
+    rng = random.Random(seed)
+    return [rng.choice((1, -1)) * rng.random() * 10.0 ** rng.randint(-8, 16) for _ in range(count)]
+
+
+class ExactPartialsTest(unittest.TestCase):
+
+    def test_partials_sum_to_fsum(self):
+        values = ill_conditioned(2000, 1)
+        self.assertEqual(math.fsum(exact_partials(values)), math.fsum(values))
+
+    def test_combining_in_any_split_matches_one_fsum(self):
+        values = ill_conditioned(3000, 2)
+        for cut in (1, 700, 1500, 2999):
+            left = (exact_partials(values[:cut]), cut, cut, 0, 0.0, 0.0)
+            right = (exact_partials(values[cut:]), 0, 0, 0, 0.0, 0.0)
+            self.assertEqual(summary_total(combine(left, right)), math.fsum(values))
+
+    def test_overflowing_sums_become_infinite(self):
+        self.assertEqual(exact_partials([1e308, 1e308]), (math.inf,))
+        self.assertEqual(exact_partials([-1e308, -1e308, 1.0]), (-math.inf,))
+        self.assertTrue(math.isnan(exact_partials([math.inf, -math.inf])[0]))
+        left = (exact_partials([1e308]), 1, 1, 0, 1e308, 1e308)
+        self.assertEqual(summary_total(combine(left, left)), math.inf)
+
+    def test_empty_summary_is_neutral(self):
+        summary = (exact_partials([0.1, 0.2]), 2, 2, 0, 0.1, 0.2)
+        self.assertEqual(combine(EMPTY_SUMMARY, summary), summary)
+
+
+class RangeSummaryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = 3 * INDEXED_MIN_ROWS + 17
+        self.values = ill_conditioned(self.rows, 3)
+        self.store = TiledCellStore()
+        for row, value in enumerate(self.values, start=1):
+            self.store.put_number("A", row, value)
+
+    def assertTreeMatchesScan(self, row_lo, row_hi):
+        summary = self.store.range_summary(1, 1, row_lo, row_hi)
+        numbers, _, _ = self.store.range_numbers(1, 1, row_lo, row_hi)
+        self.assertEqual(summary_total(summary), math.fsum(numbers))
+
+    def test_tall_ranges_match_the_scan_bit_for_bit(self):
+        for row_lo, row_hi in ((1, self.rows), (5, self.rows - 3), (300, 300 + INDEXED_MIN_ROWS)):
+            self.assertTreeMatchesScan(row_lo, row_hi)
+
+    def test_edits_keep_the_tree_exact(self):
+        self.assertTreeMatchesScan(1, self.rows)
+        rng = random.Random(4)
+        for _ in range(50):
+            self.store.put_number("A", rng.randint(1, self.rows), rng.random() * 10.0 ** rng.randint(-8, 16))
+        self.assertTreeMatchesScan(1, self.rows)
+        self.assertTreeMatchesScan(7, self.rows - 100)
+
+    def test_tall_and_short_suma_agree(self):
+        sheet = Spreadsheet()
+        for row, value in enumerate(self.values, start=1):
+            sheet.set_cell_content(Coordinate("A", row), NumericContent(value))
+        sheet.set_cell_content(Coordinate("B", 1), FormulaContent(f"=SUMA(A1:A{self.rows})"))
+        self.assertEqual(sheet.get_cell(Coordinate("B", 1)).get_value(sheet), math.fsum(self.values))
+
+    def test_overflowing_edit_of_an_indexed_column(self):
+        sheet = Spreadsheet()
+        for row in range(1, 3001):
+            sheet.set_cell_content(Coordinate("A", row), NumericContent(1))
+        sheet.set_cell_content(Coordinate("B", 1), FormulaContent("=SUMA(A1:A3000)"))
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", 1)), 3000)
+        self.assertIn(1, sheet.cells._column_trees)
+
+        sheet.set_cell_content(Coordinate("A", 6), NumericContent(1e308))
+        sheet.set_cell_content(Coordinate("A", 7), NumericContent(1e308))
+        self.assertEqual(len(sheet.cells), 3001)
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", 1)), math.inf)
+        sheet.set_cell_content(Coordinate("A", 7), NumericContent(1))
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", 1)), math.fsum([1e308] + [1.0] * 2999))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+class BlankReferenceTest(unittest.TestCase):
+
+    def test_empty_references_are_not_materialized(self):
+        sheet = Spreadsheet()
+        sheet.set_cell_content(Coordinate("A", 1), FormulaContent("=Z5+2"))
+        sheet.set_cell_content(Coordinate("A", 2), FormulaContent("=SUMA(Z1:Z100000)+MAX(Y6;3)"))
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 1)), 2)
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 2)), 3)
+        self.assertEqual(len(sheet.cells), 2)
+        self.assertFalse(sheet.has_cell(Coordinate("Z", 5)))
+        self.assertEqual(sheet.cells.bounds(), (1, 2, 1, 1))
+
+    def test_writing_a_referenced_empty_cell_invalidates_the_formula(self):
+        sheet = Spreadsheet()
+        sheet.set_cell_content(Coordinate("A", 1), FormulaContent("=Z5+2"))
+        sheet.set_cell_content(Coordinate("A", 2), FormulaContent("=SUMA(Z1:Z100000)+MAX(Y6;3)"))
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 1)), 2)
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 2)), 3)
+        sheet.set_cell_content(Coordinate("Z", 5), NumericContent(4))
+        sheet.set_cell_content(Coordinate("Y", 6), NumericContent(10))
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 1)), 6)
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 2)), 14)
+        self.assertEqual(len(sheet.cells), 4)
+
+    def test_function_arguments_and_operands_read_the_same_blank(self):
+        sheet = Spreadsheet()
+        sheet.set_cell_content(Coordinate("B", 1), NumericContent(-1))
+        sheet.set_cell_content(Coordinate("A", 1), FormulaContent("=MAX(Y6;B1)"))
+        sheet.set_cell_content(Coordinate("A", 2), FormulaContent("=MIN(Y6;3)+PROMEDIO(Y6;4)"))
+        sheet.set_cell_content(Coordinate("A", 3), FormulaContent("=SUMA(Y6;1)+Y6*2"))
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 1)), 0)
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 2)), 2)
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 3)), 1)
+        self.assertEqual(len(sheet.cells), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
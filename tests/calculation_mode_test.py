@@ -0,0 +1,83 @@
+import unittest
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def sample(mode: str) -> Spreadsheet:
+    sheet = Spreadsheet()
+    sheet.set_calculation_mode(mode)
+    with sheet.transaction() as transaction:
+        transaction.set_cell_content(Coordinate("A", 1), NumericContent(2))
+        transaction.set_cell_content(Coordinate("B", 1), FormulaContent("=A1*10"))
+        transaction.set_cell_content(Coordinate("C", 1), FormulaContent("=B1+1"))
+    return sheet
+
+
+def computed(sheet: Spreadsheet, column: str, row: int):
+    return sheet.get_cell(Coordinate(column, row)).content._computed_value
+
+
+def set_a1(sheet: Spreadsheet, number: int) -> None:
+    with sheet.transaction() as transaction:
+        transaction.set_cell_content(Coordinate("A", 1), NumericContent(number))
+
+
+class CalculationModeTest(unittest.TestCase):
+
+    def test_automatic_evaluates_on_commit(self):
+        sheet = sample(Spreadsheet.AUTOMATIC)
+        self.assertEqual(sheet._dirty, set())
+        self.assertEqual(computed(sheet, "C", 1), 21)
+        set_a1(sheet, 3)
+        # Dependents of a changed value are dropped and recomputed when read
+        self.assertIsNone(computed(sheet, "C", 1))
+        self.assertEqual(sheet.get_cell_value(Coordinate("C", 1)), 31)
+        self.assertEqual(sheet._dirty, set())
+
+    def test_deferred_marks_dirty_until_the_first_read(self):
+        sheet = sample(Spreadsheet.DEFERRED)
+        self.assertEqual(sheet._dirty, {"B1", "C1"})
+        self.assertIsNone(computed(sheet, "C", 1))
+        sheet.ensure_calculated()
+        self.assertEqual(sheet._dirty, set())
+        self.assertEqual(computed(sheet, "C", 1), 21)
+
+        set_a1(sheet, 3)
+        self.assertEqual(sheet._dirty, {"B1", "C1"})
+        sheet.ensure_calculated()
+        self.assertEqual((sheet._dirty, computed(sheet, "B", 1), computed(sheet, "C", 1)), (set(), 30, 31))
+
+    def test_manual_keeps_stale_values_until_recalculate(self):
+        sheet = sample(Spreadsheet.MANUAL)
+        self.assertEqual(sheet._dirty, {"B1", "C1"})
+        self.assertEqual(sheet.recalculate(), 2)
+        self.assertEqual(computed(sheet, "C", 1), 21)
+
+        set_a1(sheet, 3)
+        sheet.ensure_calculated()
+        self.assertEqual(sheet._dirty, {"B1", "C1"})
+        self.assertEqual(sheet.get_cell_value(Coordinate("C", 1)), 21)
+        self.assertEqual(sheet.recalculate(), 2)
+        self.assertEqual(sheet._dirty, set())
+        self.assertEqual(sheet.get_cell_value(Coordinate("C", 1)), 31)
+
+    def test_a_plain_value_over_a_formula_is_not_dirty(self):
+        sheet = sample(Spreadsheet.MANUAL)
+        with sheet.transaction() as transaction:
+            transaction.set_cell_content(Coordinate("B", 1), NumericContent(7))
+        self.assertEqual(sheet._dirty, {"C1"})
+        self.assertEqual(sheet.recalculate(), 1)
+        self.assertEqual(sheet.get_cell_value(Coordinate("C", 1)), 8)
+
+    def test_unknown_mode_is_rejected(self):
+        sheet = Spreadsheet()
+        with self.assertRaises(ValueError):
+            sheet.set_calculation_mode("lazy")
+        self.assertEqual(sheet.calculation_mode, Spreadsheet.AUTOMATIC)
+
+
+if __name__ == "__main__":
+    unittest.main()
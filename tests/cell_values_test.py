@@ -0,0 +1,81 @@
+import unittest
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from content.text_content import TextContent
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+from spreadsheet.tile_store import TAG_FLOAT, TAG_INT, TAG_OBJECT, TAG_TEXT
+
+
+def tag(sheet: Spreadsheet, column: str, row: int) -> int:
+    store = sheet.cells
+    tile_key, slot = store._locate(ord(column) - ord("A") + 1, row)
+    return store._tiles[tile_key].tags[slot]
+
+
+class UnboxedValuesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sheet = Spreadsheet()
+        self.sheet.set_cell_content(Coordinate("A", 1), NumericContent(3))
+        self.sheet.set_cell_content(Coordinate("A", 2), NumericContent(2.5))
+        self.sheet.set_cell_content(Coordinate("B", 1), TextContent("label"))
+        self.sheet.set_cell_content(Coordinate("B", 2), TextContent("4"))
+
+    def test_values_are_read_without_boxing(self):
+        sheet = self.sheet
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 1)), 3)
+        self.assertIs(type(sheet.get_cell_value(Coordinate("A", 1))), int)
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 2)), 2.5)
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", 1)), "label")
+        self.assertIsNone(sheet.get_cell_value(Coordinate("C", 1)))
+        self.assertEqual([tag(sheet, "A", 1), tag(sheet, "A", 2), tag(sheet, "B", 1)], [TAG_INT, TAG_FLOAT, TAG_TEXT])
+
+    def test_formulas_read_unboxed_cells(self):
+        self.sheet.set_cell_content(Coordinate("C", 1), FormulaContent("=A1*A2+A1"))
+        self.assertEqual(self.sheet.get_cell_value(Coordinate("C", 1)), 10.5)
+
+    def test_text_cell_keeps_its_identity(self):
+        sheet = self.sheet
+        cell = sheet.get_cell(Coordinate("B", 1))
+        self.assertIs(sheet.get_cell(Coordinate("B", 1)), cell)
+        self.assertEqual(tag(sheet, "B", 1), TAG_OBJECT)
+        self.assertEqual(sheet.get_cell_name(cell.content), "B1")
+
+        cell.content.set_text("renamed")
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", 1)), "renamed")
+        self.assertEqual(sheet.get_cell(Coordinate("B", 1)).content.get_text(), "renamed")
+
+    def test_numbers_write_through_to_the_sheet(self):
+        sheet = self.sheet
+        sheet.set_cell_content(Coordinate("C", 1), FormulaContent("=SUMA(A1:A2)"))
+        self.assertEqual(sheet.get_cell_value(Coordinate("C", 1)), 5.5)
+        content = sheet.get_cell(Coordinate("A", 1)).content
+        self.assertEqual(content.number.get_value(), 3)
+        self.assertEqual(sheet.get_cell_name(content), "A1")
+
+        content.set_number(5)
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 1)), 5)
+        self.assertEqual(tag(sheet, "A", 1), TAG_INT)
+        self.assertEqual(sheet.cells.range_numbers(1, 1, 1, 2)[0].tolist(), [5.0, 2.5])
+        content.number.value = 6.5
+        self.assertEqual(sheet.get_cell(Coordinate("A", 1)).content.get_number(), 6.5)
+        self.assertEqual(tag(sheet, "A", 1), TAG_FLOAT)
+
+    def test_a_replaced_number_is_not_written_back(self):
+        content = self.sheet.get_cell(Coordinate("A", 1)).content
+        self.sheet.set_cell_content(Coordinate("A", 1), NumericContent(4))
+        content.set_number(9)
+        self.assertEqual(self.sheet.get_cell_value(Coordinate("A", 1)), 4)
+        with self.assertRaises(ValueError):
+            self.sheet.get_cell_name(content)
+
+    def test_large_integers_stay_exact(self):
+        self.sheet.set_cell_content(Coordinate("A", 3), NumericContent(2 ** 60 + 1))
+        self.assertEqual(self.sheet.get_cell_value(Coordinate("A", 3)), 2 ** 60 + 1)
+        self.assertEqual(tag(self.sheet, "A", 3), TAG_OBJECT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import math
+import unittest
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from formula.compiled_evaluator import PostfixCompiler
+from formula.operand import NumericOperand
+from formula.operator import ArithmeticOperator
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+class PostfixCompilerTest(unittest.TestCase):
+
+    def test_overflowing_literal_is_bound_not_inlined(self):
+        program = [NumericOperand(float("1" + "0" * 400)), NumericOperand(2), ArithmeticOperator('*')]
+        self.assertEqual(PostfixCompiler().compile(program)(), math.inf)
+
+    def test_nan_literal(self):
+        program = [NumericOperand(math.nan), NumericOperand(1), ArithmeticOperator('+')]
+        self.assertTrue(math.isnan(PostfixCompiler().compile(program)()))
+
+    def test_backends_agree_on_overflowing_formula(self):
+        values = {}
+        for backend in ("visitor", "compiled"):
+            FormulaContent.use_evaluation_backend(backend)
+            try:
+                sheet = Spreadsheet()
+                sheet.set_cell_content(Coordinate("A", 1), NumericContent(3))
+                sheet.set_cell_content(Coordinate("B", 1), FormulaContent("=1" + "0" * 400 + ".5 - A1"))
+                values[backend] = sheet.get_cell(Coordinate("B", 1)).get_value(sheet)
+            finally:
+                FormulaContent.use_evaluation_backend("visitor")
+        self.assertEqual(values, {"visitor": math.inf, "compiled": math.inf})
+
+
+if __name__ == "__main__":
+    unittest.main()
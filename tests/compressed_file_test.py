@@ -0,0 +1,32 @@
+import gzip
+import lzma
+import unittest
+
+from fileio.compressed_file import split_extension
+from tests.save_file_test import ControllerFileTestCase, contents, sample
+
+
+class CompressedFileTest(ControllerFileTestCase):
+
+    def test_split_extension_keeps_the_inner_extension(self):
+        self.assertEqual(split_extension("dir/sheet.s2v.gz"), ("dir/sheet", ".s2v.gz"))
+        self.assertEqual(split_extension("sheet.S2V.XZ"), ("sheet", ".S2V.XZ"))
+        self.assertEqual(split_extension("sheet.s2v"), ("sheet", ".s2v"))
+
+    def test_compressed_files_round_trip(self):
+        expected = contents(sample())
+        for file_name in ("sheet.s2v.gz", "sheet.s2v.xz"):
+            with self.subTest(file_name=file_name):
+                self.check(self.load(self.save(sample(), file_name)), expected)
+
+    def test_compressed_files_hold_the_plain_text(self):
+        with open(self.save(sample(), "sheet.s2v"), encoding="utf-8", newline="") as file:
+            text = file.read()
+        for file_name, codec in (("sheet.s2v.gz", gzip), ("sheet.s2v.xz", lzma)):
+            with self.subTest(file_name=file_name):
+                with codec.open(self.save(sample(), file_name), "rt", encoding="utf-8", newline="") as file:
+                    self.assertEqual(file.read(), text)
+
+
+if __name__ == "__main__":
+    unittest.main()
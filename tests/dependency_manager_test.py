@@ -0,0 +1,120 @@
+import unittest
+from unittest import mock
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from exceptions import CircularDependencyException
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.dependency_manager import DependencyManager
+from spreadsheet.range_index import RangeIndex, rect_contains
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+class ReverseDependentsTest(unittest.TestCase):
+
+    def test_dependents_follow_edits_of_the_formulas(self):
+        manager = DependencyManager()
+        manager.update_dependencies("C1", {"A1", "B1"})
+        manager.update_dependencies("D1", {"A1"})
+        self.assertEqual(manager.get_dependents("A1"), {"C1", "D1"})
+        manager.update_dependencies("C1", {"B2"})
+        self.assertEqual(manager.get_dependents("A1"), {"D1"})
+        self.assertEqual(manager.get_dependents("B2"), {"C1"})
+        manager.remove_dependencies("D1")
+        self.assertEqual(manager.dependents, {"B2": {"C1"}})
+
+    def test_transitive_dependents(self):
+        manager = DependencyManager()
+        manager.update_dependencies("B1", {"A1"})
+        manager.update_dependencies("C1", {"B1"})
+        manager.update_dependencies("D1", {"C1", "A1"})
+        manager.update_dependencies("E1", {"Z9"})
+        self.assertEqual(manager.get_transitive_dependents("A1"), {"B1", "C1", "D1"})
+        self.assertEqual(manager.get_transitive_dependents_of(["C1", "Z9"]), {"D1", "E1"})
+
+    def test_an_edit_invalidates_only_its_dependents(self):
+        sheet = Spreadsheet()
+        sheet.set_cell_content(Coordinate("A", 1), NumericContent(1))
+        sheet.set_cell_content(Coordinate("A", 2), NumericContent(2))
+        sheet.set_cell_content(Coordinate("B", 1), FormulaContent("=A1+1"))
+        sheet.set_cell_content(Coordinate("B", 2), FormulaContent("=A2+1"))
+        sheet.recalculate()
+        sheet.set_cell_content(Coordinate("A", 1), NumericContent(5))
+        self.assertFalse(sheet.get_cell(Coordinate("B", 1)).content.has_computed_value())
+        self.assertTrue(sheet.get_cell(Coordinate("B", 2)).content.has_computed_value())
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", 1)), 6)
+
+
+class RangeIndexTest(unittest.TestCase):
+
+    def test_stabbing_matches_a_scan_of_the_rectangles(self):
+        rects = {"F1": (1, 1, 3, 10), "F2": (2, 5, 2, 5), "F3": (3, 7, 9, 1000), "F4": (1, 1, 1, 1)}
+        index = RangeIndex()
+        for owner, rect in rects.items():
+            index.add(owner, rect)
+        for col in range(1, 11):
+            for row in (1, 4, 5, 6, 7, 10, 11, 999, 1000, 1001):
+                with self.subTest(col=col, row=row):
+                    expected = {owner for owner, rect in rects.items() if rect_contains(rect, col, row)}
+                    self.assertEqual(index.stab(col, row), expected)
+        index.discard("F3")
+        self.assertEqual(index.stab(5, 8), set())
+        self.assertEqual((len(index), index.get_rects("F3")), (3, []))
+
+    def test_a_tall_range_is_stored_by_blocks_not_cells(self):
+        sheet = Spreadsheet()
+        sheet.set_cell_content(Coordinate("B", 1), FormulaContent("=SUMA(A1:A1000000)"))
+        sheet.recalculate()
+        manager = sheet.dep_manager
+        self.assertEqual(manager.get_referenced_ranges("B1"), [(1, 1, 1, 1000000)])
+        self.assertEqual(manager.dependents, {})
+        self.assertLess(len(manager.range_index._blocks), 64)
+        self.assertEqual(manager.get_dependents("A654321"), {"B1"})
+        sheet.set_cell_content(Coordinate("A", 654321), NumericContent(3))
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", 1)), 3)
+
+
+class TopologicalOrderTest(unittest.TestCase):
+
+    def register(self, manager: DependencyManager, cell: str, cells=(), ranges=()) -> None:
+        manager.check_circular_dependencies(cell, set(cells), ranges)
+        manager.update_dependencies(cell, set(cells), ranges)
+
+    def assert_ordered(self, manager: DependencyManager) -> None:
+        position = manager.topological_position
+        for cell in manager._order:
+            for precedent in manager._formula_precedents(manager.dependency_graph.get(cell, ()),
+                                                         manager.get_referenced_ranges(cell)):
+                self.assertLess(position(precedent), position(cell), f"{precedent} -> {cell}")
+
+    def test_order_is_repaired_when_a_formula_gains_a_later_precedent(self):
+        manager = DependencyManager()
+        for row in range(1, 6):
+            self.register(manager, f"B{row}", {"A1"})
+        self.register(manager, "C1", {"B5"})
+        self.register(manager, "B1", {"C1"})
+        self.register(manager, "D1", ranges=[(2, 1, 2, 5)])
+        self.assert_ordered(manager)
+
+    def test_cycles_are_refused(self):
+        manager = DependencyManager()
+        self.register(manager, "B1", {"A1"})
+        self.register(manager, "C1", {"B1"})
+        self.register(manager, "D1", ranges=[(3, 1, 3, 1)])
+        for cell, cells, ranges in (("A1", {"D1"}, ()), ("B1", {"C1"}, ()), ("A1", (), [(4, 1, 4, 9)]),
+                                    ("E5", {"E5"}, ()), ("E5", (), [(1, 1, 9, 9)])):
+            with self.subTest(cell=cell), self.assertRaises(CircularDependencyException):
+                manager.check_circular_dependencies(cell, set(cells), ranges)
+        self.assert_ordered(manager)
+
+    def test_consistent_edges_need_no_search(self):
+        manager = DependencyManager()
+        self.register(manager, "B1", {"A1"})
+        self.register(manager, "C1", {"B1"})
+        with mock.patch.object(manager, "_forward_search", side_effect=AssertionError("searched")):
+            self.register(manager, "D1", {"C1", "B1"})
+            manager.check_circular_dependencies("C1", {"B1", "A1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
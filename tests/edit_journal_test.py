@@ -0,0 +1,161 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from exceptions import SyntaxErrorException
+from fileio import edit_journal
+from fileio.edit_journal import EditJournal
+from fileio.load_file import LoadFile
+from fileio.mapped_file import MappedSheetFile
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+from spreadsheet.spreadsheet_controller import SpreadsheetController
+from usecasesmarker.spreadsheet_controller_for_checker import ISpreadsheetControllerForChecker
+
+parse = SpreadsheetController._parse_content
+
+
+class EditJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.base = os.path.join(self.directory.name, "sheet.s2v")
+        with open(self.base, "w", newline="") as file:
+            for row in range(1, 1201):
+                file.write(f"{row};{row * 2};\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def edit(self, sheet: Spreadsheet, edits: dict) -> None:
+        with sheet.transaction() as transaction:
+            for coord, text in edits.items():
+                transaction.set_cell_content(Coordinate(coord[0], int(coord[1:])), parse(text))
+
+    def replayed(self) -> dict:
+        """Cell texts of the base file reloaded, with its journal replayed."""
+        sheet = Spreadsheet()
+        sheet.load_cells((column, row, SpreadsheetController._classify_loaded_text(text))
+                         for column, row, text in LoadFile().iter_cell_texts(self.base))
+        with EditJournal(self.base) as journal:
+            journal.replay(sheet, parse)
+        return {(cell.coordinate.column, cell.coordinate.row): cell.content.get_text() for cell in sheet.cells}
+
+    def test_replay_applies_the_last_edit_of_each_cell(self):
+        with EditJournal(self.base) as journal:
+            sheet = Spreadsheet()
+            sheet.journal = journal
+            self.edit(sheet, {"A1": "5", "C3": "=A1+B1"})
+            self.edit(sheet, {"A1": "7", "D9": "line\nbreak"})
+        reloaded = Spreadsheet()
+        with EditJournal(self.base) as journal:
+            self.assertEqual(journal.replay(reloaded, parse), 3)
+        self.assertEqual(reloaded.get_cell_value(Coordinate("A", 1)), 7)
+        self.assertEqual(reloaded.get_cell(Coordinate("C", 3)).content.formula, "=A1+B1")
+        self.assertEqual(reloaded.get_cell_value(Coordinate("D", 9)), "line\nbreak")
+
+    def test_compaction_folds_the_journal_into_the_base(self):
+        with EditJournal(self.base) as journal:
+            sheet = Spreadsheet()
+            sheet.journal = journal
+            self.edit(sheet, {"B2": "40", "C1500": "far"})
+            journal.compact(wait=True)
+            self.assertEqual(list(journal.records()), [])
+        with open(self.base, newline="") as file:
+            lines = file.read().split("\n")
+        self.assertEqual(lines[0], "1;2;")
+        self.assertEqual(lines[1], "2;40;")
+        self.assertEqual(lines[1499], ";;far;")
+
+    def test_compaction_keeps_texts_with_separators(self):
+        edits = {"D5": "text;with;semi", "B2": "=SUMA(A1;B1)", "A3": 'say "hi"', "C1300": "x;y"}
+        with EditJournal(self.base) as journal:
+            sheet = Spreadsheet()
+            sheet.journal = journal
+            self.edit(sheet, edits)
+        before = self.replayed()
+        with EditJournal(self.base) as journal:
+            journal.compact(wait=True)
+            self.assertEqual(list(journal.records()), [])
+        self.assertEqual(self.replayed(), before)
+        self.assertEqual(before[("D", 5)], "text;with;semi")
+        self.assertEqual(before[("B", 2)], "=SUMA(A1;B1)")
+        with MappedSheetFile(self.base) as source:
+            self.assertEqual(source.row_values(2), ["2", "=SUMA(A1;B1)", ""])
+            self.assertEqual(source.row_values(1300)[2], "x;y")
+
+    def test_compaction_skips_a_segment_with_line_breaks(self):
+        with open(self.base, "rb") as file:
+            base = file.read()
+        with EditJournal(self.base) as journal:
+            sheet = Spreadsheet()
+            sheet.journal = journal
+            self.edit(sheet, {"A2": "two\nlines"})
+            journal.compact(wait=True)
+            self.edit(sheet, {"A2": "7"})
+            journal.compact(wait=True)
+        with open(self.base, "rb") as file:
+            self.assertEqual(file.read(), base)
+        self.assertEqual(self.replayed()[("A", 2)], "7")
+
+    def test_compaction_reopens_the_mapped_base(self):
+        source = MappedSheetFile(self.base)
+        sheet = Spreadsheet()
+        sheet.page_from(source, SpreadsheetController._classify_loaded_text)
+        replace = os.replace
+
+        def checked_replace(src, dst):
+            if dst == self.base:
+                # A mapped file can't be replaced on Windows
+                self.assertTrue(source._file.closed)
+            replace(src, dst)
+
+        with EditJournal(self.base, mapped=source) as journal:
+            sheet.journal = journal
+            self.edit(sheet, {"A3": "99"})
+            with mock.patch.object(edit_journal.os, "replace", checked_replace):
+                journal.compact(wait=True)
+        self.assertFalse(source._file.closed)
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 3)), 99)
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", 1100)), 2200)
+        self.assertEqual(source.row_values(3), ["99", "6", ""])
+        source.close()
+
+    def test_checker_load_replays_and_save_discards_the_journal(self):
+        with EditJournal(self.base) as journal:
+            sheet = Spreadsheet()
+            sheet.journal = journal
+            self.edit(sheet, {"A2": "123"})
+        checker = ISpreadsheetControllerForChecker()
+        checker.load_spreadsheet_from_file(self.base)
+        self.assertEqual(checker.get_cell_content_as_float("A2"), 123)
+
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        try:
+            checker.set_cell_content("A2", "321")
+            checker.save_spreadsheet_to_file("sheet.s2v")
+        finally:
+            os.chdir(cwd)
+        self.assertFalse(EditJournal.exists(self.base))
+        reloaded = ISpreadsheetControllerForChecker()
+        reloaded.load_spreadsheet_from_file(self.base)
+        self.assertEqual(reloaded.get_cell_content_as_float("A2"), 321)
+
+    def test_a_bad_formula_while_loading_is_reported(self):
+        controller = SpreadsheetController(Spreadsheet())
+        sheet = controller.spreadsheet
+        output = io.StringIO()
+        with mock.patch.object(EditJournal, "replay", side_effect=SyntaxErrorException("Unbalanced parentheses")), \
+                contextlib.redirect_stdout(output):
+            controller.load_spreadsheet(self.base)
+            controller.open_spreadsheet(self.base)
+        self.assertEqual(output.getvalue().count("Error: Unbalanced parentheses"), 2)
+        self.assertIs(controller.spreadsheet, sheet)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from unittest import mock
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+class CompiledProgramTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sheet = Spreadsheet()
+        self.sheet.set_cell_content(Coordinate("A", 1), NumericContent(2))
+        self.formula = FormulaContent("=A1*3+SUMA(A1:A2)")
+        self.sheet.set_cell_content(Coordinate("B", 1), self.formula)
+        self.assertEqual(self.sheet.get_cell_value(Coordinate("B", 1)), 8)
+
+    def test_edits_of_precedents_reuse_the_program(self):
+        template = self.formula._template
+        with mock.patch("formula.parser.Parser.parse_tokens", side_effect=AssertionError("parsed")):
+            for number in (5, 7):
+                self.sheet.set_cell_content(Coordinate("A", 1), NumericContent(number))
+                self.assertIsNone(self.formula._computed_value)
+                self.assertEqual(self.sheet.get_cell_value(Coordinate("B", 1)), number * 4)
+        self.assertIs(self.formula._template, template)
+
+    def test_invalidating_the_value_keeps_the_program(self):
+        template = self.formula._template
+        self.formula.invalidate_value()
+        self.assertFalse(self.formula.has_computed_value())
+        self.assertIs(self.formula._template, template)
+
+    def test_a_new_text_or_invalidate_program_drops_it(self):
+        self.formula.invalidate_program()
+        self.assertIsNone(self.formula._template)
+        self.assertEqual(self.formula.get_value(self.sheet), 8)
+        self.formula.formula = "=A1+1"
+        self.assertIsNone(self.formula._template)
+        self.assertEqual(self.formula.get_value(self.sheet), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
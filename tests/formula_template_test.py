@@ -0,0 +1,57 @@
+import unittest
+from unittest import mock
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from formula.formula_template import template_key
+from formula.parser import Parser
+from formula.tokenizer import scan
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def key(formula: str, column: int, row: int):
+    return template_key(formula, scan(formula), column, row)
+
+
+class FormulaTemplateTest(unittest.TestCase):
+
+    def test_keys_are_relative_to_the_cell(self):
+        self.assertEqual(key("A1*2+SUMA(B1:B3)", 3, 1), key("A7*2+SUMA(B7:B9)", 3, 7))
+        self.assertNotEqual(key("A1*2", 3, 1), key("A1*2", 3, 7))
+        self.assertNotEqual(key("A1*2", 3, 1), key("A1*3", 3, 1))
+
+    def test_filled_down_formulas_share_one_program(self):
+        sheet = Spreadsheet()
+        for row in range(1, 101):
+            sheet.set_cell_content(Coordinate("A", row), NumericContent(row))
+        parsed = []
+
+        def parser(source, tokens):
+            parsed.append(source)
+            return Parser(source, tokens)
+
+        with mock.patch("formula.formula_template.Parser", side_effect=parser):
+            for row in range(1, 101):
+                sheet.set_cell_content(Coordinate("B", row), FormulaContent(f"=A{row}*2+SUMA(A{row}:A{row + 1})"))
+            sheet.recalculate()
+        values = [sheet.get_cell_value(Coordinate("B", row)) for row in (1, 50, 100)]
+        self.assertEqual(values, [5, 201, 300])
+        self.assertEqual(len(parsed), 1)
+        templates = {id(sheet.get_cell(Coordinate("B", row)).content._template) for row in range(1, 101)}
+        self.assertEqual(len(templates), 1)
+
+    def test_references_are_resolved_per_cell(self):
+        sheet = Spreadsheet()
+        first, second = FormulaContent("=A1+SUMA(A1:B2)"), FormulaContent("=A5+SUMA(A5:B6)")
+        sheet.set_cell_content(Coordinate("C", 1), first)
+        sheet.set_cell_content(Coordinate("C", 5), second)
+        sheet.recalculate()
+        self.assertIs(first._template, second._template)
+        self.assertEqual(first._references, ({"A1"}, [(1, 1, 2, 2)]))
+        self.assertEqual(second._references, ({"A5"}, [(1, 5, 2, 6)]))
+        self.assertEqual(sheet.dep_manager.get_dependents("B6"), {"C5"})
+
+
+if __name__ == "__main__":
+    unittest.main()
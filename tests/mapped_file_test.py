@@ -0,0 +1,108 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from fileio import mapped_file
+from content.numerical_content import NumericContent
+from content.text_content import TextContent
+from fileio.mapped_file import MappedSheetFile
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.paged_store import PagedCellStore
+from spreadsheet.spreadsheet import Spreadsheet
+from spreadsheet.spreadsheet_controller import SpreadsheetController
+from spreadsheet.tile_store import TILE_ROWS
+from tests.save_file_test import ControllerFileTestCase, contents, sample
+
+classify = SpreadsheetController._classify_loaded_text
+
+
+class MappedSheetFileTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".s2v")
+        with os.fdopen(handle, "w") as file:
+            for row in range(1, 2 * TILE_ROWS + 11):
+                file.write(f"{row};item {row};;=A{row}*2\n")
+        self.rows = 2 * TILE_ROWS + 10
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_rows_split_across_index_chunks(self):
+        with mock.patch.object(mapped_file, "_SCAN_CHUNK", 64), MappedSheetFile(self.path) as source:
+            self.assertEqual(source.row_values(7), ["7", "item 7", "", "=A7*2"])
+            self.assertFalse(source.complete)
+            self.assertEqual(source.row_count, self.rows)
+            self.assertEqual(source.row_values(self.rows), [str(self.rows), f"item {self.rows}", "", f"=A{self.rows}*2"])
+            self.assertEqual(source.row_values(self.rows + 1), [])
+
+    def test_lookups_past_the_end_stop_at_the_end(self):
+        with MappedSheetFile(self.path) as source:
+            store = PagedCellStore(source, classify)
+            self.assertIsNone(store.get("A", 10 ** 9))
+            self.assertTrue(source.complete)
+            with mock.patch.object(source, "iter_cell_texts", side_effect=AssertionError("file read")):
+                self.assertIsNone(store.get("B", 10 ** 9))
+                self.assertEqual(list(store.iter_range(1, 4, self.rows + 1, 10 ** 9)), [])
+            self.assertEqual(store.value("A", 5), 5)
+            self.assertEqual(len(store), self.rows * 3)
+            self.assertTrue(store._fully_paged)
+
+    def test_edits_survive_paging(self):
+        with MappedSheetFile(self.path) as source:
+            store = PagedCellStore(source, classify)
+            store.put_number("A", TILE_ROWS + 3, 1.5)
+            self.assertEqual(store.value("A", TILE_ROWS + 3), 1.5)
+            self.assertEqual(store.value("A", TILE_ROWS + 4), TILE_ROWS + 4)
+            self.assertEqual(store.get("B", 2).content.get_text(), "item 2")
+
+    def test_bounds_and_emptiness_read_only_the_end_bands(self):
+        with MappedSheetFile(self.path) as source:
+            store = PagedCellStore(source, classify)
+            self.assertTrue(store)
+            self.assertEqual(store._paged, {0})
+            self.assertEqual(store.bounds(), (1, self.rows, 1, 4))
+            self.assertEqual(store._paged, {0, 2})
+            store.put_number("E", self.rows + 5, 1)
+            self.assertEqual(store.bounds(), (1, self.rows + 5, 1, 5))
+            self.assertEqual(store._paged, {0, 2})
+
+    def test_printing_an_edit_shows_only_the_rows_read(self):
+        with MappedSheetFile(self.path) as source:
+            sheet = Spreadsheet()
+            sheet.page_from(source, classify)
+            sheet.set_cell_content(Coordinate("B", 3), NumericContent(42))
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                sheet.print_spreadsheet()
+            self.assertEqual(sheet.cells._paged, {0, 2})
+            printed = output.getvalue()
+            self.assertIn(" 42 ", printed)
+            self.assertIn(f"item {self.rows}", printed)
+            self.assertNotIn(f"item {TILE_ROWS + 1} ", printed)
+            self.assertIn(f"({TILE_ROWS} rows of the file not read yet are left out)", printed)
+
+
+class PagedSaveTest(ControllerFileTestCase):
+
+    def test_a_paged_sheet_saves_every_row_of_its_file(self):
+        paged = self.load(self.save(sample(), "base.s2v"), paged=True)
+        self.assertEqual(paged.get_cell_value(Coordinate("A", 1)), 2)
+        self.check(self.load(self.save(paged, "paged.s2v")), contents(sample()))
+
+    def test_edits_of_a_paged_sheet_are_saved(self):
+        paged = self.load(self.save(sample(), "base.s2v"), paged=True)
+        with paged.transaction() as transaction:
+            transaction.set_cell_content(Coordinate("C", 9), NumericContent(1))
+            transaction.set_cell_content(Coordinate("D", 1), TextContent("sum"))
+        loaded = self.load(self.save(paged, "edited.s2v"))
+        self.assertEqual(loaded.get_cell_value(Coordinate("A", 4)), 6)
+        self.assertEqual(loaded.get_cell_value(Coordinate("D", 1)), "sum")
+        self.assertEqual(len(loaded.cells), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import pickle
+import unittest
+from unittest import mock
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.coordinate import Coordinate, number_to_column
+from spreadsheet.parallel_recalculation import ParallelRecalculationEngine, _evaluate_batch
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def chains(width: int, length: int) -> Spreadsheet:
+    sheet = Spreadsheet()
+    for col_num in range(1, width + 1):
+        column = number_to_column(col_num)
+        sheet.set_cell_content(Coordinate(column, 1), NumericContent(col_num))
+        for row in range(2, length + 1):
+            sheet.set_cell_content(Coordinate(column, row), FormulaContent(f"={column}{row - 1}*2+1"))
+    sheet.recalculate()
+    return sheet
+
+
+class ParallelRecalculationTest(unittest.TestCase):
+
+    def test_workers_are_capped_at_the_cores(self):
+        sheet = Spreadsheet()
+        with mock.patch("os.cpu_count", return_value=1):
+            sheet.set_recalculation_workers(8)
+            self.assertIsNone(sheet.parallel_engine)
+        with mock.patch("os.cpu_count", return_value=4):
+            sheet.set_recalculation_workers(8)
+            self.assertEqual(sheet.parallel_engine.workers, 4)
+        sheet.set_recalculation_workers(1)
+        self.assertIsNone(sheet.parallel_engine)
+
+    def test_small_components_stay_in_process(self):
+        sheet = chains(4, 5)
+        sheet.set_calculation_mode(Spreadsheet.MANUAL)
+        sheet.parallel_engine = ParallelRecalculationEngine(sheet, 2)
+        sheet.parallel_engine.MIN_PARALLEL_FORMULAS = 1
+        with mock.patch.object(sheet.parallel_engine, "_executor", side_effect=AssertionError("pool started")):
+            sheet.set_cell_content(Coordinate("A", 1), NumericContent(10))
+            sheet.recalculate()
+        self.assertEqual(sheet.get_cell(Coordinate("A", 5)).get_value(sheet), 175)
+
+    def test_pool_matches_in_process_values(self):
+        sheet = chains(3, 6)
+        sheet.set_calculation_mode(Spreadsheet.MANUAL)
+        sheet.parallel_engine = engine = ParallelRecalculationEngine(sheet, 2)
+        engine.MIN_PARALLEL_FORMULAS = engine.MIN_PARALLEL_COMPONENT = 1
+        try:
+            for col_num, column in enumerate("ABC", start=1):
+                sheet.set_cell_content(Coordinate(column, 1), NumericContent(col_num + 1))
+            sheet.recalculate()
+        finally:
+            engine.shutdown()
+        # x -> 2x + 1 five times: 32x + 31
+        self.assertEqual([sheet.get_cell(Coordinate(column, 6)).get_value(sheet) for column in "ABC"],
+                         [32 * seed + 31 for seed in (2, 3, 4)])
+
+    def test_workers_evaluate_the_shipped_programs_without_parsing(self):
+        sheet = chains(2, 4)
+        engine = ParallelRecalculationEngine(sheet, 2)
+        sheet.set_cell_content(Coordinate("A", 1), NumericContent(5))
+        names = ["A2", "A3", "A4"]
+        pending = sheet.recalc_engine._collect(names, False)
+        batch = engine._pack(engine._component_inputs(names, pending), names, pending)
+        # One template, shared by the whole chain
+        self.assertEqual({template_id for _, _, _, template_id in batch[2]}, {0})
+        with mock.patch("formula.formula_template.FormulaTemplate.for_cell", side_effect=AssertionError("parsed")):
+            self.assertEqual(_evaluate_batch(pickle.loads(pickle.dumps(batch))), [11, 23, 47])
+
+
+if __name__ == "__main__":
+    unittest.main()
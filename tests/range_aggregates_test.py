@@ -0,0 +1,85 @@
+import math
+import unittest
+from array import array
+from unittest import mock
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from formula import range_aggregates
+from formula.range_aggregates import NumericBlock, block_sum
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+# Naive (and pairwise) summation loses the 1.0 in between
+ILL_CONDITIONED = [1e16, 1.0, -1e16, 3.0, 0.1, 0.2]
+
+
+class _PairwiseNumpy:
+    """Stand-in for NumPy whose sum rounds like a plain loop."""
+    float64 = float
+
+    @staticmethod
+    def frombuffer(values, dtype):
+        class _View(list):
+            def sum(self):
+                total = 0.0
+                for value in self:
+                    total += value
+                return total
+        return _View(values)
+
+
+class NumericBlockTest(unittest.TestCase):
+
+    def test_total_is_correctly_rounded(self):
+        block = NumericBlock(array('d', ILL_CONDITIONED), False)
+        self.assertEqual(block.total(), math.fsum(ILL_CONDITIONED))
+
+    def test_total_does_not_depend_on_numpy(self):
+        block = NumericBlock(array('d', ILL_CONDITIONED), False)
+        without = block.total()
+        with mock.patch.object(range_aggregates, "numpy", _PairwiseNumpy):
+            self.assertEqual(block.total(), without)
+
+    def test_block_sum_keeps_integers(self):
+        self.assertEqual(block_sum([NumericBlock(array('d', [1, 2, 3]), True)]), 6)
+
+    def test_integer_sums_are_exact_past_2_53(self):
+        numbers = [2 ** 53 - 1, 2 ** 53 - 1, 3]
+        block = NumericBlock(array('d', numbers), True)
+        self.assertEqual(block_sum([block]), sum(numbers))
+        self.assertIs(type(block_sum([block])), int)
+
+    def test_overflowing_sums_are_infinite(self):
+        self.assertEqual(block_sum([NumericBlock(array('d', [1e308, 1e308]), False)]), math.inf)
+        self.assertEqual(block_sum([NumericBlock(array('d', [1e308]), False)] * 2), math.inf)
+        self.assertTrue(math.isnan(block_sum([NumericBlock(array('d', [math.inf, -math.inf]), False)])))
+
+    def test_suma_overflows_like_addition(self):
+        sheet = Spreadsheet()
+        sheet.set_cell_content(Coordinate("A", 1), NumericContent(1e308))
+        sheet.set_cell_content(Coordinate("A", 2), NumericContent(1e308))
+        sheet.set_cell_content(Coordinate("B", 1), FormulaContent("=SUMA(A1:A2)"))
+        sheet.set_cell_content(Coordinate("B", 2), FormulaContent("=A1+A2"))
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", 1)), math.inf)
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", 2)), math.inf)
+
+    def test_tall_integer_sums_are_exact(self):
+        sheet = Spreadsheet()
+        rows = 3000
+        for row in range(1, rows + 1):
+            sheet.set_cell_content(Coordinate("A", row), NumericContent(2 ** 53 - row))
+        sheet.set_cell_content(Coordinate("B", 1), FormulaContent(f"=SUMA(A1:A{rows})"))
+        self.assertIsNotNone(sheet.get_range_summary(Coordinate("A", 1), Coordinate("A", rows)))
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", 1)), sum(2 ** 53 - row for row in range(1, rows + 1)))
+
+    def test_suma_matches_fsum(self):
+        sheet = Spreadsheet()
+        for row, value in enumerate(ILL_CONDITIONED, start=1):
+            sheet.set_cell_content(Coordinate("A", row), NumericContent(value))
+        sheet.set_cell_content(Coordinate("B", 1), FormulaContent(f"=SUMA(A1:A{len(ILL_CONDITIONED)})"))
+        self.assertEqual(sheet.get_cell(Coordinate("B", 1)).get_value(sheet), math.fsum(ILL_CONDITIONED))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import sys
+import unittest
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+def chain(length: int) -> Spreadsheet:
+    """A1 = 1, A2 = A1+1, ..., A<length> = A<length - 1>+1, loaded without evaluating."""
+    sheet = Spreadsheet()
+    sheet.set_calculation_mode(Spreadsheet.MANUAL)
+    sheet.load_cells([("A", 1, 1)] + [("A", row, FormulaContent(f"=A{row - 1}+1")) for row in range(2, length + 1)])
+    return sheet
+
+
+class RecalculationEngineTest(unittest.TestCase):
+
+    def test_a_chain_deeper_than_the_recursion_limit(self):
+        length = 3 * sys.getrecursionlimit()
+        sheet = chain(length)
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", length)), length)
+
+    def test_each_formula_is_evaluated_once_per_pass(self):
+        sheet = chain(50)
+        self.assertEqual(sheet.recalculate(), 49)
+        sheet.set_cell_content(Coordinate("A", 1), NumericContent(10))
+        self.assertEqual(sheet.recalculate(), 49)
+        self.assertEqual(sheet.recalculate(), 0)
+        self.assertEqual(sheet.get_cell_value(Coordinate("A", 50)), 59)
+
+    def test_a_diamond_reads_its_precedents_computed(self):
+        sheet = Spreadsheet()
+        sheet.set_cell_content(Coordinate("A", 1), NumericContent(2))
+        sheet.set_cell_content(Coordinate("D", 1), FormulaContent("=B1+C1"))
+        sheet.set_cell_content(Coordinate("B", 1), FormulaContent("=A1*10"))
+        sheet.set_cell_content(Coordinate("C", 1), FormulaContent("=B1+A1"))
+        self.assertEqual(sheet.recalc_engine.recalculate(["D1"]), ["B1", "C1", "D1"])
+        self.assertEqual(sheet.get_cell_value(Coordinate("D", 1)), 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
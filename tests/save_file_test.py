@@ -0,0 +1,93 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from content.text_content import TextContent
+from fileio.save_file import SaveFile
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+from spreadsheet.spreadsheet_controller import SpreadsheetController
+
+
+def sample() -> Spreadsheet:
+    sheet = Spreadsheet()
+    sheet.set_cell_content(Coordinate("A", 1), NumericContent(2))
+    sheet.set_cell_content(Coordinate("B", 1), NumericContent(2.5))
+    sheet.set_cell_content(Coordinate("D", 1), TextContent("total"))
+    sheet.set_cell_content(Coordinate("A", 4), FormulaContent("=A1*B1+C9"))
+    sheet.set_cell_content(Coordinate("C", 700), FormulaContent("=SUMA(A1:B4)"))
+    return sheet
+
+
+def contents(sheet: Spreadsheet):
+    return {(cell.coordinate.column, cell.coordinate.row): cell.content.get_text() for cell in sheet.cells}
+
+
+class ControllerFileTestCase(unittest.TestCase):
+    """Saves and loads through the controller, as the menu does, in a scratch directory."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.controller = SpreadsheetController(Spreadsheet())
+
+    def tearDown(self):
+        self.controller._close_journal()
+        self.directory.cleanup()
+
+    def save(self, sheet: Spreadsheet, file_name: str) -> str:
+        output = io.StringIO()
+        with mock.patch("builtins.input", side_effect=[file_name, self.directory.name]), \
+                contextlib.redirect_stdout(output):
+            self.controller.save_spreadsheet(sheet)
+        self.assertNotIn("Error", output.getvalue())
+        return os.path.join(self.directory.name, file_name)
+
+    def load(self, file_path: str, paged: bool = False) -> Spreadsheet:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            if paged:
+                self.controller.open_spreadsheet(file_path)
+            else:
+                self.controller.load_spreadsheet(file_path)
+        # The controller reports a failed load and keeps the previous sheet
+        self.assertNotIn("Error", output.getvalue())
+        return self.controller.spreadsheet
+
+    def check(self, loaded: Spreadsheet, expected: dict) -> None:
+        self.assertEqual(contents(loaded), expected)
+        self.assertEqual(loaded.get_cell_value(Coordinate("A", 4)), 5)
+        self.assertEqual(loaded.get_cell_value(Coordinate("C", 700)), 9.5)
+        self.assertFalse(loaded.has_cell(Coordinate("C", 9)))
+
+
+class SaveFileTest(ControllerFileTestCase):
+
+    def test_rows_are_padded_to_the_sheet_width(self):
+        with open(self.save(sample(), "sheet.s2v"), encoding="utf-8", newline="") as file:
+            lines = file.read().split("\n")
+        self.assertEqual(len(lines), 701)
+        self.assertEqual(lines[0], "2;2.5;;total;")
+        self.assertEqual(lines[1:3], [";;;;"] * 2)
+        self.assertEqual(lines[3], "=A1*B1+C9;;;;")
+        self.assertEqual(set(lines[4:699]), {";;;;"})
+        self.assertEqual(lines[699:], [";;=SUMA(A1:B4);;", ""])
+
+    def test_row_width_lines_leave_empty_rows_bare(self):
+        path = os.path.join(self.directory.name, "rows.txt")
+        SaveFile().write_rows(path, sample(), SaveFile._cell_text)
+        with open(path, encoding="utf-8") as file:
+            lines = file.read().split("\n")
+        self.assertEqual(lines[:4], ["2;2.5;;total", "", "", "=A1*B1+C9"])
+        self.assertEqual(lines[699], ";;=SUMA(A1:B4)")
+
+    def test_round_trip(self):
+        self.check(self.load(self.save(sample(), "sheet.s2v")), contents(sample()))
+
+
+if __name__ == "__main__":
+    unittest.main()
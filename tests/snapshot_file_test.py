@@ -0,0 +1,110 @@
+import io
+import os
+import pickle
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from content.text_content import TextContent
+from exceptions import FileNotFoundException
+from fileio.mapped_file import MappedSheetFile
+from fileio.snapshot_file import SnapshotFile, _SnapshotUnpickler
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+from spreadsheet.spreadsheet_controller import SpreadsheetController
+from tests.save_file_test import ControllerFileTestCase, sample
+
+
+def global_call(module: str, name: str) -> bytes:
+    """Pickle (protocol 4) calling module.name() with no arguments."""
+    def short(text: str) -> bytes:
+        encoded = text.encode()
+        return b"\x8c" + bytes([len(encoded)]) + encoded
+    return b"\x80\x04" + short(module) + short(name) + b"\x93)R."
+
+
+def contents(sheet: Spreadsheet):
+    return {(cell.coordinate.column, cell.coordinate.row): cell.content.get_text() for cell in sheet.cells}
+
+
+class SnapshotFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_round_trip(self):
+        sheet = Spreadsheet()
+        sheet.set_cell_content(Coordinate("A", 1), NumericContent(2))
+        sheet.set_cell_content(Coordinate("A", 2), NumericContent(2.5))
+        sheet.set_cell_content(Coordinate("A", 3), NumericContent(10 ** 30))
+        sheet.set_cell_content(Coordinate("B", 1), TextContent("total"))
+        sheet.set_cell_content(Coordinate("C", 1), FormulaContent("=SUMA(A1:A2)*2"))
+        sheet.set_cell_content(Coordinate("C", 2), FormulaContent("=C1+A1"))
+        sheet.recalculate()
+        SnapshotFile().save(sheet, self.path("sheet.s2b"))
+
+        loaded = SnapshotFile().load(self.path("sheet.s2b"))
+        self.assertEqual(contents(loaded), contents(sheet))
+        self.assertEqual(loaded.get_cell_value(Coordinate("C", 2)), 11)
+        loaded.set_cell_content(Coordinate("A", 1), NumericContent(4))
+        self.assertEqual(loaded.get_cell_value(Coordinate("C", 2)), 17)
+
+    def test_round_trip_of_a_paged_sheet(self):
+        with open(self.path("big.s2v"), "w") as file:
+            for row in range(1, 3001):
+                file.write(f"{row};item {row};=A{row}*2\n")
+        sheet = Spreadsheet()
+        with MappedSheetFile(self.path("big.s2v")) as source:
+            sheet.page_from(source, SpreadsheetController._classify_loaded_text)
+            self.assertEqual(sheet.get_cell_value(Coordinate("A", 7)), 7)
+            SnapshotFile().save(sheet, self.path("big.s2b"))
+            expected = contents(sheet)
+
+        loaded = SnapshotFile().load(self.path("big.s2b"))
+        self.assertEqual(len(loaded.cells), 9000)
+        self.assertEqual(contents(loaded), expected)
+        self.assertEqual(loaded.get_cell_value(Coordinate("C", 2999)), 5998)
+
+    def test_only_listed_classes_are_unpickled(self):
+        for module, name in (("spreadsheet.spreadsheet_controller", "os.getpid"), ("os", "getpid"),
+                             ("formula.function", "SUMA.__init__.__globals__"), ("builtins", "eval")):
+            with mock.patch("os.getpid") as getpid:
+                with self.assertRaises(pickle.UnpicklingError):
+                    _SnapshotUnpickler(io.BytesIO(global_call(module, name)), Spreadsheet()).load()
+            getpid.assert_not_called()
+
+    def test_hostile_snapshot_is_reported_as_corrupt(self):
+        SnapshotFile().save(Spreadsheet(), self.path("empty.s2b"))
+        with open(self.path("empty.s2b"), "rb") as file:
+            data = file.read()
+        # The programs block is the last one
+        position, last = 5, 5
+        while position < len(data):
+            last = position
+            position += 8 + struct.unpack_from("<Q", data, position)[0]
+        payload = global_call("spreadsheet.spreadsheet_controller", "os.getpid")
+        with open(self.path("hostile.s2b"), "wb") as file:
+            file.write(data[:last] + struct.pack("<Q", len(payload)) + payload)
+        with mock.patch("os.getpid") as getpid:
+            with self.assertRaisesRegex(FileNotFoundException, "Corrupt snapshot"):
+                SnapshotFile().load(self.path("hostile.s2b"))
+        getpid.assert_not_called()
+
+
+class SnapshotControllerTest(ControllerFileTestCase):
+
+    def test_the_menu_saves_and_loads_snapshots(self):
+        self.check(self.load(self.save(sample(), "sheet.s2b")), contents(sample()))
+
+
+if __name__ == "__main__":
+    unittest.main()
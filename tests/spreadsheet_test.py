@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from content.text_content import TextContent
+from exceptions import CircularDependencyException, InvalidPostfixException
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+
+
+class CellIndexTest(unittest.TestCase):
+
+    def test_cells_are_found_by_coordinate(self):
+        sheet = Spreadsheet()
+        sheet.set_cell_content(Coordinate("B", 2), TextContent("name"))
+        sheet.set_cell_content(Coordinate("AA", 30), NumericContent(7))
+        self.assertEqual(sheet.get_cell(Coordinate("B", 2)).content.get_text(), "name")
+        self.assertEqual(sheet.get_cell_value(Coordinate("AA", 30)), 7)
+        self.assertIsNone(sheet.get_cell(Coordinate("B", 3)))
+        self.assertFalse(sheet.has_cell(Coordinate("A", 2)))
+        self.assertEqual(len(sheet.cells), 2)
+
+    def test_adding_a_cell_replaces_the_one_at_its_coordinate(self):
+        sheet = Spreadsheet()
+        old = TextContent("old")
+        sheet.add_cell(Coordinate("C", 4), Cell(("C", 4), old))
+        sheet.add_cell(Coordinate("C", 4), Cell(("C", 4), TextContent("new")))
+        self.assertEqual(len(sheet.cells), 1)
+        self.assertEqual(sheet.get_cell_value(Coordinate("C", 4)), "new")
+        with self.assertRaises(ValueError):
+            sheet.get_cell_name(old)
+
+    def test_a_content_knows_its_cell_name(self):
+        sheet = Spreadsheet()
+        formula = FormulaContent("=1+1")
+        sheet.set_cell_content(Coordinate("D", 12), formula)
+        sheet.set_cell_content(Coordinate("E", 1), TextContent("x"))
+        # Texts are stored unboxed: their content is the one a read hands out
+        text = sheet.get_cell(Coordinate("E", 1)).content
+        self.assertEqual(sheet.get_cell_name(formula), "D12")
+        self.assertEqual(sheet.get_cell_name(text), "E1")
+        sheet.set_cell_content(Coordinate("D", 12), NumericContent(3))
+        with self.assertRaises(ValueError):
+            sheet.get_cell_name(formula)
+
+    def test_removing_a_cell_frees_its_coordinate(self):
+        sheet = Spreadsheet()
+        sheet.set_cell_content(Coordinate("A", 1), TextContent("x"))
+        sheet._remove_cell_at_coords(Coordinate("A", 1))
+        self.assertFalse(sheet.has_cell(Coordinate("A", 1)))
+        self.assertEqual(len(sheet.cells), 0)
+
+
+class BulkLoadTest(unittest.TestCase):
+
+    def test_cells_load_without_per_cell_invalidation(self):
+        sheet = Spreadsheet()
+        entries = [("A", 1, 2), ("A", 2, 0.5), ("B", 1, TextContent("x")),
+                   ("C", 1, FormulaContent("=C2*2")), ("C", 2, FormulaContent("=A1+A2"))]
+        with mock.patch.object(sheet, "_invalidate_dependents_of", side_effect=AssertionError("invalidated")):
+            self.assertEqual(sheet.load_cells(entries), 5)
+        self.assertEqual(sheet._dirty, {"C1", "C2"})
+        self.assertTrue(sheet.get_cell(Coordinate("C", 1)).content._dependencies_registered)
+        self.assertEqual(sheet.dep_manager.get_dependents("C2"), {"C1"})
+        self.assertEqual(sheet.get_cell_value(Coordinate("C", 1)), 5)
+        self.assertEqual(len(sheet.cells), 5)
+
+    def test_cycles_and_broken_formulas_fail_when_read(self):
+        sheet = Spreadsheet()
+        sheet.load_cells([("A", 1, FormulaContent("=B1")), ("B", 1, FormulaContent("=A1")),
+                          ("C", 1, FormulaContent("=1+")), ("D", 1, FormulaContent("=2*3"))])
+        self.assertFalse(sheet.get_cell(Coordinate("A", 1)).content._dependencies_registered)
+        self.assertEqual(sheet.get_cell_value(Coordinate("D", 1)), 6)
+        with self.assertRaises(CircularDependencyException):
+            sheet.get_cell_value(Coordinate("A", 1))
+        with self.assertRaises(InvalidPostfixException):
+            sheet.get_cell_value(Coordinate("C", 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
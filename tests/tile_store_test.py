@@ -0,0 +1,206 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from content.text_content import TextContent
+from fileio.snapshot_file import SnapshotFile
+from spreadsheet.cell import Cell
+from spreadsheet.coordinate import Coordinate, number_to_column
+from spreadsheet.row_index import RowIndex
+from spreadsheet.spreadsheet import Spreadsheet
+from spreadsheet.tile_store import TAG_FLOAT, TAG_INT, TAG_OBJECT, TAG_TEXT, TILE_ROWS, TiledCellStore
+
+
+class TileStorageTest(unittest.TestCase):
+
+    def test_values_are_stored_by_type(self):
+        store = TiledCellStore()
+        store.put_number("A", 1, 3)
+        store.put_number("A", 2, 2.5)
+        store.put(Cell(("B", 1), TextContent("label")))
+        store.put(Cell(("B", 2), FormulaContent("=A1")))
+        tile = store._tiles[(0, 0)]
+        self.assertEqual([tile.tags[slot] for slot in (0, 1, TILE_ROWS, TILE_ROWS + 1)],
+                         [TAG_INT, TAG_FLOAT, TAG_TEXT, TAG_OBJECT])
+        self.assertEqual(list(tile.values[:2]), [3.0, 2.5])
+        self.assertEqual(tile.objects[TILE_ROWS], "label")
+        self.assertIs(type(store.value("A", 1)), int)
+        self.assertEqual(store.value("A", 2), 2.5)
+        self.assertEqual(store.get("B", 2).content.formula, "=A1")
+
+    def test_replacing_changes_the_slot_type(self):
+        store = TiledCellStore()
+        store.put_number("C", 5, 1)
+        store.put(Cell(("C", 5), TextContent("x")))
+        self.assertEqual(store.value("C", 5), "x")
+        store.put_number("C", 5, 4.5)
+        self.assertEqual(store.value("C", 5), 4.5)
+        self.assertEqual(store._tiles[(0, 0)].objects, {})
+        self.assertEqual(len(store), 1)
+
+    def test_an_emptied_tile_is_dropped(self):
+        store = TiledCellStore()
+        store.put_number("J", TILE_ROWS + 1, 1)
+        store.put(Cell(("J", TILE_ROWS + 2), TextContent("x")))
+        self.assertEqual(list(store._tiles), [(1, 1)])
+        store.remove("J", TILE_ROWS + 1)
+        store.remove("J", TILE_ROWS + 2)
+        self.assertEqual(store._tiles, {})
+        self.assertEqual(len(store), 0)
+        self.assertIsNone(store.remove("J", TILE_ROWS + 2))
+
+    def test_range_numbers_reads_the_buffers(self):
+        store = TiledCellStore()
+        for row in range(1, 11):
+            store.put_number("A", row, row)
+        store.put(Cell(("A", 4), TextContent("skip")))
+        numbers, integral, objects = store.range_numbers(1, 1, 1, 10)
+        self.assertEqual(list(numbers), [1, 2, 3, 5, 6, 7, 8, 9, 10])
+        self.assertTrue(integral)
+        self.assertEqual([cell.content.get_text() for cell in objects], ["skip"])
+        store.put_number("A", 5, 0.5)
+        self.assertFalse(store.range_numbers(1, 1, 1, 10)[1])
+
+
+class UsedRangeTest(unittest.TestCase):
+
+    def test_bounds_and_row_last_column_follow_edits(self):
+        store = TiledCellStore()
+        store.put_number("B", 3, 1)
+        store.put(Cell(("D", 3), TextContent("x")))
+        store.put_number("C", 7, 2)
+        self.assertEqual(store.bounds(), (3, 7, 2, 4))
+        self.assertEqual(store.row_last_column(3), 4)
+        store.remove("D", 3)
+        self.assertEqual(store.row_last_column(3), 2)
+        store.remove("B", 3)
+        self.assertEqual(store.row_last_column(3), 0)
+        self.assertEqual(store.bounds(), (7, 7, 3, 3))
+        store.remove("C", 7)
+        self.assertIsNone(store.bounds())
+        self.assertEqual(store._row_columns, {})
+
+    def test_clearing_the_end_of_a_wide_row_visits_no_other_column(self):
+        store = TiledCellStore()
+        for col_num in range(1, 3001):
+            store.put_number(number_to_column(col_num), 1, col_num)
+        store.put_number("A", 2, 1)
+        store.put_number(number_to_column(2000), 2, 1)
+        with mock.patch.object(RowIndex, "irange", side_effect=AssertionError("columns scanned")):
+            store.remove(number_to_column(2000), 2)
+            self.assertEqual(store.row_last_column(2), 1)
+            store.remove(number_to_column(3000), 1)
+        self.assertEqual(store.row_last_column(1), 2999)
+        self.assertEqual(store.bounds(), (1, 2, 1, 2999))
+
+    def test_a_far_row_costs_no_more_than_a_near_one(self):
+        def traced(row):
+            tracemalloc.start()
+            store = TiledCellStore()
+            store.put_number("A", row, 1.5)
+            used = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del store
+            return used
+
+        self.assertLess(traced(50_000_000), 2 * traced(1))
+
+    def test_rows_past_32_bits(self):
+        sheet = Spreadsheet()
+        row = 2 ** 40
+        sheet.set_cell_content(Coordinate("A", row), NumericContent(2))
+        sheet.set_cell_content(Coordinate("A", 1), NumericContent(3))
+        sheet.set_cell_content(Coordinate("B", row), FormulaContent(f"=SUMA(A1:A{row})+A{row}"))
+        self.assertEqual(sheet.get_cell_value(Coordinate("B", row)), 7)
+        self.assertEqual(sheet.cells.bounds(), (1, row, 1, 2))
+        self.assertEqual(sheet.cells.row_last_column(row), 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "far.s2b")
+            SnapshotFile().save(sheet, path)
+            loaded = SnapshotFile().load(path)
+        self.assertEqual(loaded.get_cell_value(Coordinate("B", row)), 7)
+
+    def test_row_out_of_range_is_rejected_before_storing(self):
+        store = TiledCellStore()
+        for row in (0, 2 ** 63):
+            with self.assertRaises(ValueError):
+                store.put_number("A", row, 1)
+            with self.assertRaises(ValueError):
+                store.put(Cell(("A", row), TextContent("x")))
+        self.assertEqual(len(store), 0)
+        self.assertIsNone(store.bounds())
+
+
+class RowIndexTest(unittest.TestCase):
+
+    def test_matches_a_sorted_set(self):
+        rows = [(i * 7919) % 5000 + 1 for i in range(6000)] + [2 ** 40, 2 ** 62]
+        index = RowIndex()
+        for row in rows:
+            index.add(row)
+        for row in rows[::3]:
+            index.discard(row)
+        expected = sorted(set(rows) - set(rows[::3]))
+        self.assertEqual(list(index), expected)
+        self.assertEqual(len(index), len(expected))
+        self.assertEqual(list(index.irange(100, 2 ** 41)), [row for row in expected if 100 <= row <= 2 ** 41])
+        self.assertEqual((index.first(), index.last()), (expected[0], expected[-1]))
+        inside = [row for row in expected if 4990 <= row <= 2 ** 50]
+        self.assertEqual(index.span(4990, 2 ** 50), (inside[0], inside[-1]))
+        restored = RowIndex()
+        restored.__setstate__(index.__getstate__())
+        self.assertEqual(list(restored), expected)
+
+
+class ColumnRowIndexTest(unittest.TestCase):
+
+    def test_ranges_come_out_column_by_column_rows_ascending(self):
+        store = TiledCellStore()
+        cells = [("C", 900), ("A", 5), ("C", 2), ("B", 70000), ("A", 1), ("B", 3), ("D", 4)]
+        for column, row in cells:
+            store.put_number(column, row, row)
+        found = [(cell.coordinate.column, cell.coordinate.row) for cell in store.iter_range(1, 3, 2, 70000)]
+        self.assertEqual(found, [("A", 5), ("B", 3), ("B", 70000), ("C", 2), ("C", 900)])
+
+    def test_rows_follow_edits(self):
+        store = TiledCellStore()
+        for row in (1, 40, 41, 5000):
+            store.put_number("B", row, row)
+        store.remove("B", 40)
+        store.put(Cell(("B", 41), TextContent("x")))
+        self.assertEqual(list(store._column_rows[2]), [1, 41, 5000])
+        for row in (1, 41, 5000):
+            store.remove("B", row)
+        self.assertNotIn(2, store._column_rows)
+        self.assertEqual(list(store.used_columns()), [])
+
+    def test_an_empty_rectangle_visits_no_tile(self):
+        store = TiledCellStore()
+        store.put_number("A", 1, 1)
+        store.put_number("Z", 10 ** 6, 1)
+        with mock.patch.object(store, "_materialize", side_effect=AssertionError("visited")):
+            self.assertEqual(list(store.iter_range(1, 26, 2, 10 ** 6 - 1)), [])
+
+
+class TileWalkTest(unittest.TestCase):
+
+    def test_ranges_skip_empty_stretches(self):
+        store = TiledCellStore()
+        rows = [1, TILE_ROWS, TILE_ROWS + 1, 10 ** 12]
+        for row in rows:
+            store.put_number("A", row, row)
+        store.put(Cell(("A", 10 ** 12 + 1), FormulaContent("=1")))
+        numbers, integral, objects = store.range_numbers(1, 1, 1, 10 ** 13)
+        self.assertEqual(list(numbers), [float(row) for row in rows])
+        self.assertTrue(integral)
+        self.assertEqual([cell.coordinate.row for cell in objects], [10 ** 12 + 1])
+        self.assertEqual([cell.coordinate.row for cell in store.iter_objects(1, 1, 1, 10 ** 13)], [10 ** 12 + 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from exceptions import TokenizingErrorException
+from formula.tokenizer import Tokenizer, scan
+
+
+class TokenizerTest(unittest.TestCase):
+
+    def test_tokens_are_offsets_into_the_source(self):
+        source = "SUMA(A1:B2; 3.5) - C10*2"
+        self.assertEqual([source[start:end] for _, start, end in scan(source)],
+                         ["SUMA", "(", "A1:B2", ";", "3.5", ")", "-", "C10", "*", "2"])
+
+    def test_token_kinds(self):
+        self.assertEqual(Tokenizer().tokenize("MAX(AB12:AB14)/A1+PROMEDIO(1)"), [
+            ("FUNC", "MAX"), ("LPAREN", "("), ("RANGE", "AB12:AB14"), ("RPAREN", ")"), ("DIVIDE", "/"),
+            ("CELL", "A1"), ("PLUS", "+"), ("FUNC", "PROMEDIO"), ("LPAREN", "("), ("NUMBER", "1"),
+            ("RPAREN", ")"),
+        ])
+
+    def test_repeated_texts_are_scanned_once(self):
+        source = "A1*7+B1"
+        self.assertIs(scan(source), scan("".join(["A1*7", "+B1"])))
+        hits = scan.cache_info().hits
+        scan(source)
+        self.assertEqual(scan.cache_info().hits, hits + 1)
+
+    def test_unexpected_characters_are_rejected(self):
+        for source in ("A1 & B1", "A1\n+1", "1+?"):
+            with self.subTest(source=source), self.assertRaises(TokenizingErrorException):
+                scan(source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import copy
+import unittest
+from unittest import mock
+
+from content.formula_content import FormulaContent
+from content.numerical_content import NumericContent
+from exceptions import CircularDependencyException
+from spreadsheet.coordinate import Coordinate
+from spreadsheet.spreadsheet import Spreadsheet
+from spreadsheet.tile_store import TiledCellStore
+
+
+def sample() -> Spreadsheet:
+    sheet = Spreadsheet()
+    sheet.set_cell_content(Coordinate("A", 1), NumericContent(1))
+    sheet.set_cell_content(Coordinate("A", 2), NumericContent(2))
+    sheet.set_cell_content(Coordinate("B", 1), FormulaContent("=A1+1"))
+    sheet.set_cell_content(Coordinate("C", 1), FormulaContent("=SUMA(A1:B1)"))
+    sheet.set_cell_content(Coordinate("D", 1), FormulaContent("=C1*2"))
+    sheet.recalculate()
+    return sheet
+
+
+def state(sheet: Spreadsheet):
+    manager = sheet.dep_manager
+    return ({f"{cell.coordinate.column}{cell.coordinate.row}": cell.content.get_text() for cell in sheet.cells},
+            copy.deepcopy(manager.dependency_graph), copy.deepcopy(manager.dependents), dict(manager._order),
+            {cell: manager.get_referenced_ranges(cell) for cell in manager.dependency_graph},
+            {col: list(rows) for col, rows in manager._formula_rows.items()}, set(sheet._dirty))
+
+
+class TransactionRollbackTest(unittest.TestCase):
+
+    def test_cycle_leaves_sheet_and_graph_unchanged(self):
+        sheet = sample()
+        before = state(sheet)
+        with self.assertRaises(CircularDependencyException):
+            with sheet.transaction() as transaction:
+                transaction.set_cell_content(Coordinate("A", 2), NumericContent(5))
+                transaction.set_cell_content(Coordinate("E", 1), FormulaContent("=D1+A2"))
+                transaction.set_cell_content(Coordinate("A", 1), FormulaContent("=D1"))
+        self.assertEqual(state(sheet), before)
+        self.assertEqual(sheet.get_cell_value(Coordinate("D", 1)), 6)
+
+    def test_failure_partway_through_storing_restores_every_cell(self):
+        sheet = sample()
+        before = state(sheet)
+        stored = TiledCellStore._put
+        calls = []
+
+        def failing_put(store, cell):
+            calls.append(cell)
+            if len(calls) == 3:
+                raise MemoryError("store failed")
+            return stored(store, cell)
+
+        with mock.patch.object(TiledCellStore, "_put", failing_put):
+            with self.assertRaises(MemoryError):
+                with sheet.transaction() as transaction:
+                    transaction.set_cell_content(Coordinate("A", 1), NumericContent(10))
+                    transaction.set_cell_content(Coordinate("B", 1), FormulaContent("=A2*3"))
+                    transaction.set_cell_content(Coordinate("C", 1), NumericContent(7))
+        self.assertEqual(state(sheet), before)
+        self.assertEqual(sheet.get_cell_value(Coordinate("D", 1)), 6)
+
+    def test_committed_transaction_keeps_its_edits(self):
+        sheet = sample()
+        with sheet.transaction() as transaction:
+            transaction.set_cell_content(Coordinate("A", 1), NumericContent(10))
+            transaction.set_cell_content(Coordinate("B", 1), FormulaContent("=A2*3"))
+        self.assertEqual(sheet.get_cell_value(Coordinate("D", 1)), 32)
+        self.assertIsNone(sheet.dep_manager._undo_log)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,11 +28,15 @@ class TerminalUI:
         print("\033[1;4;36m\n====== SPREADSHEET MENU ======\033[0m")
         print("\033[1;33m[File]\033[0m")
         print("  \033[1;36mRF <text file pathname>\033[0m  - \033[3mRead commands from file\033[0m")
-        print("  \033[1;36mL  <SV2 file pathname>\033[0m   - \033[3mLoad spreadsheet from file\033[0m")
-        print("  \033[1;36mS  <SV2 file pathname>\033[0m   - \033[3mSave spreadsheet to file\033[0m")
+        print("  \033[1;36mL  <SV2 file pathname>\033[0m   - \033[3mLoad spreadsheet from file (.s2v, .s2v.gz, .s2v.xz, or .s2b snapshot)\033[0m")
+        print("  \033[1;36mO  <SV2 file pathname>\033[0m   - \033[3mOpen a large file, reading rows on demand\033[0m")
+        print("  \033[1;36mS  <SV2 file pathname>\033[0m   - \033[3mSave spreadsheet to file (.s2v, .s2v.gz, .s2v.xz, or .s2b snapshot)\033[0m")
         print("\033[1;33m[Edit]\033[0m")
         print("  \033[1;32mC\033[0m                      - \033[3mCreate a new spreadsheet\033[0m")
         print("  \033[1;32mE <cell> <content>\033[0m      - \033[3mEdit a cell\033[0m")
+        print("\033[1;33m[Calc]\033[0m")
+        print("  \033[1;35mR\033[0m                      - \033[3mRecalculate the spreadsheet\033[0m")
+        print("  \033[1;35mM <mode>\033[0m               - \033[3mCalculation mode: automatic, deferred or manual\033[0m")
         print("\033[1;31mX\033[0m                      - \033[1mExit\033[0m")
         print("\033[1;4;36m==============================\033[0m")
         
@@ -9,6 +9,8 @@ from content.text_content import TextContent
 from content.formula_content import FormulaContent
 from spreadsheet.coordinate import Coordinate
 from fileio.load_file import LoadFile
+from fileio.compressed_file import COMPRESSED_EXTENSIONS
+from fileio.edit_journal import EditJournal
 from fileio.save_file import SaveFile
 
 from spreadsheet.spreadsheet import Spreadsheet
@@ -43,33 +45,37 @@ class ISpreadsheetControllerForChecker:
         Supports formulas (starting with '='), numeric, and text content.
         Raises BadCoordinateException or CircularDependencyException as needed.
         """
-        content = str(str_content)
-        m = re.fullmatch(r"([A-Z]+)(\d+)", coord)
-        if not m:
-            raise BadCoordinateException(f"Invalid Cell: {coord}")
-        col, row = m.group(1), int(m.group(2))
+        self.set_cells_content({coord: str_content})
 
+    def set_cells_content(self, contents: dict):
+        """
+        Sets many cells at once from a {coordinate: content} mapping, as one
+        transaction: the formulas are cycle-checked together on commit, and
+        if any edit is rejected none of them is applied. Values are computed
+        when read, so an evaluation error does not reject the edit.
+        Raises BadCoordinateException or CircularDependencyException as needed.
+        """
+        try:
+            with self.spreadsheet.transaction(evaluate=False) as transaction:
+                for coord, str_content in contents.items():
+                    m = re.fullmatch(r"([A-Z]+)(\d+)", coord)
+                    if not m:
+                        raise BadCoordinateException(f"Invalid Cell: {coord}")
+                    col, row = m.group(1), int(m.group(2))
+                    transaction.set_cell(Coordinate(col, row), Cell((col, row), self._parse_content(str(str_content))))
+        except ex.CircularDependencyException as e:
+            # Re-raise using the entities exception that the test expects
+            raise CircularDependencyException(str(e))
+
+    @staticmethod
+    def _parse_content(content: str):
         if content.startswith('='):
-            cell_content = FormulaContent(content)
-            
-            # For formulas, check circular dependencies BEFORE adding the cell
-            raw_expression = content[1:].replace(',', ';')
-            tokens = cell_content.tokenizer.tokenize(raw_expression)
-            try:
-                cell_content.check_circular_dependencies(self.spreadsheet, coord.upper())
-            except ex.CircularDependencyException as e:
-                # Re-raise using the entities exception that the test expects
-                raise CircularDependencyException(str(e))
-                    
+            return FormulaContent(content)
         elif re.fullmatch(r"\d+(?:\.\d+)?", content):
-            cell_content = NumericContent(float(content))
+            return NumericContent(float(content))
         elif re.fullmatch(r"\d+", content):
-            cell_content = NumericContent(int(content))
-        else:
-            cell_content = TextContent(content)
-
-        coordinate = Coordinate(col, row)
-        self.spreadsheet.add_cell(coordinate, Cell((col, row), cell_content))
+            return NumericContent(int(content))
+        return TextContent(content)
 
     def get_cell_content_as_float(self, coord: str) -> float:
         """
@@ -85,6 +91,7 @@ class ISpreadsheetControllerForChecker:
         if not cell:
             raise BadCoordinateException(f"Cell not found: {coord}")
 
+        self.spreadsheet.ensure_calculated()
         val = cell.get_value(self.spreadsheet)
         try:
             return float(val)
@@ -134,7 +141,7 @@ class ISpreadsheetControllerForChecker:
         Raises SavingSpreadsheetException on error.
         """
         file_name = s_name_in_user_dir
-        if not file_name.lower().endswith(".s2v"):
+        if not file_name.lower().endswith((".s2v", *COMPRESSED_EXTENSIONS)):
             file_name += ".s2v"
         directory = os.getcwd()
 
@@ -142,65 +149,41 @@ class ISpreadsheetControllerForChecker:
             self._saver.validate_file_name(file_name)
             self._saver.validate_directory_path(directory)
 
-            if not self.spreadsheet.cells:
-                # Empty spreadsheet
-                data = []
-            else:
-                # Find max row from the list of cells
-                max_row = max((cell.coordinate.row for cell in self.spreadsheet.cells), default=0)
-                
-                data = []
-                for r in range(1, max_row + 1):
-                    # For each row, find the rightmost column that has data
-                    row_cells = {}
-                    max_col_num = 0
-
-                    for cell in self.spreadsheet.cells:
-                        if cell.coordinate.row == r:
-                            # Convert column letter to number (A=1, B=2, etc.)
-                            col_num = 0
-                            for char in cell.coordinate.column:
-                                col_num = col_num * 26 + (ord(char) - ord('A') + 1)
-                            row_cells[col_num] = cell.coordinate
-                            max_col_num = max(max_col_num, col_num)
-                    
-                    # Build row values only up to the rightmost column with data
-                    row_vals = []
-                    for col_num in range(1, max_col_num + 1):
-                        if col_num in row_cells:
-                            coord = row_cells[col_num]
-                            cell = self.spreadsheet.get_cell(coord)
-                            if cell and cell.content is not None:
-                                # Get the textual representation (formulas, not calculated values)
-                                v = cell.get_textual_representation()
-                                # For numeric content, avoid .0 suffix for integers
-                                if cell.content.__class__.__name__ == 'NumericContent':
-                                    try:
-                                        num_val = float(v)
-                                        if num_val.is_integer():
-                                            v = str(int(num_val))
-                                    except:
-                                        pass
-                            else:
-                                v = ''
-                        else:
-                            v = ''
-                        # replace any ';' to avoid breaking the format
-                        row_vals.append(str(v).replace(";", ","))
-                    
-                    # Only add the row if it has at least one non-empty cell
-                    if any(val for val in row_vals):
-                        data.append(row_vals)
-                    else:
-                        data.append([])
-
-            self._saver.save_spreadsheet_data(file_name, directory, data)
+            # Rows stream out in order, each up to its rightmost cell
+            file_path = os.path.join(directory, file_name)
+            self._saver.write_rows(file_path, self.spreadsheet, self._saved_text)
+            # The file holds every edit now: a journal left beside it by the
+            # interactive controller must not be replayed over it
+            EditJournal.discard(file_path)
 
         except Exception as e:
             raise SavingSpreadsheetException(
                 f"Failed to save spreadsheet to {file_name}: {e}"
             ) from e
 
+    @staticmethod
+    def _saved_text(value) -> str:
+        """
+        Saved text of a raw number or text, or of a Cell: formulas as written,
+        integral numbers without '.0', any ';' replaced so it can't break the format.
+        """
+        if type(value) is str:
+            v = value
+        elif type(value) is int or type(value) is float:
+            v = str(int(value)) if float(value).is_integer() else str(value)
+        elif value.content is None:
+            v = ''
+        else:
+            v = value.get_textual_representation()
+            if value.content.__class__.__name__ == 'NumericContent':
+                try:
+                    num_val = float(v)
+                    if num_val.is_integer():
+                        v = str(int(num_val))
+                except:
+                    pass
+        return v.replace(";", ",")
+
     def load_spreadsheet_from_file(self, s_name_in_user_dir: str):
         """
         Loads a spreadsheet from a .s2v file (semicolon-delimited) on disk.
@@ -219,74 +202,71 @@ class ISpreadsheetControllerForChecker:
                 path = markerrun_path
         
         try:
-            # Validate & read raw CSV data
+            # Validate, then stream the file into a fresh Spreadsheet: rows are
+            # read lazily, cells inserted in bulk and the graph built once
             self._loader.validate_file_format(path)
-            raw = self._loader.load_spreadsheet_data(path)
-
-            # Build a fresh Spreadsheet
             new_sheet = Spreadsheet()
-            def num_to_col(n: int) -> str:
-                col = ''
-                while n > 0:
-                    n, rem = divmod(n - 1, 26)
-                    col = chr(rem + ord('A')) + col
-                return col
-
-            for row_idx, row_values in enumerate(raw, start=1):
-                for col_idx, cell_text in enumerate(row_values):
-                    text = cell_text.strip().rstrip(';')
-                    if not text:
-                        continue
-                    col_letter = num_to_col(col_idx + 1)
-                    coordinate = Coordinate(col_letter, row_idx)
-
-                    if text.startswith('='):
-                        # Convert commas to semicolons in SUMA functions when loading
-                        # but preserve commas between top-level arguments that are functions
-                        if "SUMA(" in text:
-                            def replace_suma_commas(match):
-                                full_match = match.group(0)  # The entire SUMA(...) match
-                                content = full_match[5:-1]   # Remove "SUMA(" and ")"
-                                
-                                # Parse arguments more carefully
-                                result = ""
-                                paren_depth = 0
-                                for char in content:
-                                    if char == '(':
-                                        paren_depth += 1
-                                        result += char
-                                    elif char == ')':
-                                        paren_depth -= 1
-                                        result += char
-                                    elif char == ',' and paren_depth == 0:
-                                        # This is a top-level comma, check if it's before a function
-                                        # Look ahead to see if the next argument starts with a function name
-                                        remaining = content[len(result)+1:].strip()
-                                        if remaining.startswith(('MIN(', 'MAX(', 'PROMEDIO(', 'SUMA(')):
-                                            result += ','  # Keep comma before functions
-                                        else:
-                                            result += ';'  # Replace with semicolon for regular arguments
-                                    else:
-                                        result += char
-                                
-                                return f"SUMA({result})"
-                            
-                            pattern = r'SUMA\([^()]*(?:\([^()]*\)[^()]*)*\)'
-                            text = re.sub(pattern, replace_suma_commas, text)
-                        
-                        content = FormulaContent(text)
-                    elif re.fullmatch(r"\d+\.\d+", text):
-                        content = NumericContent(float(text))
-                    elif re.fullmatch(r"\d+", text):
-                        content = NumericContent(int(text))
-                    else:
-                        content = TextContent(text)
-
-                    new_sheet.add_cell(coordinate, Cell((col_letter, row_idx), content))
+            new_sheet.load_cells(
+                (column, row, self._classify_loaded_text(text))
+                for column, row, text in self._loader.iter_cell_texts(path)
+            )
+            # Edits journaled beside the file by the interactive controller
+            # are part of it, as when that controller loads it
+            if path.lower().endswith('.s2v') and EditJournal.exists(path):
+                with EditJournal(path) as journal:
+                    journal.replay(new_sheet, self._parse_content)
 
             self.spreadsheet = new_sheet
 
         except Exception as e:
             raise ReadingSpreadsheetException(
                 f"Failed to load spreadsheet from {path}: {e}"
-            ) from e
\ No newline at end of file
+            ) from e
+
+    @staticmethod
+    def _classify_loaded_text(text: str):
+        """
+        Content of a loaded cell; plain numbers stay raw so the store keeps them
+        unboxed. isdecimal() accepts exactly what the regex \\d+ matches.
+        """
+        if text.startswith('='):
+            # Convert commas to semicolons in SUMA functions when loading
+            # but preserve commas between top-level arguments that are functions
+            if "SUMA(" in text:
+                def replace_suma_commas(match):
+                    full_match = match.group(0)  # The entire SUMA(...) match
+                    content = full_match[5:-1]   # Remove "SUMA(" and ")"
+
+                    # Parse arguments more carefully
+                    result = ""
+                    paren_depth = 0
+                    for char in content:
+                        if char == '(':
+                            paren_depth += 1
+                            result += char
+                        elif char == ')':
+                            paren_depth -= 1
+                            result += char
+                        elif char == ',' and paren_depth == 0:
+                            # This is a top-level comma, check if it's before a function
+                            # Look ahead to see if the next argument starts with a function name
+                            remaining = content[len(result)+1:].strip()
+                            if remaining.startswith(('MIN(', 'MAX(', 'PROMEDIO(', 'SUMA(')):
+                                result += ','  # Keep comma before functions
+                            else:
+                                result += ';'  # Replace with semicolon for regular arguments
+                        else:
+                            result += char
+
+                    return f"SUMA({result})"
+
+                pattern = r'SUMA\([^()]*(?:\([^()]*\)[^()]*)*\)'
+                text = re.sub(pattern, replace_suma_commas, text)
+
+            return FormulaContent(text)
+        elif text.isdecimal():
+            return int(text)
+        integer, point, fraction = text.partition('.')
+        if point and integer.isdecimal() and fraction.isdecimal():
+            return float(text)
+        return TextContent(text)